@@ -5,8 +5,6 @@ import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
 import requests
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
 import sys
 import os
 from pathlib import Path
@@ -126,17 +124,30 @@ except ImportError as e:
     print("🔧 Running with built-in functionality...")
     MODULES_LOADED = False
 
+# Backtesting & artefak model hanya butuh core (numpy), terpisah dari komponen UI modular
+try:
+    from core.backtesting import run_backtest, hajj_predictor_forecaster
+    from core.model_store import load_or_build
+    from models.bootstrap import bootstrap_intervals
+    from models.changepoint import detect_regimes, growth_steps
+    from models.ensemble import learn_ensemble_weights
+    CORE_ANALYTICS_AVAILABLE = True
+except ImportError:
+    CORE_ANALYTICS_AVAILABLE = False
+
 class RealDataAnalyzer:
     """Analyzer untuk data riil biaya haji"""
     
-    def __init__(self):
+    def __init__(self, historical_data=None):
+        self.historical_data = historical_data if historical_data is not None else HISTORICAL_HAJJ_COSTS
+        self.latest_year = max(self.historical_data)
         self.df = self._create_dataframe()
         self.growth_analysis = self._analyze_growth()
         
     def _create_dataframe(self):
         """Buat DataFrame dari data historis"""
         data = []
-        for year, costs in HISTORICAL_HAJJ_COSTS.items():
+        for year, costs in self.historical_data.items():
             for city, cost in costs.items():
                 if city not in ['year_hijri', 'average']:
                     data.append({
@@ -163,13 +174,26 @@ class RealDataAnalyzer:
         # Hitung growth rate year-over-year
         avg_data['growth_rate'] = avg_data['biaya'].pct_change()
         
-        # Analisis periode khusus (ada lonjakan besar 2022-2023)
-        normal_periods = avg_data[avg_data['year'].isin([2016, 2017, 2018, 2019, 2020, 2022])]
-        post_covid_periods = avg_data[avg_data['year'].isin([2023, 2024, 2025])]
+        # Regime dideteksi otomatis (changepoint); tanpa modul core seluruh deret dianggap satu regime
+        years = avg_data['year'].to_numpy()
+        costs = avg_data['biaya'].to_numpy(dtype=float)
+        if CORE_ANALYTICS_AVAILABLE:
+            regimes = detect_regimes(years, costs)
+            normal_steps, regime_starts = growth_steps(regimes), regimes['regime_starts']
+        else:
+            normal_steps, regime_starts = np.ones(len(costs) - 1, dtype=bool), [years[0]]
+        
+        # CAGR periode normal: growth log di dalam regime terkini (atau semua regime selama
+        # regime terkini belum terkonfirmasi) dibagi jumlah tahunnya
+        log_growth = np.diff(np.log(costs))[normal_steps]
+        normal_years = np.diff(years)[normal_steps]
+        overall_cagr = self._calculate_cagr(avg_data['biaya'].iloc[0], avg_data['biaya'].iloc[-1], len(avg_data)-1)
+        normal_period_cagr = (np.expm1(log_growth.sum() / normal_years.sum()) * 100) if normal_years.sum() else overall_cagr
         
         return {
-            'overall_cagr': self._calculate_cagr(avg_data['biaya'].iloc[0], avg_data['biaya'].iloc[-1], len(avg_data)-1),
-            'normal_period_cagr': self._calculate_cagr(normal_periods['biaya'].iloc[0], normal_periods['biaya'].iloc[-1], len(normal_periods)-1),
+            'overall_cagr': overall_cagr,
+            'normal_period_cagr': float(normal_period_cagr),
+            'regime_starts': [int(year) for year in regime_starts],
             'avg_growth_rate': avg_data['growth_rate'].mean(),
             'median_growth_rate': avg_data['growth_rate'].median(),
             'std_growth_rate': avg_data['growth_rate'].std(),
@@ -227,7 +251,8 @@ class BuiltinRAGSystem:
             context += f"\n📈 ANALISIS PERTUMBUHAN:\n"
             growth = self.analyzer.growth_analysis
             context += f"- CAGR Keseluruhan (2016-2025): {growth['overall_cagr']:.1f}% per tahun\n"
-            context += f"- CAGR Periode Normal (2016-2022): {growth['normal_period_cagr']:.1f}% per tahun\n"
+            context += f"- CAGR Periode Normal (tanpa perpindahan regime): {growth['normal_period_cagr']:.1f}% per tahun\n"
+            context += f"- Regime terdeteksi mulai tahun: {', '.join(map(str, growth['regime_starts']))}\n"
             context += f"- Rata-rata pertumbuhan tahunan: {growth['avg_growth_rate']*100:.1f}%\n\n"
         
         # Tambahkan insight khusus
@@ -252,14 +277,83 @@ class BuiltinRAGSystem:
 class BuiltinPredictor:
     """Built-in predictor dengan data riil"""
     
-    def __init__(self, analyzer: RealDataAnalyzer):
-        self.analyzer = analyzer
-        self.model = None
-        self.poly_features = None
-        self._train_model()
+    # Versi struktur artefak model; naikkan jika payload berubah
+    ARTIFACT_VERSION = 3
     
-    def _train_model(self):
-        """Train model prediksi dengan data historis"""
+    # Anggota ensemble (urutan bobot) dan bobot bawaan jika bobot belum bisa dipelajari
+    ENSEMBLE_MEMBERS = ('ml_prediction', 'conservative', 'optimistic')
+    DEFAULT_ENSEMBLE_WEIGHTS = (0.4, 0.4, 0.2)
+    
+    # Stacking: horizon forecast out-of-sample, tahun latih minimal per origin
+    # (regresi polinomial derajat 2 butuh > 3 titik), dan jumlah forecast minimal
+    STACKING_HORIZONS = (1, 2, 3)
+    STACKING_MIN_TRAIN_YEARS = 4
+    STACKING_MIN_FORECASTS = 6
+    
+    def __init__(self, analyzer: RealDataAnalyzer, use_artifact: bool = True, learn_weights: bool = True):
+        self.analyzer = analyzer
+        self.use_artifact = use_artifact
+        self.learn_weights = learn_weights
+        self.coefficients = None
+        self.intercept = None
+        self.ensemble_weights = None
+        self._train_model(use_artifact)
+    
+    def _train_model(self, use_artifact: bool = True):
+        """Train model prediksi dengan data historis (atau muat artefak jika data tidak berubah)"""
+        if use_artifact and CORE_ANALYTICS_AVAILABLE:
+            params = load_or_build('builtin_predictor', self.analyzer.historical_data,
+                                   self._fit_model, version=self.ARTIFACT_VERSION)
+        else:
+            params = self._fit_model()
+        
+        self.coefficients = np.array(params['coefficients'])
+        self.intercept = params['intercept']
+        self.ensemble_weights = np.array(params['ensemble_weights']['weights'])
+    
+    def _fit_model(self) -> dict:
+        """Fit regresi polinomial lalu pelajari bobot ensemble; payload artefak model"""
+        params = self._fit_polynomial()
+        self.coefficients = np.array(params['coefficients'])
+        self.intercept = params['intercept']
+        params['ensemble_weights'] = self._learn_ensemble_weights()
+        return params
+    
+    def _learn_ensemble_weights(self) -> dict:
+        """Bobot ensemble dari forecast rolling-origin out-of-sample (stacking)
+        
+        Di setiap origin, predictor di-fit ulang pada data sampai origin itu dan
+        ketiga anggota ensemble diprediksi untuk STACKING_HORIZONS tahun ke depan;
+        bobot non-negatif berjumlah 1 dengan squared relative error terkecil
+        dipilih dari grid simplex. Tanpa modul core atau data yang cukup, bobot
+        bawaan dipakai.
+        """
+        default = {'weights': list(self.DEFAULT_ENSEMBLE_WEIGHTS), 'mse': None, 'n_forecasts': 0}
+        if not (self.learn_weights and CORE_ANALYTICS_AVAILABLE):
+            return default
+        
+        historical_data = self.analyzer.historical_data
+        years = sorted(historical_data)
+        forecasts, actual = [], []
+        for origin in years[self.STACKING_MIN_TRAIN_YEARS - 1:-1]:
+            train_data = {year: historical_data[year] for year in years if year <= origin}
+            member = BuiltinPredictor(RealDataAnalyzer(train_data), use_artifact=False, learn_weights=False)
+            targets = [origin + h for h in self.STACKING_HORIZONS if origin + h in historical_data]
+            if targets:
+                forecasts.append(member._member_forecasts(targets))
+                actual.extend(historical_data[year]['average'] for year in targets)
+        
+        if len(actual) < self.STACKING_MIN_FORECASTS:
+            return default
+        return learn_ensemble_weights(np.vstack(forecasts), actual,
+                                      max_workers=None if self.use_artifact else 1)
+    
+    def _fit_polynomial(self) -> dict:
+        """Fit regresi polinomial dan kembalikan koefisiennya"""
+        # Import lazy: scikit-learn hanya dibutuhkan saat artefak harus di-fit ulang
+        from sklearn.linear_model import LinearRegression
+        from sklearn.preprocessing import PolynomialFeatures
+        
         avg_data = self.analyzer.df[self.analyzer.df['embarkasi'] == 'rata_rata'].copy()
         avg_data = avg_data.sort_values('year')
         
@@ -268,58 +362,98 @@ class BuiltinPredictor:
         y = avg_data['biaya'].values
         
         # Use polynomial features untuk menangkap non-linear trend
-        self.poly_features = PolynomialFeatures(degree=2)
-        X_poly = self.poly_features.fit_transform(X)
+        poly_features = PolynomialFeatures(degree=2)
+        X_poly = poly_features.fit_transform(X)
         
         # Train model
-        self.model = LinearRegression()
-        self.model.fit(X_poly, y)
+        model = LinearRegression()
+        model.fit(X_poly, y)
+        
+        return {
+            'coefficients': model.coef_.tolist(),
+            'intercept': float(model.intercept_)
+        }
+    
+    def _predict_ml(self, year: int) -> float:
+        """Prediksi polinomial dari koefisien: intercept + sum(coef_i * year^i)"""
+        powers = float(year) ** np.arange(len(self.coefficients))
+        return float(self.intercept + powers @ self.coefficients)
+    
+    def _member_forecasts(self, years) -> np.ndarray:
+        """Forecast anggota ensemble untuk tahun target, shape (tahun, ENSEMBLE_MEMBERS)"""
+        current_year = self.analyzer.latest_year
+        growth_rate = self.analyzer.growth_analysis['normal_period_cagr'] / 100
+        current_cost = self.analyzer.historical_data[current_year]['average']
+        
+        rows = []
+        for year in years:
+            years_from_current = year - current_year
+            rows.append([
+                # ML prediction
+                self._predict_ml(year),
+                # Conservative prediction (based on normal growth)
+                current_cost * (1 + growth_rate) ** years_from_current,
+                # Optimistic prediction (assuming gradual normalization)
+                current_cost * (1 + (growth_rate * 0.8)) ** years_from_current
+            ])
+        return np.array(rows, dtype=float).reshape(len(rows), len(self.ENSEMBLE_MEMBERS))
     
     def predict_future_costs(self, years_ahead: int = 5) -> dict:
-        """Prediksi biaya masa depan"""
-        current_year = 2025
-        future_years = range(current_year + 1, current_year + years_ahead + 1)
+        """Prediksi biaya masa depan (ensemble dengan bobot hasil stacking)"""
+        current_year = self.analyzer.latest_year
+        future_years = list(range(current_year + 1, current_year + years_ahead + 1))
         
-        predictions = {}
+        members = self._member_forecasts(future_years)
+        ensemble = members @ self.ensemble_weights
         
-        for year in future_years:
-            # ML prediction
-            X_future = np.array([[year]])
-            X_future_poly = self.poly_features.transform(X_future)
-            ml_prediction = self.model.predict(X_future_poly)[0]
-            
-            # Ensemble dengan beberapa metode
-            growth_rate = self.analyzer.growth_analysis['normal_period_cagr'] / 100
-            current_cost = HISTORICAL_HAJJ_COSTS[current_year]['average']
-            years_from_current = year - current_year
-            
-            # Conservative prediction (based on normal growth)
-            conservative = current_cost * (1 + growth_rate) ** years_from_current
-            
-            # Optimistic prediction (assuming gradual normalization)
-            optimistic = current_cost * (1 + (growth_rate * 0.8)) ** years_from_current
-            
-            # Ensemble prediction
-            ensemble = (ml_prediction * 0.4 + conservative * 0.4 + optimistic * 0.2)
-            
+        predictions = {}
+        for i, year in enumerate(future_years):
             predictions[year] = {
-                'ml_prediction': ml_prediction,
-                'conservative': conservative,
-                'optimistic': optimistic,
-                'ensemble': ensemble,
+                'ml_prediction': float(members[i, 0]),
+                'conservative': float(members[i, 1]),
+                'optimistic': float(members[i, 2]),
+                'ensemble': float(ensemble[i]),
                 'confidence': self._calculate_confidence(year)
             }
         
         return predictions
     
     def _calculate_confidence(self, year):
-        """Hitung confidence level prediksi"""
-        years_ahead = year - 2025
+        """Hitung confidence level prediksi
+        
+        Peluang bootstrap (%) bahwa biaya aktual berada dalam ±10% dari forecast
+        compound growth, sama seperti HajjCostPredictor; rumus heuristik hanya
+        dipakai jika modul core tidak tersedia.
+        """
+        years_ahead = year - self.analyzer.latest_year
+        if CORE_ANALYTICS_AVAILABLE:
+            # Hasil di-cache per versi data, sehingga panggilan per tahun hanya lookup
+            interval = bootstrap_intervals(self.analyzer.historical_data, model_names=['compound_growth'],
+                                           horizon=max(years_ahead, 10),
+                                           max_workers=None if self.use_artifact else 1,
+                                           persist=self.use_artifact)['compound_growth']
+            return int(round(interval['within_tolerance'][years_ahead - 1] * 100))
+        
         # Confidence menurun seiring waktu
         base_confidence = 85
         decline_rate = 5  # 5% per tahun
         return max(base_confidence - (years_ahead * decline_rate), 40)
 
+def builtin_predictor_forecaster(train_data, horizons):
+    """Forecaster BuiltinPredictor untuk backtesting: fit ulang pada data latih"""
+    predictor = BuiltinPredictor(RealDataAnalyzer(train_data), use_artifact=False)
+    predictions = predictor.predict_future_costs(int(max(horizons)))
+    target_years = [predictor.analyzer.latest_year + int(h) for h in horizons]
+    
+    conservative = np.array([predictions[year]['conservative'] for year in target_years])
+    optimistic = np.array([predictions[year]['optimistic'] for year in target_years])
+    
+    return {
+        'point': np.array([predictions[year]['ensemble'] for year in target_years]),
+        'lower': np.minimum(conservative, optimistic),
+        'upper': np.maximum(conservative, optimistic)
+    }
+
 def create_enhanced_visualization(analyzer: RealDataAnalyzer, predictor: BuiltinPredictor):
     """Buat visualisasi enhanced dengan data riil"""
     
@@ -578,6 +712,34 @@ def render_data_details(analyzer):
         - Regional variation: ±15-20% dari rata-rata nasional
         """)
     
+    # Backtesting akurasi model
+    if CORE_ANALYTICS_AVAILABLE:
+        st.subheader("🧪 Backtesting Akurasi Model")
+        st.caption("Rolling-origin: model di-fit ulang di setiap tahun origin dan diuji terhadap nilai Keppres 1-3 tahun berikutnya")
+        
+        if st.button("▶️ Jalankan Backtest"):
+            with st.spinner("Menjalankan backtest..."):
+                report = run_backtest(
+                    {
+                        'HajjCostPredictor': hajj_predictor_forecaster,
+                        'BuiltinPredictor (Ensemble)': builtin_predictor_forecaster
+                    },
+                    HISTORICAL_HAJJ_COSTS
+                )
+            
+            backtest_df = pd.DataFrame([
+                {
+                    'Model': name,
+                    'MAPE': f"{summary['mape']:.2f}%",
+                    'Bias': f"{summary['bias']:+.2f}%",
+                    'Coverage Interval': f"{summary['coverage']:.1f}%",
+                    'Jumlah Forecast': summary['n_forecasts'],
+                    'Waktu (ms)': f"{summary['wall_time'] * 1000:.1f}"
+                }
+                for name, summary in report.items()
+            ])
+            st.dataframe(backtest_df, use_container_width=True)
+    
     # Source information
     st.subheader("📄 Sumber Data")
     st.markdown("""
@@ -610,6 +772,17 @@ def render_footer():
         unsafe_allow_html=True
     )
 
+@st.cache_resource(show_spinner="Memuat model prediksi...")
+def load_hajj_predictor():
+    """HajjCostPredictor + RAGSystem TF-IDF, dibangun sekali per proses server lalu dibagikan antar rerun & sesi
+
+    Predictor tidak memakai data_collector (kunci API per sesi), sehingga aman
+    dibagikan. Indeks TF-IDF dimuat di sini agar search pertama tidak menanggungnya.
+    """
+    rag = RAGSystem(retrieval_backend="tfidf")
+    rag.vector_index
+    return HajjCostPredictor(None, rag)
+
 def main():
     """Main application function"""
     # Declare global variable at the beginning of function
@@ -678,6 +851,10 @@ def main():
         st.markdown("---")
         st.info("💡 Data berdasarkan Keputusan Presiden RI tentang BPIH tahun 2016-2025")
         
+        # Horizon chart bulanan di dashboard (dibaca lewat st.session_state['months_ahead'])
+        st.header("📅 Parameter Prediksi")
+        st.slider("Prediksi Bulan Ke Depan", 1, 36, 24, key="months_ahead")
+        
         # Configuration section
         st.header("⚙️ Konfigurasi API (Opsional)")
         
@@ -699,10 +876,13 @@ def main():
             
             data_collector = DataCollector(config)
             
+            # Dashboard modular membutuhkan API HajjCostPredictor (skenario, sensitivitas, regional)
+            hajj_predictor = load_hajj_predictor()
+            
             tab1, tab2, tab3, tab4 = st.tabs(["📊 Dashboard", "🗺️ Regional", "🤖 AI Analysis", "📋 Data Details"])
             
             with tab1:
-                render_dashboard(data_collector, predictor, rag_system)
+                render_dashboard(data_collector, hajj_predictor, rag_system)
             
             with tab2:
                 render_regional_analysis()
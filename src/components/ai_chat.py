@@ -43,9 +43,6 @@ def render_ai_chat(agentic_ai, rag_system):
     
     if analyze_button and user_query:
         with st.spinner("AI sedang menganalisis..."):
-            # Retrieve context
-            context = rag_system.retrieve_context(user_query)
-            
             # Add current data context (simplified for demo)
             current_data_context = """
             Data Real-time Saat Ini:
@@ -54,7 +51,18 @@ def render_ai_chat(agentic_ai, rag_system):
             - Prediksi Biaya Realistis: ~Rp 75-80 juta
             """
             
-            full_context = context + current_data_context
+            # Retrieve context, dipack ke dalam budget token agar ukuran prompt terkendali
+            assembled = rag_system.assemble_context(
+                user_query,
+                budget=agentic_ai.config.CONTEXT_TOKEN_BUDGET,
+                extra_sections={"data_terkini": current_data_context}
+            )
+            full_context = assembled.text
+            
+            caption = f"Konteks: ~{assembled.tokens}/{assembled.budget} token"
+            if assembled.dropped:
+                caption += f" · tidak disertakan: {', '.join(assembled.dropped)}"
+            st.caption(caption)
             
             # Generate AI response
             ai_response = agentic_ai.generate_response(user_query, full_context)
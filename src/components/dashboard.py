@@ -3,6 +3,9 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+import numpy as np
+
+from utils.visualizations import create_prediction_chart, create_sensitivity_heatmap
 
 def render_dashboard(data_collector, predictor, rag_system):
     """Render enhanced dashboard dengan data riil"""
@@ -20,6 +23,14 @@ def render_dashboard(data_collector, predictor, rag_system):
     cost_2023 = historical_data[2023]['average']
     lonjakan_2023 = ((cost_2023 - cost_2022) / cost_2022) * 100
     
+    # Data pasar diambil di awal: tabel forecast bersama dibangun per versi data & pasar
+    with st.spinner("Mengambil data ekonomi real-time..."):
+        gold_data = data_collector.get_gold_price()
+        exchange_rate = data_collector.get_exchange_rate()
+    gold_price = gold_data['current_price'] if gold_data else 2000
+    table = predictor.get_forecast_table(gold_price, exchange_rate)
+    next_year = predictor.latest_year + 1
+    
     # Top metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -41,7 +52,7 @@ def render_dashboard(data_collector, predictor, rag_system):
     
     with col3:
         # Prediksi 2026
-        pred_2026 = predictor.predict_future_cost(1)
+        pred_2026 = table.get(next_year)
         growth_2026 = ((pred_2026 - latest_cost) / latest_cost) * 100
         st.metric(
             "Prediksi 2026",
@@ -63,7 +74,7 @@ def render_dashboard(data_collector, predictor, rag_system):
     st.subheader("📈 Trend Historis & Prediksi")
     
     # Create comprehensive chart
-    fig = create_comprehensive_chart(historical_data, predictor)
+    fig = create_comprehensive_chart(historical_data, table)
     st.plotly_chart(fig, use_container_width=True)
     
     # Two column layout untuk analisis
@@ -73,10 +84,6 @@ def render_dashboard(data_collector, predictor, rag_system):
         # Real-time data integration
         st.subheader("🌍 Data Real-time")
         
-        with st.spinner("Mengambil data ekonomi real-time..."):
-            gold_data = data_collector.get_gold_price()
-            exchange_rate = data_collector.get_exchange_rate()
-        
         if gold_data:
             # Display current economic indicators
             econ_col1, econ_col2 = st.columns(2)
@@ -108,15 +115,19 @@ def render_dashboard(data_collector, predictor, rag_system):
                 st.markdown(f"{impact_color} Harga emas saat ini berpotensi mengubah biaya haji sebesar **{gold_impact:+.1f}%**")
             else:
                 st.markdown("🟡 Harga emas saat ini dalam range normal")
+
+            # What-if harga emas x kurs tanpa rerun per langkah slider
+            gold_grid = np.linspace(0.7, 1.3, 61) * gold_data['current_price']
+            fx_grid = np.linspace(0.85, 1.15, 61) * exchange_rate
+            sensitivity = predictor.gold_fx_sensitivity(gold_grid, fx_grid)
+            fig_sensitivity = create_sensitivity_heatmap(gold_grid, fx_grid, sensitivity)
+            st.plotly_chart(fig_sensitivity, use_container_width=True)
     
     with col2:
         st.subheader("🎯 Prediksi Multi-Skenario")
         
-        # Get prediction scenarios
-        scenarios = predictor.generate_prediction_scenarios(
-            gold_data['current_price'] if gold_data else 2000, 
-            exchange_rate
-        )
+        # Skenario pasar dari tabel forecast
+        scenarios = table.scenario_values(next_year)
         
         # Display scenarios
         for scenario, cost in scenarios.items():
@@ -128,10 +139,38 @@ def render_dashboard(data_collector, predictor, rag_system):
                 st.metric(scenario, f"Rp {cost/1000000:.1f}M", f"{delta_pct:+.1f}%", delta_color="off")
             else:
                 st.metric(scenario, f"Rp {cost/1000000:.1f}M", f"{delta_pct:+.1f}%")
-        
-        # Confidence indicator
+
+        # Atribusi skenario realistis tahun depan: biaya dasar + trend + emas + kurs
+        attribution = predictor.attribute_predictions(1, gold_price=gold_price, exchange_rate=exchange_rate)
+        realistic = attribution['scenarios'].index('Realistis')
+        st.markdown(f"**🧩 Atribusi Realistis {attribution['years'][0]}:**")
+        st.markdown(" · ".join(
+            f"{label} Rp {attribution[key][realistic, 0]/1000000:+.1f}M"
+            for key, label in (('trend', 'Trend'), ('gold', 'Emas'), ('fx', 'Kurs'))
+        ))
+
+        # Distribusi Monte Carlo dari statistik growth historis
+        band = {key: table.get(next_year, statistic=key) for key in ('p5', 'p50', 'p95')}
+        st.markdown(f"**📊 Distribusi Monte Carlo {next_year}:**")
+        st.markdown(
+            f"P5 Rp {band['p5']/1000000:.1f}M · "
+            f"P50 Rp {band['p50']/1000000:.1f}M · "
+            f"P95 Rp {band['p95']/1000000:.1f}M"
+        )
+
+        # Confidence indicator: peluang bootstrap biaya aktual dalam ±10% prediksi tahun depan
+        confidence = table.get(next_year, statistic='confidence')
+        confidence_text = f"{confidence:.0f}% dalam ±{predictor.CONFIDENCE_TOLERANCE:.0%} ({next_year})"
+        if not table.confidence_reliable:
+            confidence_text += f" · indikatif, hanya {table.confidence_residuals} residual"
         st.markdown("**🎯 Confidence Level:**")
-        st.progress(0.85, text="85% (1 tahun ke depan)")
+        st.progress(confidence / 100, text=confidence_text)
+    
+    # Kurva bulanan mengikuti slider sidebar; engine bulanan di-cache predictor
+    months_ahead = st.session_state.get('months_ahead', 24)
+    st.subheader(f"🗓️ Prediksi {months_ahead} Bulan ke Depan")
+    monthly_forecast = predictor.predict_monthly(months_ahead, gold_price, exchange_rate)
+    st.plotly_chart(create_prediction_chart(monthly_forecast, months_ahead), use_container_width=True)
     
     # Regional Analysis
     st.subheader("🗺️ Analisis Regional Terbaru")
@@ -174,7 +213,30 @@ def render_dashboard(data_collector, predictor, rag_system):
     )
     
     st.plotly_chart(fig_regional, use_container_width=True)
-    
+
+    # Proyeksi seluruh embarkasi (koheren dengan rata-rata nasional) dari tabel forecast
+    regional_forecast = table.node_values(5)
+    forecast_years = table.years[:5].tolist()
+
+    fig_regional_forecast = go.Figure()
+    for i, city in enumerate(predictor.embarkasi):
+        fig_regional_forecast.add_trace(go.Scatter(
+            x=forecast_years,
+            y=regional_forecast[:, i] / 1000000,
+            mode='lines+markers',
+            name=city.title()
+        ))
+
+    fig_regional_forecast.update_layout(
+        title=f"Proyeksi Biaya per Embarkasi ({forecast_years[0]}-{forecast_years[-1]})",
+        xaxis_title="Tahun",
+        yaxis_title="Biaya (Juta Rupiah)",
+        template='plotly_white',
+        height=400
+    )
+
+    st.plotly_chart(fig_regional_forecast, use_container_width=True)
+
     # Risk Factors
     st.subheader("⚠️ Faktor Risiko & Peluang")
     
@@ -201,7 +263,7 @@ def render_dashboard(data_collector, predictor, rag_system):
     # Summary insights
     st.subheader("💡 Key Insights")
     
-    summary = predictor.get_prediction_summary()
+    summary = predictor.get_prediction_summary(table)
     
     insights_col1, insights_col2 = st.columns(2)
     
@@ -223,17 +285,16 @@ def render_dashboard(data_collector, predictor, rag_system):
         - **Planning**: Siapkan buffer 10-15% dari prediksi
         """)
 
-def create_comprehensive_chart(historical_data, predictor):
+def create_comprehensive_chart(historical_data, table):
     """Create comprehensive chart dengan historical + prediksi"""
     
     # Historical data
     years = sorted(historical_data.keys())
     costs = [historical_data[year]['average']/1000000 for year in years]  # Convert to millions
     
-    # Future predictions
-    future_predictions = predictor.predict_multiple_years(3)
-    future_years = sorted(future_predictions.keys())
-    future_costs = [future_predictions[year]['realistis']/1000000 for year in future_years]
+    # Future predictions dari tabel forecast (trend dasar, tanpa penyesuaian pasar)
+    future_years = table.years[:3].tolist()
+    future_costs = (table.series(years_ahead=3) / 1000000).tolist()
     
     fig = go.Figure()
     
@@ -257,6 +318,18 @@ def create_comprehensive_chart(historical_data, predictor):
         marker=dict(size=6, color='red')
     ))
     
+    # Interval prediksi bootstrap 90%
+    lower = (table.series(statistic='lower', years_ahead=3) / 1000000).tolist()
+    upper = (table.series(statistic='upper', years_ahead=3) / 1000000).tolist()
+    fig.add_trace(go.Scatter(
+        x=future_years + future_years[::-1],
+        y=upper + lower[::-1],
+        fill='toself',
+        fillcolor='rgba(255,0,0,0.1)',
+        line=dict(color='rgba(255,0,0,0)'),
+        name='Interval Prediksi 90%'
+    ))
+    
     # Highlight anomali 2023
     fig.add_annotation(
         x=2023, 
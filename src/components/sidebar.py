@@ -44,7 +44,8 @@ def render_sidebar(config):
         
         st.markdown("---")
         st.header("Parameter Prediksi")
-        months_ahead = st.slider("Prediksi Bulan Ke Depan", 1, 36, 24)
+        # Nilai slider dibaca dashboard lewat st.session_state['months_ahead']
+        st.slider("Prediksi Bulan Ke Depan", 1, 36, 24, key="months_ahead")
         
         st.markdown("---")
         st.header("Informasi")
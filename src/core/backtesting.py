@@ -0,0 +1,150 @@
+"""Rolling-origin backtesting untuk model prediksi biaya haji"""
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable
+
+import numpy as np
+
+from .predictor import HajjCostPredictor
+
+# Forecaster: (data_latih, horizons) -> {'point': array, 'lower': array, 'upper': array}
+# 'lower'/'upper' opsional; harus fungsi top-level agar bisa dikirim ke process pool
+Forecaster = Callable[[Dict[int, Dict], np.ndarray], Dict[str, np.ndarray]]
+
+
+def hajj_predictor_forecaster(train_data: Dict[int, Dict], horizons: np.ndarray) -> Dict[str, np.ndarray]:
+    """Forecaster HajjCostPredictor: fit ulang pada data latih lalu prediksi h tahun ke depan
+
+    Interval bootstrap tidak dipakai backtest (lower/upper = skenario), sehingga dilewati.
+    """
+    predictor = HajjCostPredictor.from_historical_data(train_data)
+    predictions = predictor.predict_multiple_years(int(max(horizons)), include_intervals=False)
+    target_years = [predictor.latest_year + int(h) for h in horizons]
+
+    return {
+        'point': np.array([predictions[year]['realistis'] for year in target_years]),
+        'lower': np.array([predictions[year]['konservatif'] for year in target_years]),
+        'upper': np.array([predictions[year]['optimistis'] for year in target_years])
+    }
+
+
+def _run_origin(model_name: str, forecaster: Forecaster, origin: int,
+                train_data: Dict[int, Dict], horizons: np.ndarray):
+    """Fit dan prediksi satu model pada satu origin (dijalankan di worker)"""
+    start = time.perf_counter()
+    forecast = forecaster(train_data, horizons)
+    elapsed = time.perf_counter() - start
+    return model_name, origin, forecast, elapsed
+
+
+def _is_picklable(forecaster: Forecaster) -> bool:
+    """Cek apakah forecaster bisa dikirim ke process pool"""
+    try:
+        pickle.dumps(forecaster)
+        return True
+    except Exception:
+        return False
+
+
+def _score(errors: list, covered: list) -> Dict[str, float]:
+    """Hitung MAPE, bias, dan coverage interval (dalam persen)"""
+    if not errors:
+        return {'mape': float('nan'), 'bias': float('nan'), 'coverage': float('nan'), 'n_forecasts': 0}
+
+    errors = np.array(errors)
+    return {
+        'mape': float(np.mean(np.abs(errors)) * 100),
+        'bias': float(np.mean(errors) * 100),
+        'coverage': float(np.mean(covered) * 100) if covered else float('nan'),
+        'n_forecasts': len(errors)
+    }
+
+
+def run_backtest(forecasters: Dict[str, Forecaster], historical_data: Dict[int, Dict],
+                 horizons: Iterable[int] = (1, 2, 3), min_train_years: int = 3,
+                 series_key: str = 'average', max_workers: int = None) -> Dict[str, Dict]:
+    """Backtest rolling-origin: fit ulang tiap model di setiap tahun origin historis
+
+    Forecast h-langkah dibandingkan dengan nilai Keppres yang sudah diketahui
+    (tahun target yang tidak ada datanya dilewati). Kombinasi origin x model
+    dijalankan paralel di process pool; max_workers=1 menjalankannya berurutan,
+    dan forecaster yang tidak bisa di-pickle selalu dijalankan di proses ini.
+
+    Hasil per model: mape, bias (positif = over-forecast), coverage interval,
+    n_forecasts, wall_time (detik total fit+prediksi), dan rincian by_horizon.
+    """
+    horizons = np.array(sorted(set(horizons)), dtype=int)
+    years = sorted(historical_data.keys())
+    origins = years[min_train_years - 1:-1]
+
+    tasks = [
+        (name, forecaster, origin, {year: historical_data[year] for year in years if year <= origin}, horizons)
+        for name, forecaster in forecasters.items()
+        for origin in origins
+    ]
+
+    picklable = {name: max_workers != 1 and _is_picklable(forecaster) for name, forecaster in forecasters.items()}
+    parallel_tasks = [task for task in tasks if picklable[task[0]]]
+    local_tasks = [task for task in tasks if not picklable[task[0]]]
+
+    results = [_run_origin(*task) for task in local_tasks]
+    if parallel_tasks:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results.extend(executor.map(_run_origin, *zip(*parallel_tasks)))
+
+    # Kumpulkan error per model dan per horizon
+    collected = {
+        name: {'errors': [], 'covered': [], 'by_horizon': {int(h): ([], []) for h in horizons}, 'wall_time': 0.0}
+        for name in forecasters
+    }
+
+    for model_name, origin, forecast, elapsed in results:
+        entry = collected[model_name]
+        entry['wall_time'] += elapsed
+
+        for i, h in enumerate(horizons):
+            target_year = origin + int(h)
+            if target_year not in historical_data:
+                continue
+
+            actual = historical_data[target_year][series_key]
+            error = (forecast['point'][i] - actual) / actual
+            horizon_errors, horizon_covered = entry['by_horizon'][int(h)]
+            entry['errors'].append(error)
+            horizon_errors.append(error)
+
+            if 'lower' in forecast and 'upper' in forecast:
+                covered = forecast['lower'][i] <= actual <= forecast['upper'][i]
+                entry['covered'].append(covered)
+                horizon_covered.append(covered)
+
+    report = {}
+    for name, entry in collected.items():
+        summary = _score(entry['errors'], entry['covered'])
+        summary['wall_time'] = entry['wall_time']
+        summary['by_horizon'] = {h: _score(*values) for h, values in entry['by_horizon'].items()}
+        report[name] = summary
+
+    return report
+
+
+def format_backtest_report(report: Dict[str, Dict]) -> str:
+    """Format hasil backtest sebagai tabel teks"""
+    lines = [f"{'Model':<24}{'MAPE':>9}{'Bias':>9}{'Coverage':>10}{'N':>5}{'Waktu (ms)':>12}"]
+    for name, summary in report.items():
+        lines.append(
+            f"{name:<24}{summary['mape']:>8.2f}%{summary['bias']:>+8.2f}%"
+            f"{summary['coverage']:>9.1f}%{summary['n_forecasts']:>5}{summary['wall_time'] * 1000:>12.2f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    from .rag_system import RAGSystem
+
+    backtest = run_backtest(
+        {'HajjCostPredictor': hajj_predictor_forecaster},
+        RAGSystem().knowledge_base["data_historis"]
+    )
+    print(format_backtest_report(backtest))
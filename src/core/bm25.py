@@ -0,0 +1,83 @@
+"""Indeks BM25 untuk potongan (chunk) knowledge base dengan statistik term yang dihitung di muka
+
+Postings terbalik (term -> id dokumen & frekuensi term) beserta panjang
+dokumen dan idf dibangun sekali saat indeks dibuat. Skor query dihitung
+dengan menjumlahkan kontribusi postings term query ke satu array skor
+(tanpa loop per dokumen), lalu top-k diambil dengan argpartition, sehingga
+biaya query sebanding dengan panjang postings, bukan ukuran korpus.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Parameter BM25 standar (Robertson & Zaragoza, 2009)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Token: huruf/angka berurutan (mis. "2023", "embarkasi")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Token huruf kecil dari teks (tanpa stemming)"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """Indeks BM25 atas daftar dokumen (id, teks)"""
+
+    def __init__(self, documents: Iterable[Tuple[str, str]], k1: float = BM25_K1, b: float = BM25_B):
+        documents = list(documents)
+        self.doc_ids = [doc_id for doc_id, _ in documents]
+        self.texts = [text for _, text in documents]
+        self.k1 = k1
+        self.b = b
+
+        term_docs: Dict[str, List[int]] = {}
+        term_freqs: Dict[str, List[int]] = {}
+        lengths = np.zeros(len(documents))
+        for index, text in enumerate(self.texts):
+            tokens = tokenize(text)
+            lengths[index] = len(tokens)
+            for term, count in Counter(tokens).items():
+                term_docs.setdefault(term, []).append(index)
+                term_freqs.setdefault(term, []).append(count)
+
+        n_docs = len(documents)
+        average_length = lengths.mean() if n_docs else 0.0
+        # Normalisasi panjang per dokumen: k1 * (1 - b + b * |d| / avgdl)
+        length_norm = k1 * (1 - b + b * lengths / average_length) if average_length else np.full(n_docs, k1)
+
+        # Postings menyimpan bobot term-dokumen final (idf x saturasi tf), sehingga query cukup menjumlahkan
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, docs in term_docs.items():
+            docs = np.array(docs, dtype=np.intp)
+            tf = np.array(term_freqs[term], dtype=float)
+            idf = np.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = (docs, idf * tf * (k1 + 1) / (tf + length_norm[docs]))
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """Skor BM25 seluruh dokumen untuk query (term query berulang dihitung sekali)"""
+        scores = np.zeros(len(self.doc_ids))
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is not None:
+                # Dokumen unik per postings, sehingga fancy-index += aman
+                scores[posting[0]] += posting[1]
+        return scores
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Top-k (id dokumen, skor) dengan skor > 0, terurut menurun"""
+        if top_k <= 0:
+            return []
+        scores = self.scores(query)
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.doc_ids[i], float(scores[i])) for i in ranked]
@@ -2,6 +2,8 @@
 import os
 from dataclasses import dataclass
 
+from .context_budget import DEFAULT_TOKEN_BUDGET
+
 @dataclass
 class Config:
     """Application configuration"""
@@ -13,8 +15,12 @@ class Config:
     FINNHUB_URL: str = "https://finnhub.io/api/v1"
     FIXER_URL: str = "http://data.fixer.io/api"
     
+    # Batas token konteks RAG yang dikirim ke LLM
+    CONTEXT_TOKEN_BUDGET: int = DEFAULT_TOKEN_BUDGET
+    
     def __post_init__(self):
         """Load from environment variables if available"""
         self.OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", self.OPENROUTER_API_KEY)
         self.FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY", self.FINNHUB_API_KEY)
         self.FIXER_API_KEY = os.getenv("FIXER_API_KEY", self.FIXER_API_KEY)
+        self.CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", self.CONTEXT_TOKEN_BUDGET))
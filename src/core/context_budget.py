@@ -0,0 +1,82 @@
+"""Perakitan konteks LLM dalam batas token: section diberi skor relevansi lalu dipack secara greedy
+
+Jumlah token diestimasi secara lokal (tanpa tokenizer model) dari potongan
+kata/tanda baca, dengan kata panjang dihitung sebagai beberapa subword,
+sehingga cenderung sedikit melebihi hitungan tokenizer BPE. Section diberi
+skor BM25 terhadap query di antara kandidat, lalu diambil dari skor tertinggi
+selama masih muat di budget; section yang tidak muat dilaporkan sebagai
+dropped. Urutan section di teks akhir tetap mengikuti urutan kandidat.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from .bm25 import BM25Index
+
+# Budget token konteks bawaan (header + section + footer)
+DEFAULT_TOKEN_BUDGET = 1500
+
+# Estimasi tokenizer: satu token per potongan, ditambah satu per CHARS_PER_TOKEN karakter ekstra
+CHARS_PER_TOKEN = 4
+TOKEN_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimasi cepat jumlah token teks"""
+    pieces = TOKEN_PIECE_PATTERN.findall(text)
+    return len(pieces) + sum((len(piece) - 1) // CHARS_PER_TOKEN for piece in pieces)
+
+
+@dataclass(frozen=True)
+class ContextSection:
+    """Satu kandidat section konteks beserta skor relevansi dan estimasi tokennya"""
+    name: str
+    text: str
+    score: float = 0.0
+    tokens: int = 0
+
+
+@dataclass(frozen=True)
+class AssembledContext:
+    """Hasil perakitan: teks konteks, token terpakai, dan section yang masuk/dibuang"""
+    text: str
+    tokens: int
+    budget: int
+    included: Tuple[str, ...]
+    dropped: Tuple[str, ...]
+
+
+def score_sections(query: str, sections: Sequence[Tuple[str, str]]) -> List[ContextSection]:
+    """Skor BM25 query terhadap tiap kandidat (nama, teks) beserta estimasi tokennya"""
+    sections = list(sections)
+    scores = BM25Index(sections).scores(query) if sections else []
+    return [ContextSection(name, text, float(score), estimate_tokens(text))
+            for (name, text), score in zip(sections, scores)]
+
+
+def pack_sections(sections: Sequence[ContextSection], budget: int = DEFAULT_TOKEN_BUDGET,
+                  header: str = "", footer: str = "") -> AssembledContext:
+    """Pack section greedy berdasarkan skor ke dalam budget (header & footer selalu disertakan)
+
+    Skor sama diurutkan sesuai urutan kandidat. Section yang tidak muat
+    dilewati, dan section berikutnya yang lebih kecil tetap dicoba. Budget
+    yang bahkan tidak cukup untuk header & footer ditolak dengan ValueError.
+    """
+    reserved = estimate_tokens(header) + estimate_tokens(footer)
+    if budget < reserved:
+        raise ValueError(f"Budget token ({budget}) lebih kecil dari header & footer konteks ({reserved} token)")
+    available = budget - reserved
+    chosen = set()
+    for index in sorted(range(len(sections)), key=lambda i: -sections[i].score):
+        if sections[index].tokens <= available:
+            chosen.add(index)
+            available -= sections[index].tokens
+
+    included = [section for index, section in enumerate(sections) if index in chosen]
+    return AssembledContext(
+        text="".join([header, *(section.text for section in included), footer]),
+        tokens=reserved + sum(section.tokens for section in included),
+        budget=budget,
+        included=tuple(section.name for section in included),
+        dropped=tuple(section.name for index, section in enumerate(sections) if index not in chosen)
+    )
@@ -0,0 +1,101 @@
+"""Model biaya per komponen dengan eksposur mata uang (USD, SAR, IDR)"""
+from dataclasses import dataclass
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Mata uang yang didukung, urutan ini dipakai sebagai indeks array kurs
+CURRENCIES = ('USD', 'SAR', 'IDR')
+
+# Riyal dipatok ke dolar AS, sehingga kurs SAR/IDR mengikuti USD/IDR
+SAR_PER_USD = 3.75
+
+
+@dataclass(frozen=True)
+class CostComponent:
+    """Spesifikasi satu komponen biaya"""
+    name: str
+    share: float  # Porsi dari total biaya pada tahun dasar
+    currency: str  # Mata uang pembayaran: 'USD', 'SAR', atau 'IDR'
+    growth_driver: str  # Nama driver pertumbuhan harga dalam mata uang lokalnya
+
+
+# Persentase komponen berdasarkan analisis rata-rata Keppres
+DEFAULT_COMPONENTS = (
+    CostComponent('penerbangan', 0.28, 'USD', 'harga_penerbangan'),
+    CostComponent('akomodasi_makkah', 0.23, 'SAR', 'tarif_akomodasi_saudi'),
+    CostComponent('akomodasi_madinah', 0.17, 'SAR', 'tarif_akomodasi_saudi'),
+    CostComponent('biaya_hidup', 0.12, 'SAR', 'inflasi_saudi'),
+    CostComponent('pelayanan_haji', 0.10, 'IDR', 'inflasi_indonesia'),
+    CostComponent('transportasi_lokal', 0.07, 'SAR', 'inflasi_saudi'),
+    CostComponent('administrasi', 0.03, 'IDR', 'inflasi_indonesia'),
+)
+
+
+class CostComponentModel:
+    """Evaluasi breakdown biaya sebagai tensor (komponen x tahun x skenario kurs)
+
+    Setiap komponen tumbuh dengan driver-nya sendiri dalam mata uang lokal,
+    lalu dikonversi ke IDR dengan kurs skenario relatif terhadap kurs dasar.
+    Driver yang tidak diberi nilai memakai growth default (trend historis),
+    sehingga pada kurs dasar total breakdown sama dengan prediksi total.
+    """
+
+    def __init__(self, components: Sequence[CostComponent] = DEFAULT_COMPONENTS,
+                 base_exchange_rate: float = 15000):
+        unknown = {component.currency for component in components} - set(CURRENCIES)
+        if unknown:
+            raise ValueError(f"Mata uang tidak didukung: {', '.join(sorted(unknown))}")
+
+        self.components = tuple(components)
+        self.names = [component.name for component in self.components]
+        self.base_exchange_rate = base_exchange_rate
+        self.shares = np.array([component.share for component in self.components])
+        self.currency_index = np.array([CURRENCIES.index(component.currency) for component in self.components])
+        self.drivers = sorted({component.growth_driver for component in self.components})
+        self.driver_index = np.array([self.drivers.index(component.growth_driver) for component in self.components])
+
+    @property
+    def fx_exposure(self) -> float:
+        """Porsi biaya dasar yang dibayar dalam valuta asing (USD/SAR)"""
+        return float(self.shares[self.currency_index != CURRENCIES.index('IDR')].sum())
+
+    def _fx_factors(self, usd_idr, sar_idr, n_years: int) -> np.ndarray:
+        """Faktor kurs per mata uang dengan shape (mata_uang, tahun, skenario)"""
+        usd_relative = np.asarray(usd_idr, dtype=float) / self.base_exchange_rate
+        if sar_idr is None:
+            sar_relative = usd_relative
+        else:
+            sar_relative = np.asarray(sar_idr, dtype=float) / (self.base_exchange_rate / SAR_PER_USD)
+
+        # Kurs boleh per skenario (S,) atau berupa jalur per tahun (S, Y)
+        def as_year_scenario(relative):
+            relative = np.atleast_1d(relative)
+            if relative.ndim == 1:
+                relative = relative[:, np.newaxis]
+            return np.broadcast_to(relative, (relative.shape[0], n_years)).T
+
+        usd_factor = as_year_scenario(usd_relative)
+        sar_factor = as_year_scenario(sar_relative)
+        usd_factor, sar_factor = np.broadcast_arrays(usd_factor, sar_factor)
+        return np.stack([usd_factor, sar_factor, np.ones_like(usd_factor)])
+
+    def evaluate(self, base_cost: float, years_ahead, usd_idr=15000, sar_idr=None,
+                 growth_drivers: Dict[str, float] = None, default_growth: float = 0.03) -> np.ndarray:
+        """Hitung tensor biaya (komponen, tahun, skenario kurs) dalam satu operasi array
+
+        years_ahead: array horizon (tahun). usd_idr/sar_idr: kurs per skenario (S,)
+        atau jalur kurs (S, Y); sar_idr default mengikuti patokan SAR/USD.
+        growth_drivers: growth tahunan per nama driver, sisanya default_growth.
+        """
+        horizons = np.atleast_1d(np.asarray(years_ahead, dtype=float))
+        growth_drivers = growth_drivers or {}
+        driver_rates = np.array([growth_drivers.get(driver, default_growth) for driver in self.drivers])
+
+        # (komponen, tahun): pertumbuhan harga dalam mata uang lokal
+        component_growth = (1 + driver_rates[self.driver_index])[:, np.newaxis] ** horizons[np.newaxis, :]
+
+        # (komponen, tahun, skenario): konversi ke IDR sesuai kurs skenario
+        fx = self._fx_factors(usd_idr, sar_idr, len(horizons))[self.currency_index]
+
+        return (base_cost * self.shares)[:, np.newaxis, np.newaxis] * component_growth[:, :, np.newaxis] * fx
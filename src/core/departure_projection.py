@@ -0,0 +1,120 @@
+"""Proyeksi biaya tahun keberangkatan untuk file pendaftar haji (streaming per chunk)"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+import numpy as np
+
+from .savings_planner import encode_labels
+
+# Kolom input/output file pendaftar
+INPUT_COLUMNS = ('registration_date', 'province', 'embarkasi')
+OUTPUT_COLUMNS = ('departure_year', 'waiting_years', 'projected_cost')
+
+
+def _project_frame(projector: 'DepartureCostProjector', frame, header: bool) -> str:
+    """Unit kerja per chunk DataFrame: tambahkan kolom OUTPUT_COLUMNS lalu serialisasi ke CSV (di worker)"""
+    import pandas as pd
+
+    registration_year = pd.to_datetime(frame['registration_date']).dt.year.to_numpy()
+    result = projector.project(registration_year, frame['province'].to_numpy(), frame['embarkasi'].to_numpy())
+    for column in OUTPUT_COLUMNS:
+        frame[column] = result[column]
+    # Format CSV (bagian termahal) dikerjakan worker; proses utama hanya menulis teks
+    return frame.to_csv(header=header, index=False)
+
+
+class DepartureCostProjector:
+    """Gabungkan pendaftar dengan tabel masa tunggu per provinsi lalu lookup biaya keberangkatan
+
+    Tabel biaya (tahun x target) dihitung sekali: biaya Keppres untuk tahun
+    historis dan forecast predictor untuk tahun sesudahnya, dengan kolom
+    seluruh embarkasi plus 'average'. Setiap baris cukup dipetakan ke
+    (indeks tahun, indeks kolom) sehingga lookup berupa satu fancy indexing.
+    """
+
+    AVERAGE_KEY = 'average'
+
+    def __init__(self, predictor, waiting_years: Dict[str, float], horizon: int = 60):
+        if not waiting_years:
+            raise ValueError("Tabel masa tunggu per provinsi tidak boleh kosong")
+
+        self.provinces = list(waiting_years)
+        self.province_index = {name: i for i, name in enumerate(self.provinces)}
+        self.waiting_years = np.array([waiting_years[name] for name in self.provinces], dtype=float)
+
+        self.targets = list(predictor.embarkasi) + [self.AVERAGE_KEY]
+        self.target_index = {name: i for i, name in enumerate(self.targets)}
+
+        # Baris: tahun historis pertama s.d. latest_year + horizon (tahun kosong bernilai NaN)
+        self.first_year = int(predictor.matrix_years[0])
+        last_year = predictor.latest_year + horizon
+        self.cost_table = np.full((last_year - self.first_year + 1, len(self.targets)), np.nan)
+
+        history_rows = predictor.matrix_years - self.first_year
+        self.cost_table[history_rows, :-1] = predictor.cost_matrix
+        self.cost_table[history_rows, -1] = predictor.average_costs
+
+        horizons = np.arange(1, horizon + 1)
+        future_rows = predictor.latest_year + horizons - self.first_year
+        self.cost_table[future_rows, :-1] = predictor.predict_regional_costs(horizon)
+        self.cost_table[future_rows, -1] = predictor.predict_batch(horizons)[0]
+        self.cost_table.flags.writeable = False
+
+    def project(self, registration_year, province, embarkasi) -> Dict[str, np.ndarray]:
+        """Tahun keberangkatan dan biaya proyeksinya untuk array pendaftar
+
+        Tahun keberangkatan = tahun daftar + masa tunggu provinsi (dibulatkan ke
+        atas). Tahun di luar tabel biaya (atau tanpa data Keppres) bernilai NaN.
+        """
+        registration_year = np.asarray(registration_year, dtype=np.int64)
+        waiting = self.waiting_years[encode_labels(province, self.province_index, 'Provinsi')]
+        columns = encode_labels(embarkasi, self.target_index)
+
+        departure_year = registration_year + np.ceil(waiting).astype(np.int64)
+        rows = departure_year - self.first_year
+        in_range = (rows >= 0) & (rows < self.cost_table.shape[0])
+        cost = np.full(rows.shape, np.nan)
+        cost[in_range] = self.cost_table[rows[in_range], columns[in_range]]
+
+        return {
+            'departure_year': departure_year,
+            'waiting_years': waiting,
+            'projected_cost': cost
+        }
+
+    def project_csv(self, input_path, output_path, chunk_size: int = 100_000,
+                    max_workers: int = None) -> int:
+        """Proses file CSV pendaftar per chunk dan tulis hasil secara inkremental
+
+        Chunk dikirim ke process pool (max_workers=1 untuk berurutan) dengan
+        paling banyak 2 x max_workers chunk dalam proses sekaligus, sehingga
+        memori tetap terbatas berapa pun ukuran file. Urutan baris output sama
+        dengan input. Mengembalikan jumlah baris yang ditulis.
+        """
+        # Import lazy: pandas hanya dibutuhkan untuk pemrosesan file
+        import pandas as pd
+
+        reader = pd.read_csv(input_path, chunksize=chunk_size)
+        n_rows = 0
+
+        with open(output_path, 'w', newline='') as output:
+            if max_workers == 1:
+                for i, frame in enumerate(reader):
+                    output.write(_project_frame(self, frame, header=i == 0))
+                    n_rows += len(frame)
+                return n_rows
+
+            max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for i, frame in enumerate(reader):
+                    pending.append(executor.submit(_project_frame, self, frame, i == 0))
+                    n_rows += len(frame)
+                    if len(pending) >= max_in_flight:
+                        output.write(pending.popleft().result())
+                while pending:
+                    output.write(pending.popleft().result())
+
+        return n_rows
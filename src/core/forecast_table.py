@@ -0,0 +1,171 @@
+"""Tabel forecast termaterialisasi (tahun x node x skenario x statistik) dengan lookup O(1)
+
+Bagian tabel yang tidak bergantung data pasar (forecast rekonsiliasi, interval
+bootstrap, persentil Monte Carlo) dibangun sekali per versi data (hash
+data_historis) dan dibagikan read-only ke semua sesi dalam proses lewat cache
+modul. Harga emas dan kurs hanya menentukan rasio skenario, yang diterapkan
+ke blok bersama itu setiap kali tabel diminta, sehingga kuotasi pasar baru
+tidak memicu simulasi, bootstrap, atau rekonsiliasi ulang.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .model_store import data_hash
+
+# Statistik per sel tabel: forecast titik, batas interval bootstrap, confidence (%),
+# serta persentil dan mean simulasi Monte Carlo
+STATISTICS = ('point', 'lower', 'upper', 'confidence', 'p5', 'p50', 'p95', 'mean')
+
+# Jumlah jalur dan seed simulasi Monte Carlo di tabel (seed tetap agar tabel bersama deterministik)
+SIMULATION_PATHS = 200_000
+SIMULATION_SEED = 0
+
+# Skenario trend murni tanpa penyesuaian emas/kurs (forecast rekonsiliasi apa adanya)
+BASELINE_SCENARIO = 'baseline'
+
+# Jumlah blok forecast (versi data) yang disimpan di cache proses
+TABLE_CACHE_SIZE = 16
+
+# Versi struktur tabel; bagian dari kunci cache
+TABLE_VERSION = 2
+
+_block_cache: 'OrderedDict[Tuple, Dict[str, np.ndarray]]' = OrderedDict()
+# Sesi Streamlit berjalan di thread terpisah; build dan eviksi cache diserialisasi
+_table_lock = threading.Lock()
+
+
+def _build_block(predictor, horizon: int) -> Dict[str, np.ndarray]:
+    """Array tabel yang tidak bergantung data pasar, per tahun (read-only)
+
+    - reconciled: forecast koheren (tahun, node)
+    - baseline: trend dasar nasional (tahun,), penyebut rasio skenario
+    - lower_ratio/upper_ratio/confidence: interval bootstrap nasional per tahun
+    - simulated_ratio: p5/p50/p95/mean Monte Carlo terhadap trend dasar (tahun, 4)
+    """
+    horizons = np.arange(1, horizon + 1)
+    baseline = predictor.predict_batch(horizons)[0]
+
+    # Interval bootstrap nasional sebagai rasio terhadap forecast titik model
+    interval = predictor.get_prediction_intervals(horizon, [predictor.INTERVAL_MODEL])[predictor.INTERVAL_MODEL]
+    model_point = np.array(interval['point'])
+
+    simulation = predictor.simulate_prediction_scenarios(horizon, SIMULATION_PATHS, seed=SIMULATION_SEED)
+    years = predictor.latest_year + horizons
+    simulated = np.array([[simulation[year][key] for key in ('p5', 'p50', 'p95', 'mean')] for year in years])
+
+    block = {
+        'reconciled': np.array(predictor.predict_reconciled(horizon)),
+        'baseline': baseline,
+        'lower_ratio': np.array(interval['lower']) / model_point,
+        'upper_ratio': np.array(interval['upper']) / model_point,
+        'confidence': np.round(np.array(interval['within_tolerance']) * 100),
+        'simulated_ratio': simulated / baseline[:, np.newaxis],
+        # Ukuran pool residual di balik confidence; di bawah batas minimum angkanya hanya indikatif
+        'confidence_residuals': interval['n_residuals'],
+        'confidence_reliable': interval['reliable']
+    }
+    for value in block.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+    return block
+
+
+def get_forecast_block(predictor, horizon: int = None) -> Dict[str, np.ndarray]:
+    """Blok forecast bersama untuk versi data ini, dibangun hanya saat belum ada di cache proses"""
+    horizon = horizon or predictor.REGIONAL_FORECAST_HORIZON
+    key = (data_hash(predictor.historical_data), horizon, TABLE_VERSION)
+    with _table_lock:
+        block = _block_cache.get(key)
+        if block is None:
+            block = _build_block(predictor, horizon)
+            _block_cache[key] = block
+            while len(_block_cache) > TABLE_CACHE_SIZE:
+                _block_cache.popitem(last=False)
+        else:
+            _block_cache.move_to_end(key)
+    return block
+
+
+class ForecastTable:
+    """Array forecast dense (tahun, node, skenario, statistik) beserta peta indeks
+
+    Node: 'average' lalu seluruh embarkasi (hasil rekonsiliasi MinT, sehingga
+    'average' = rata-rata embarkasi). Skenario: BASELINE_SCENARIO lalu
+    skenario bawaan predictor; skenario pasar menskalakan forecast node dengan
+    rasio biaya skenario terhadap trend dasar nasional. Interval dan
+    confidence berasal dari bootstrap deret nasional (rasio terhadap forecast
+    titik) dan dipakai untuk semua node dan skenario; begitu pula persentil
+    Monte Carlo (rasio terhadap trend dasar nasional). Semua bagian selain
+    rasio skenario diambil dari blok bersama get_forecast_block.
+    """
+
+    def __init__(self, predictor, gold_price: float = 2000, exchange_rate: float = 15000,
+                 horizon: int = None):
+        horizon = horizon or predictor.REGIONAL_FORECAST_HORIZON
+        horizons = np.arange(1, horizon + 1)
+        block = get_forecast_block(predictor, horizon)
+
+        self.gold_price = gold_price
+        self.exchange_rate = exchange_rate
+        self.years = predictor.latest_year + horizons
+        self.nodes = list(predictor.reconciliation_nodes)
+        self.scenarios = [BASELINE_SCENARIO] + list(predictor._default_scenarios.names)
+        self.statistics = list(STATISTICS)
+        self.first_year = int(self.years[0])
+        self.node_index = {name: i for i, name in enumerate(self.nodes)}
+        self.scenario_index = {name: i for i, name in enumerate(self.scenarios)}
+        self.statistic_index = {name: i for i, name in enumerate(self.statistics)}
+        self.confidence_residuals = block['confidence_residuals']
+        self.confidence_reliable = block['confidence_reliable']
+
+        # (tahun, node) koheren, lalu rasio skenario (skenario, tahun) terhadap trend dasar nasional
+        scenario_costs = predictor.evaluate_scenarios(predictor._default_scenarios, horizons,
+                                                      gold_price, exchange_rate)
+        ratios = np.vstack([np.ones(horizon), scenario_costs / block['baseline']])
+        point = block['reconciled'][:, :, np.newaxis] * ratios.T[:, np.newaxis, :]
+
+        def per_year(values):
+            return values[:, np.newaxis, np.newaxis]
+
+        self.values = np.concatenate([
+            np.stack([
+                point,
+                point * per_year(block['lower_ratio']),
+                point * per_year(block['upper_ratio']),
+                np.broadcast_to(per_year(block['confidence']), point.shape)
+            ], axis=-1),
+            point[..., np.newaxis] * block['simulated_ratio'][:, np.newaxis, np.newaxis, :]
+        ], axis=-1)
+        self.values.flags.writeable = False
+
+    def get(self, year: int, node: str = 'average', scenario: str = BASELINE_SCENARIO,
+            statistic: str = 'point') -> float:
+        """Satu nilai tabel dengan lookup O(1)"""
+        row = year - self.first_year
+        if not 0 <= row < len(self.years):
+            raise KeyError(f"Tahun {year} di luar tabel forecast ({self.first_year}-{self.years[-1]})")
+        return float(self.values[row, self.node_index[node], self.scenario_index[scenario],
+                                 self.statistic_index[statistic]])
+
+    def series(self, node: str = 'average', scenario: str = BASELINE_SCENARIO,
+               statistic: str = 'point', years_ahead: int = None) -> np.ndarray:
+        """View read-only nilai per tahun (tanpa salinan) untuk node/skenario/statistik tertentu"""
+        return self.values[:years_ahead, self.node_index[node], self.scenario_index[scenario],
+                           self.statistic_index[statistic]]
+
+    def scenario_values(self, year: int, node: str = 'average', statistic: str = 'point') -> Dict[str, float]:
+        """Nilai semua skenario pasar (tanpa baseline) untuk satu tahun dan node"""
+        return {scenario: self.get(year, node, scenario, statistic) for scenario in self.scenarios[1:]}
+
+    def node_values(self, years_ahead: int = None, scenario: str = BASELINE_SCENARIO,
+                    statistic: str = 'point') -> np.ndarray:
+        """View (tahun, embarkasi) untuk semua embarkasi, urutan kolom seperti predictor.embarkasi"""
+        return self.values[:years_ahead, 1:, self.scenario_index[scenario], self.statistic_index[statistic]]
+
+
+def get_forecast_table(predictor, gold_price: float = 2000, exchange_rate: float = 15000) -> ForecastTable:
+    """Tabel forecast untuk data & pasar ini: blok bersama dari cache, rasio skenario dihitung per panggilan"""
+    return ForecastTable(predictor, gold_price, exchange_rate)
@@ -0,0 +1,120 @@
+"""Akumulator statistik pertumbuhan inkremental (Welford & running sums)"""
+import heapq
+import math
+
+
+class RunningGrowthStats:
+    """Mean & std (Welford) serta median (dua heap) yang diperbarui per observasi"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        # Setengah bawah sebagai max-heap (nilai dinegasikan), setengah atas min-heap
+        self._lower = []
+        self._upper = []
+
+    def add(self, value: float):
+        """Tambahkan satu observasi: O(1) untuk mean/std, O(log n) untuk median"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        if not self._lower or value <= -self._lower[0]:
+            heapq.heappush(self._lower, -value)
+        else:
+            heapq.heappush(self._upper, value)
+
+        # Jaga agar ukuran heap bawah = heap atas atau lebih satu
+        if len(self._lower) > len(self._upper) + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif len(self._upper) > len(self._lower):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+
+    def to_dict(self) -> dict:
+        """State akumulator yang bisa di-serialisasi ke JSON"""
+        return {'count': self.count, 'mean': self.mean, 'm2': self._m2,
+                'lower': list(self._lower), 'upper': list(self._upper)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'RunningGrowthStats':
+        """Pulihkan akumulator dari hasil to_dict"""
+        stats = cls()
+        stats.count = state['count']
+        stats.mean = state['mean']
+        stats._m2 = state['m2']
+        stats._lower = list(state['lower'])
+        stats._upper = list(state['upper'])
+        return stats
+
+    @property
+    def variance(self) -> float:
+        """Varians populasi (ddof=0), sama dengan np.var"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Standar deviasi populasi (ddof=0), sama dengan np.std"""
+        return math.sqrt(self.variance)
+
+    @property
+    def median(self) -> float:
+        """Median berjalan"""
+        if not self.count:
+            return 0.0
+        if len(self._lower) > len(self._upper):
+            return -self._lower[0]
+        return (-self._lower[0] + self._upper[0]) / 2
+
+
+class RunningLinearRegression:
+    """Regresi linear sederhana dari running sums (n, Σx, Σy, Σxy, Σx²)"""
+
+    def __init__(self):
+        self.n = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        self.sum_x2 = 0.0
+
+    def add(self, x: float, y: float):
+        """Tambahkan satu titik (x, y) dalam O(1)"""
+        self.n += 1
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_xy += x * y
+        self.sum_x2 += x * x
+
+    def to_dict(self) -> dict:
+        """State running sums yang bisa di-serialisasi ke JSON"""
+        return {'n': self.n, 'sum_x': self.sum_x, 'sum_y': self.sum_y,
+                'sum_xy': self.sum_xy, 'sum_x2': self.sum_x2}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'RunningLinearRegression':
+        """Pulihkan regresi dari hasil to_dict"""
+        regression = cls()
+        regression.n = state['n']
+        regression.sum_x = state['sum_x']
+        regression.sum_y = state['sum_y']
+        regression.sum_xy = state['sum_xy']
+        regression.sum_x2 = state['sum_x2']
+        return regression
+
+    @property
+    def slope(self) -> float:
+        denominator = self.n * self.sum_x2 - self.sum_x * self.sum_x
+        if denominator == 0:
+            return 0.0
+        return (self.n * self.sum_xy - self.sum_x * self.sum_y) / denominator
+
+    @property
+    def intercept(self) -> float:
+        if not self.n:
+            return 0.0
+        return (self.sum_y - self.slope * self.sum_x) / self.n
+
+    @property
+    def mean_y(self) -> float:
+        return self.sum_y / self.n if self.n else 0.0
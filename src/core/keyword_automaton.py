@@ -0,0 +1,85 @@
+"""Automaton Aho-Corasick untuk mencocokkan banyak kata pemicu dalam satu kali scan query
+
+Setiap kata pemicu dipetakan ke bitmask section yang dipicunya. Hasil scan
+adalah OR seluruh bitmask kata yang muncul sebagai substring query (semantik
+sama dengan `word in query`, termasuk kata yang saling tumpang tindih), dengan
+biaya sebanding panjang query, tidak bergantung jumlah kata pemicu.
+"""
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+class KeywordAutomaton:
+    """Automaton multi-pola: section -> kata pemicu, dikompilasi sekali"""
+
+    def __init__(self, triggers: Dict[str, Iterable[str]]):
+        self.sections: List[str] = list(triggers)
+        self.section_bits = {name: 1 << i for i, name in enumerate(self.sections)}
+
+        # Trie: transisi per state, dan bitmask output per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[int] = [0]
+        for name, words in triggers.items():
+            for word in words:
+                self._add(word.lower(), self.section_bits[name])
+        self._build_failure_links()
+
+    def _add(self, word: str, bits: int):
+        """Sisipkan satu kata ke trie"""
+        if not word:
+            raise ValueError("Kata pemicu tidak boleh kosong")
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._output.append(0)
+            state = next_state
+        self._output[state] |= bits
+
+    def _build_failure_links(self):
+        """Failure link BFS, lalu lengkapi transisi (DFA) agar scan tanpa loop fallback"""
+        failure = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = failure[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = failure[fallback]
+                target = self._goto[fallback].get(char, 0)
+                failure[next_state] = target if target != next_state else 0
+                # Output state mencakup semua kata yang merupakan sufiksnya
+                self._output[next_state] |= self._output[failure[next_state]]
+
+        # Transisi yang hilang diarahkan lewat failure link (urutan BFS menjamin parent sudah lengkap)
+        order = list(self._goto[0].values())
+        index = 0
+        while index < len(order):
+            state = order[index]
+            index += 1
+            for char, next_state in self._goto[state].items():
+                order.append(next_state)
+            self._goto[state] = {**self._goto[failure[state]], **self._goto[state]}
+
+    def match_mask(self, text: str) -> int:
+        """Bitmask semua section yang kata pemicunya muncul di text (satu kali scan)"""
+        goto = self._goto
+        output = self._output
+        state = 0
+        mask = 0
+        for char in text.lower():
+            state = goto[state].get(char, 0)
+            mask |= output[state]
+        return mask
+
+    def match(self, text: str) -> List[str]:
+        """Nama section yang terpicu, urut sesuai definisi"""
+        return self.sections_for(self.match_mask(text))
+
+    def sections_for(self, mask: int) -> List[str]:
+        """Nama section untuk bitmask hasil match_mask"""
+        return [name for name in self.sections if mask & self.section_bits[name]]
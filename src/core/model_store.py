@@ -0,0 +1,98 @@
+"""Penyimpanan artefak model yang diberi versi dengan hash konten data sumber"""
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Lokasi default artefak: <repo>/data/models, bisa di-override lewat environment
+DEFAULT_ARTIFACT_DIR = Path(os.getenv(
+    "MODEL_ARTIFACT_DIR",
+    Path(__file__).resolve().parents[2] / "data" / "models"
+))
+
+# Naikkan jika struktur payload artefak berubah agar artefak lama diabaikan
+ARTIFACT_FORMAT_VERSION = 1
+
+# Jumlah payload yang disimpan di cache proses (LRU); subset data ad-hoc seperti origin
+# backtesting menghasilkan hash baru di setiap panggilan
+MEMORY_CACHE_SIZE = 64
+
+# Cache in-process: (nama, hash data, versi) -> payload
+_memory_cache: 'OrderedDict[tuple, Any]' = OrderedDict()
+
+
+def data_hash(data: Any) -> str:
+    """Hash SHA-256 dari konten data (urutan kunci dict tidak berpengaruh)"""
+    encoded = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _artifact_path(name: str, artifact_dir) -> Path:
+    return Path(artifact_dir) / f"{name}.json"
+
+
+def load_artifact(name: str, expected_hash: str, version: int = 1, artifact_dir=None):
+    """Muat payload artefak jika hash data dan versinya cocok, selain itu None"""
+    path = _artifact_path(name, artifact_dir or DEFAULT_ARTIFACT_DIR)
+    try:
+        with open(path, encoding='utf-8') as f:
+            artifact = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (artifact.get('format_version') != ARTIFACT_FORMAT_VERSION
+            or artifact.get('version') != version
+            or artifact.get('data_hash') != expected_hash):
+        return None
+    return artifact.get('payload')
+
+
+def save_artifact(name: str, source_hash: str, payload: Any, version: int = 1, artifact_dir=None) -> bool:
+    """Simpan payload artefak secara atomik; False jika direktori tidak bisa ditulis"""
+    path = _artifact_path(name, artifact_dir or DEFAULT_ARTIFACT_DIR)
+    artifact = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'name': name,
+        'version': version,
+        'data_hash': source_hash,
+        'payload': payload
+    }
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(artifact, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        return False
+
+
+def load_or_build(name: str, source_data: Any, build_fn: Callable[[], Any],
+                  version: int = 1, artifact_dir=None, persist: bool = True) -> Any:
+    """Ambil payload dari cache memori/disk, atau bangun ulang jika hash data berubah
+
+    build_fn harus menghasilkan payload yang bisa di-serialisasi ke JSON.
+    persist=False hanya memakai cache memori (mis. untuk subset data ad-hoc).
+    Payload yang dikembalikan selalu salinan, sehingga aman dimodifikasi.
+    """
+    source_hash = data_hash(source_data)
+    key = (name, source_hash, version)
+
+    if key not in _memory_cache:
+        payload = load_artifact(name, source_hash, version, artifact_dir) if persist else None
+        if payload is None:
+            payload = build_fn()
+            if persist:
+                save_artifact(name, source_hash, payload, version, artifact_dir)
+        _memory_cache[key] = payload
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+    else:
+        _memory_cache.move_to_end(key)
+
+    return copy.deepcopy(_memory_cache[key])
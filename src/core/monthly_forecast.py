@@ -0,0 +1,142 @@
+"""Forecast bulanan biaya haji dengan indeks bulan Masehi/Hijriah yang dihitung di muka
+
+Kalender Hijriah memakai kalender tabular (aritmetika, siklus 30 tahun), cukup
+akurat pada resolusi bulan. Biaya Keppres tahun Y berlaku untuk musim haji
+(10 Zulhijah) pada year_hijri-nya, sehingga horizon forecast diukur dalam
+musim haji (tahun Hijriah) sejak musim haji data terakhir. Skenario dievaluasi
+lewat CompiledScenarios yang sama dengan angka skenario tahunan, sehingga di
+bulan musim haji tahun-tahun berikutnya kurva tepat sama dengan
+evaluate_scenarios untuk horizon k.
+"""
+from datetime import date
+from typing import Dict
+
+import numpy as np
+
+from .scenarios import CompiledScenarios
+
+# Panjang rata-rata tahun Hijriah tabular (hari): 10631 hari per siklus 30 tahun
+HIJRI_YEAR_DAYS = 10631 / 30
+
+# Tanggal wukuf/musim haji: 10 Zulhijah (bulan ke-12)
+HAJJ_MONTH, HAJJ_DAY = 12, 10
+
+
+def gregorian_to_jdn(year, month, day):
+    """Julian Day Number dari tanggal Masehi (skalar atau array integer)"""
+    year, month, day = (np.asarray(value, dtype=np.int64) for value in (year, month, day))
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+
+
+def jdn_to_gregorian(jdn):
+    """Tanggal Masehi (tahun, bulan, hari) dari Julian Day Number"""
+    a = np.asarray(jdn, dtype=np.int64) + 32044
+    b = (4 * a + 3) // 146097
+    c = a - 146097 * b // 4
+    d = (4 * c + 3) // 1461
+    e = c - 1461 * d // 4
+    m = (5 * e + 2) // 153
+    return 100 * b + d - 4800 + m // 10, m + 3 - 12 * (m // 10), e - (153 * m + 2) // 5 + 1
+
+
+def jdn_to_hijri(jdn):
+    """Tanggal Hijriah tabular (tahun, bulan, hari) dari Julian Day Number"""
+    l = np.asarray(jdn, dtype=np.int64) - 1948440 + 10632
+    n = (l - 1) // 10631
+    l = l - 10631 * n + 354
+    j = ((10985 - l) // 5316) * ((50 * l) // 17719) + (l // 5670) * ((43 * l) // 15238)
+    l = l - ((30 - j) // 15) * ((17719 * j) // 50) - (j // 16) * ((15238 * j) // 43) + 29
+    month = (24 * l) // 709
+    day = l - (709 * month) // 24
+    return 30 * n + j - 30, month, day
+
+
+def hijri_to_jdn(year, month, day):
+    """Julian Day Number dari tanggal Hijriah tabular"""
+    year, month, day = (np.asarray(value, dtype=np.int64) for value in (year, month, day))
+    return (11 * year + 3) // 30 + 354 * year + 30 * month - (month - 1) // 2 + day + 1948440 - 385
+
+
+def parse_hijri_year(label: str) -> int:
+    """Tahun Hijriah dari label data_historis seperti '1446H'"""
+    return int(str(label).rstrip('Hh'))
+
+
+class MonthIndex:
+    """Indeks bulan Masehi (tanggal 1 tiap bulan) beserta tanggal Hijriah-nya, dihitung sekali"""
+
+    def __init__(self, start: date, n_months: int):
+        offsets = np.arange(n_months + 1)
+        month_number = start.year * 12 + (start.month - 1) + offsets
+        self.year = month_number // 12
+        self.month = month_number % 12 + 1
+        self.jdn = gregorian_to_jdn(self.year, self.month, 1)
+        self.hijri_year, self.hijri_month, _ = jdn_to_hijri(self.jdn)
+
+        # Bulan Masehi yang memuat 1 Muharam (pergantian tahun Hijriah)
+        next_jdn = gregorian_to_jdn(self.year + self.month // 12, self.month % 12 + 1, 1)
+        next_hijri_year, _, _ = jdn_to_hijri(next_jdn - 1)
+        self.hijri_new_year = next_hijri_year > self.hijri_year
+
+        self.labels = [f"{year}-{month:02d}" for year, month in zip(self.year.tolist(), self.month.tolist())]
+
+    def __len__(self):
+        return len(self.jdn)
+
+
+class MonthlyForecastEngine:
+    """Kurva biaya bulanan untuk semua skenario dalam satu operasi broadcast
+
+    Indeks bulan dan horizon (dalam musim haji sejak musim haji data terakhir)
+    dihitung sekali saat engine dibuat; evaluasi untuk harga emas/kurs apa pun
+    hanya berupa CompiledScenarios.evaluate (skenario x bulan) tanpa fit ulang.
+    """
+
+    def __init__(self, predictor, max_months: int = 36, start: date = None):
+        self.predictor = predictor
+        self.max_months = max_months
+        self.index = MonthIndex(start or date.today().replace(day=1), max_months)
+
+        # Musim haji data terakhir sebagai titik acuan horizon
+        latest = predictor.historical_data[predictor.latest_year]
+        if 'year_hijri' in latest:
+            reference_hijri_year = parse_hijri_year(latest['year_hijri'])
+        else:
+            reference_hijri_year = int(jdn_to_hijri(gregorian_to_jdn(predictor.latest_year, 7, 1))[0])
+        self.reference_jdn = int(hijri_to_jdn(reference_hijri_year, HAJJ_MONTH, HAJJ_DAY))
+        self.horizons = (self.index.jdn - self.reference_jdn) / HIJRI_YEAR_DAYS
+
+    def forecast(self, months_ahead: int = None, gold_price: float = 2000,
+                 exchange_rate: float = 15000, scenarios=None) -> Dict[str, object]:
+        """Kurva bulanan (skenario x bulan) untuk bulan ke-0..months_ahead
+
+        scenarios: CompiledScenarios, list ScenarioSpec, atau path file
+        JSON/YAML; default skenario bawaan predictor (seperti
+        generate_prediction_scenarios). Semua shock spesifikasi (emas, kurs,
+        growth, inflasi komponen, start_year) berlaku dengan horizon pecahan.
+        """
+        months_ahead = self.max_months if months_ahead is None else months_ahead
+        if months_ahead > self.max_months:
+            raise ValueError(f"months_ahead maksimal {self.max_months}")
+
+        predictor = self.predictor
+        if scenarios is None:
+            scenarios = predictor._default_scenarios
+        elif not isinstance(scenarios, CompiledScenarios):
+            scenarios = predictor.compile_scenarios(scenarios)
+
+        window = slice(0, months_ahead + 1)
+        curves = scenarios.evaluate(predictor, self.horizons[window], gold_price, exchange_rate)
+
+        return {
+            'scenarios': list(scenarios.names),
+            'months': np.arange(months_ahead + 1),
+            'labels': self.index.labels[window],
+            'hijri_years': self.index.hijri_year[window],
+            'hijri_new_year': self.index.hijri_new_year[window],
+            'horizons': self.horizons[window],
+            'costs': curves
+        }
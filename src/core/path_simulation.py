@@ -0,0 +1,61 @@
+"""Simulasi jalur pertumbuhan biaya: mode dense dan mode chunked dengan memori terbatas"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .quantile_sketch import RELATIVE_ACCURACY, LogQuantileSketch
+
+# Jumlah jalur per blok pada mode chunked; memori puncak per proses kira-kira
+# SIMULATION_CHUNK_SIZE x years_ahead x 8 byte, berapa pun total jalurnya
+SIMULATION_CHUNK_SIZE = 100_000
+
+
+def simulate_log_growth_paths(mean_growth: float, std_growth: float, n_paths: int, years_ahead: int,
+                              rng: np.random.Generator) -> np.ndarray:
+    """Bangkitkan jalur log-pertumbuhan kumulatif dengan shape (years_ahead, n_paths)"""
+    # Layout tahun-mayor agar reduksi persentil per tahun berjalan di memori kontigu
+    paths = rng.standard_normal((years_ahead, n_paths))
+    paths *= std_growth
+    paths += mean_growth
+    # Growth <= -100% tidak bermakna secara ekonomi, batasi sebelum log1p
+    np.maximum(paths, -0.99, out=paths)
+    np.log1p(paths, out=paths)
+    np.cumsum(paths, axis=0, out=paths)
+    return paths
+
+
+def _sketch_chunk(mean_growth: float, std_growth: float, n_paths: int, years_ahead: int,
+                  seed: np.random.SeedSequence, relative_accuracy: float) -> LogQuantileSketch:
+    """Satu blok jalur dilipat ke sketch per horizon; array jalurnya langsung dibuang"""
+    rng = np.random.default_rng(seed)
+    sketch = LogQuantileSketch(years_ahead, relative_accuracy)
+    sketch.add_log(simulate_log_growth_paths(mean_growth, std_growth, n_paths, years_ahead, rng))
+    return sketch
+
+
+def sketch_log_growth_paths(mean_growth: float, std_growth: float, n_paths: int, years_ahead: int,
+                            seed=None, chunk_size: int = SIMULATION_CHUNK_SIZE, max_workers: int = 1,
+                            relative_accuracy: float = RELATIVE_ACCURACY) -> LogQuantileSketch:
+    """Sketch kuantil faktor pertumbuhan kumulatif per horizon dari n_paths jalur
+
+    Jalur dibangkitkan per blok chunk_size dengan SeedSequence turunan per blok,
+    sehingga hasil identik berapa pun jumlah worker-nya (max_workers=None:
+    semua core). Sketch blok digabung berurutan begitu selesai.
+    """
+    n_chunks = -(-n_paths // chunk_size)
+    sizes = [min(chunk_size, n_paths - i * chunk_size) for i in range(n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    tasks = [(mean_growth, std_growth, size, years_ahead, chunk_seed, relative_accuracy)
+             for size, chunk_seed in zip(sizes, seeds)]
+
+    sketch = LogQuantileSketch(years_ahead, relative_accuracy)
+    if max_workers == 1 or n_chunks == 1:
+        for task in tasks:
+            sketch.merge(_sketch_chunk(*task))
+        return sketch
+
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        for chunk_sketch in executor.map(_sketch_chunk, *zip(*tasks)):
+            sketch.merge(chunk_sketch)
+    return sketch
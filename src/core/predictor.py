@@ -1,199 +1,795 @@
 """Hajj cost prediction engine dengan machine learning berdasarkan data riil"""
 import numpy as np
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Dict
 
+from .cost_components import CostComponentModel
+from .departure_projection import DepartureCostProjector
+from .forecast_table import ForecastTable, get_forecast_table
+from .growth_stats import RunningGrowthStats, RunningLinearRegression
+from .model_store import load_or_build
+from .monthly_forecast import MonthlyForecastEngine
+from .path_simulation import SIMULATION_CHUNK_SIZE, simulate_log_growth_paths, sketch_log_growth_paths
+from .reconciliation import reconcile, reconciliation_matrix, shrinkage_covariance, summing_matrix
+from .savings_planner import SavingsPlanner
+from .scenarios import DEFAULT_SCENARIOS, CompiledScenarios, load_scenarios
+
+try:
+    from ..models.bootstrap import bootstrap_intervals
+    from ..models.changepoint import CONFIRMED_REGIME_POINTS, describe_regimes, detect_regimes, growth_steps
+    from ..models.selection import get_best_model, get_model_selection
+except ImportError:  # src ada di sys.path dan core/models diimpor sebagai paket top-level (app.py)
+    from models.bootstrap import bootstrap_intervals
+    from models.changepoint import CONFIRMED_REGIME_POINTS, describe_regimes, detect_regimes, growth_steps
+    from models.selection import get_best_model, get_model_selection
+
 class HajjCostPredictor:
     """Class utama untuk prediksi biaya haji berdasarkan data riil Keppres"""
     
-    def __init__(self, data_collector, rag_system):
+    # Horizon (tahun) forecast regional yang dihitung di muka
+    REGIONAL_FORECAST_HORIZON = 30
+    
+    # Horizon (bulan) engine forecast bulanan, sama dengan batas slider di UI
+    MONTHLY_FORECAST_HORIZON = 36
+    
+    # Kunci non-embarkasi pada entri data_historis
+    NON_EMBARKASI_KEYS = ('year_hijri', 'average')
+    
+    # Korelasi emas dengan biaya haji berdasarkan analisis empiris
+    BASE_GOLD_PRICE = 2000
+    GOLD_CORRELATION_FACTOR = 0.3  # Lebih rendah karena biaya haji lebih kompleks
+    GOLD_MAX_ADJUSTMENT = 0.15  # Pengaruh emas maksimal 15% dari base cost
+    
+    # Batas jumlah jalur simulasi Monte Carlo yang masih dihitung sebagai satu array dense;
+    # di atasnya simulasi berjalan per blok dengan sketch kuantil
+    DENSE_SIMULATION_MAX_PATHS = 2_000_000
+    
+    # Kurs USD/IDR dasar tempat porsi komponen biaya dikalibrasi
+    BASE_EXCHANGE_RATE = 15000
+    
+    # Nama & versi artefak state growth; naikkan versi jika struktur state berubah
+    ARTIFACT_NAME = 'hajj_cost_predictor'
+    ARTIFACT_VERSION = 5
+    
+    # Artefak matriks rekonsiliasi hierarkis nasional-embarkasi; naikkan versi jika metode berubah
+    RECONCILIATION_ARTIFACT_NAME = 'hierarchical_reconciliation'
+    RECONCILIATION_ARTIFACT_VERSION = 2
+    
+    # Artefak changepoint per embarkasi (deteksi regime regional), di-cache per hash data
+    REGIONAL_ARTIFACT_NAME = 'regional_regimes'
+    REGIONAL_ARTIFACT_VERSION = 1
+    
+    # Interval prediksi bootstrap: model dasar skenario realistis, jumlah resample,
+    # tingkat interval, dan toleransi relatif untuk confidence
+    INTERVAL_MODEL = 'compound_growth'
+    INTERVAL_RESAMPLES = 2000
+    INTERVAL_LEVEL = 0.9
+    CONFIDENCE_TOLERANCE = 0.1
+    
+    # add_year: growth tahun baru dianggap perpindahan regime (sementara, sampai segmentasi
+    # PELT berikutnya) jika menyimpang lebih dari sekian std growth regime terkini, dengan std minimal
+    SHIFT_THRESHOLD_STD = 4.0
+    SHIFT_MIN_STD = 0.01
+    
+    # Toleransi relatif 'average' terhadap rata-rata embarkasi pada entri add_year
+    AVERAGE_TOLERANCE = 0.001
+    
+    # Growth regime terkini di-shrink ke growth normal gabungan dengan bobot sekian observasi semu
+    # (sama dengan RegimeSwitchingModel.PRIOR_WEIGHT), agar regime yang masih pendek tidak dominan
+    REGIME_PRIOR_WEIGHT = 2.0
+    
+    def __init__(self, data_collector, rag_system, use_artifact: bool = True):
         self.data_collector = data_collector
         self.rag = rag_system
+        self.use_artifact = use_artifact
         self.historical_data = rag_system.knowledge_base["data_historis"]
-        self.growth_analysis = self._analyze_growth_patterns()
+        self.component_model = CostComponentModel(base_exchange_rate=self.BASE_EXCHANGE_RATE)
+        self._default_scenarios = CompiledScenarios(DEFAULT_SCENARIOS, self.component_model.drivers)
+        self.growth_analysis = self._load_growth_analysis(use_artifact)
+        self._segmentation_stale = False
+        self._build_regional_matrix()
+    
+    @classmethod
+    def from_historical_data(cls, historical_data: Dict[int, Dict], data_collector=None):
+        """Buat predictor langsung dari dict data historis tanpa RAGSystem (mis. untuk backtesting)"""
+        knowledge = SimpleNamespace(knowledge_base={"data_historis": historical_data})
+        # Subset data ad-hoc tidak perlu ditulis sebagai artefak
+        return cls(data_collector, knowledge, use_artifact=False)
+    
+    def _load_growth_analysis(self, use_artifact: bool):
+        """Muat state growth dari artefak jika hash data sama, selain itu analisis ulang dan simpan"""
+        if not use_artifact:
+            return self._analyze_growth_patterns()
+        
+        state = load_or_build(self.ARTIFACT_NAME, self.historical_data, self._build_growth_state,
+                              version=self.ARTIFACT_VERSION)
+        self._restore_growth_state(state)
+        return self._growth_summary()
+    
+    def _build_growth_state(self) -> Dict[str, any]:
+        """Analisis ulang data historis lalu ekspor state akumulator"""
+        self._analyze_growth_patterns()
+        return {
+            'latest_year': self.latest_year,
+            'changepoints': self.regimes['changepoints'],
+            'all_growth_rates': self._all_growth_rates,
+            'normal_growth_rates': self._normal_growth_rates,
+            'growth_stats': self._growth_stats.to_dict(),
+            'regime_stats': self._regime_stats.to_dict(),
+            'regime_starts': self._regime_starts,
+            'regime_points': self._regime_points,
+            'regime_pending': self._regime_pending,
+            'trend_regression': self._trend_regression.to_dict()
+        }
+    
+    def _restore_growth_state(self, state: Dict[str, any]):
+        """Pulihkan akumulator growth dari state artefak"""
+        self.latest_year = state['latest_year']
+        self.regimes = describe_regimes(sorted(self.historical_data), state['changepoints'])
+        self._all_growth_rates = state['all_growth_rates']
+        self._normal_growth_rates = state['normal_growth_rates']
+        self._growth_stats = RunningGrowthStats.from_dict(state['growth_stats'])
+        self._regime_stats = RunningGrowthStats.from_dict(state['regime_stats'])
+        self._regime_starts = state['regime_starts']
+        self._regime_points = state['regime_points']
+        self._regime_pending = state['regime_pending']
+        self._trend_regression = RunningLinearRegression.from_dict(state['trend_regression'])
+    
+    def _detect_average_regimes(self) -> Dict[str, any]:
+        """Deteksi regime (PELT) pada deret rata-rata nasional"""
+        years = sorted(self.historical_data.keys())
+        return detect_regimes(years, [self.historical_data[year]['average'] for year in years])
     
     def _analyze_growth_patterns(self):
         """Analisis pola pertumbuhan dari data historis"""
-        years = sorted(self.historical_data.keys())
-        costs = [self.historical_data[year]['average'] for year in years]
+        # Akumulator inkremental, diisi ulang tahun demi tahun seperti add_year
+        self._growth_stats = RunningGrowthStats()
+        self._regime_stats = RunningGrowthStats()
+        self._trend_regression = RunningLinearRegression()
+        self._all_growth_rates = []
+        self._normal_growth_rates = []
+        self._regime_starts = []
+        self._regime_points = 0
+        self._regime_pending = []
+        self.latest_year = None
+        self.regimes = self._detect_average_regimes()
         
-        # Hitung growth rates year-over-year
-        growth_rates = []
-        for i in range(1, len(costs)):
-            growth_rate = (costs[i] - costs[i-1]) / costs[i-1]
-            growth_rates.append(growth_rate)
+        for i, year in enumerate(sorted(self.historical_data.keys())):
+            shift = i > 0 and bool(self.regimes['shift_steps'][i - 1])
+            self._update_growth_state(year, self.historical_data[year]['average'], shift)
         
-        # Identifikasi periode normal vs anomali
-        normal_growth_rates = []
-        for i, rate in enumerate(growth_rates):
-            # Exclude anomali 2023 (growth rate > 50%)
-            if abs(rate) < 0.5:  # Kurang dari 50%
-                normal_growth_rates.append(rate)
+        return self._growth_summary()
+    
+    def _update_growth_state(self, year: int, cost: float, shift: bool):
+        """Perbarui akumulator growth dan regresi trend untuk satu observasi baru dalam O(1)
         
-        return {
-            'all_growth_rates': growth_rates,
-            'normal_growth_rates': normal_growth_rates,
-            'average_normal_growth': np.mean(normal_growth_rates) if normal_growth_rates else 0.03,
-            'median_normal_growth': np.median(normal_growth_rates) if normal_growth_rates else 0.03,
-            'std_normal_growth': np.std(normal_growth_rates) if normal_growth_rates else 0.02,
-            'current_cost': costs[-1],  # 2025 cost
-            'pre_anomaly_trend': self._calculate_pre_anomaly_trend()
-        }
+        shift=True berarti observasi ini memulai regime baru. Growth di dalam
+        regime baru dianggap normal begitu regime mencapai
+        CONFIRMED_REGIME_POINTS titik (sama dengan normal_steps hasil
+        describe_regimes); sampai saat itu growth-nya ditahan di
+        _regime_pending. _growth_stats mengumpulkan growth normal semua regime,
+        _regime_stats hanya growth normal regime terkini.
+        """
+        if self.latest_year is None or shift:
+            self._regime_starts.append(year)
+            self._regime_points = 1
+            self._regime_pending = []
+            self._regime_stats = RunningGrowthStats()
+        else:
+            self._regime_points += 1
+        
+        if self.latest_year is not None:
+            prev_cost = self.historical_data[self.latest_year]['average']
+            growth_rate = (cost - prev_cost) / prev_cost
+            self._all_growth_rates.append(growth_rate)
+            
+            if not shift:
+                self._regime_pending.append(growth_rate)
+            # Hanya growth di dalam regime terkonfirmasi yang dianggap normal
+            if self._regime_points >= CONFIRMED_REGIME_POINTS:
+                for rate in self._regime_pending:
+                    self._normal_growth_rates.append(rate)
+                    self._growth_stats.add(rate)
+                    self._regime_stats.add(rate)
+                self._regime_pending = []
+        
+        # Trend normal hanya memakai regime pertama (sebelum perpindahan regime pertama)
+        if len(self._regime_starts) == 1:
+            self._trend_regression.add(self._trend_regression.n, cost)
+        
+        self.latest_year = year
     
-    def _calculate_pre_anomaly_trend(self):
-        """Hitung trend sebelum anomali 2023"""
-        # Gunakan data 2016-2022 untuk trend normal
-        normal_years = [2016, 2017, 2018, 2019, 2020, 2022]
-        normal_costs = [self.historical_data[year]['average'] for year in normal_years]
+    def _growth_summary(self) -> Dict[str, any]:
+        """Susun ringkasan growth dari akumulator
         
-        # Simple linear regression untuk trend
-        x = np.array(range(len(normal_costs)))
-        y = np.array(normal_costs)
+        Growth proyeksi (average/median/std_normal_growth) berasal dari regime
+        terkini yang terdeteksi, di-shrink ke growth normal gabungan semua
+        regime dengan bobot REGIME_PRIOR_WEIGHT observasi semu; selama regime
+        terkini belum terkonfirmasi dipakai growth gabungan saja.
+        """
+        pooled, current = self._growth_stats, self._regime_stats
+        has_normal = pooled.count > 0
         
-        # Manual calculation untuk linear regression
-        n = len(x)
-        sum_x = np.sum(x)
-        sum_y = np.sum(y)
-        sum_xy = np.sum(x * y)
-        sum_x2 = np.sum(x * x)
+        def shrunk(current_value, pooled_value):
+            return ((current.count * current_value + self.REGIME_PRIOR_WEIGHT * pooled_value)
+                    / (current.count + self.REGIME_PRIOR_WEIGHT))
         
-        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
-        intercept = (sum_y - slope * sum_x) / n
+        return {
+            'all_growth_rates': self._all_growth_rates,
+            'normal_growth_rates': self._normal_growth_rates,
+            'average_normal_growth': shrunk(current.mean, pooled.mean) if has_normal else 0.03,
+            'median_normal_growth': shrunk(current.median, pooled.median) if has_normal else 0.03,
+            'std_normal_growth': float(np.sqrt(shrunk(current.variance, pooled.variance))) if has_normal else 0.02,
+            'current_cost': self.historical_data[self.latest_year]['average'],
+            'pre_anomaly_trend': self._calculate_pre_anomaly_trend(),
+            'regime_starts': [int(year) for year in self._regime_starts],
+            'current_regime_start': int(self._regime_starts[-1]),
+            'growth_basis': 'regime_terkini' if self._regime_stats.count else 'gabungan_regime'
+        }
+    
+    def _calculate_pre_anomaly_trend(self):
+        """Hitung trend regime pertama yang terdeteksi (mis. 2016-2022 sebelum lonjakan 2023)"""
+        # Simple linear regression dari running sums
+        regression = self._trend_regression
+        slope = regression.slope
+        mean_cost = regression.mean_y
         
         return {
             'slope': slope,
-            'intercept': intercept,
+            'intercept': regression.intercept,
             'annual_growth_amount': slope,
-            'annual_growth_rate': slope / np.mean(normal_costs)
+            'annual_growth_rate': slope / mean_cost if mean_cost else 0.0
         }
     
+    def add_year(self, year: int, costs: Dict[str, float]) -> Dict[str, any]:
+        """Tambahkan data Keppres tahun baru dan perbarui statistik growth secara inkremental
+        
+        costs harus berformat lengkap seperti entri data_historis: 'year_hijri',
+        'average', dan biaya setiap embarkasi, dengan 'average' sama dengan
+        rata-rata embarkasi. Akumulator growth diperbarui di tempat dalam O(1),
+        sehingga semua pemegang referensi growth_analysis dan data_historis
+        langsung melihat data terbaru. Perpindahan regime diputuskan sementara
+        dari simpangan growth terhadap regime terkini; segmentasi ulang PELT,
+        matriks regional, dan rekonsiliasi ditunda sampai refresh() (dipanggil
+        otomatis oleh API yang membutuhkannya).
+        """
+        if year <= self.latest_year:
+            raise ValueError(f"Tahun {year} harus setelah tahun data terakhir ({self.latest_year})")
+        self._validate_year_entry(costs)
+        
+        prev_cost = self.historical_data[self.latest_year]['average']
+        shift = self._is_regime_shift((costs['average'] - prev_cost) / prev_cost)
+        self.historical_data[year] = costs
+        self._update_growth_state(year, costs['average'], shift)
+        self.growth_analysis.update(self._growth_summary())
+        self._segmentation_stale = True
+        
+        # Konteks RAG (cache section, chunk, indeks) dibangun ulang saat diakses berikutnya
+        invalidate = getattr(self.rag, 'invalidate', None)
+        if invalidate is not None:
+            invalidate()
+        return self.growth_analysis
+    
+    def _validate_year_entry(self, costs: Dict[str, float]):
+        """Tolak entri add_year yang tidak lengkap atau tidak koheren dengan data yang ada"""
+        required = ['year_hijri', 'average'] + list(self.embarkasi)
+        missing = [key for key in required if key not in costs]
+        if missing:
+            raise ValueError(f"Data biaya tahun baru tidak lengkap, kunci hilang: {', '.join(missing)}")
+        
+        values = np.array([costs[key] for key in required[1:]], dtype=float)
+        if not np.all(np.isfinite(values) & (values > 0)):
+            raise ValueError("Biaya rata-rata dan embarkasi harus bernilai positif")
+        regional_mean = values[1:].mean()
+        if abs(values[0] / regional_mean - 1) > self.AVERAGE_TOLERANCE:
+            raise ValueError(f"'average' ({values[0]:,.0f}) tidak sama dengan rata-rata embarkasi ({regional_mean:,.0f})")
+    
+    def _is_regime_shift(self, growth_rate: float) -> bool:
+        """Keputusan sementara (O(1)) apakah growth tahun baru memulai regime baru
+        
+        Pembanding: growth normal regime terkini (atau gabungan semua regime
+        selama regime terkini belum terkonfirmasi), dengan sebaran minimal
+        sebesar std growth normal gabungan.
+        """
+        stats = self._regime_stats if self._regime_stats.count >= 2 else self._growth_stats
+        if stats.count < 2:
+            return False
+        spread = max(stats.std, self._growth_stats.std, self.SHIFT_MIN_STD)
+        return abs(growth_rate - stats.mean) > self.SHIFT_THRESHOLD_STD * spread
+    
+    def refresh(self):
+        """Jalankan pekerjaan yang ditunda add_year: segmentasi ulang PELT dan state regional
+        
+        Jika regime hasil PELT berbeda dari keputusan sementara add_year,
+        akumulator growth dibangun ulang dari data. Tanpa add_year sebelumnya
+        tidak melakukan apa-apa.
+        """
+        if not self._segmentation_stale:
+            return
+        regimes = self._detect_average_regimes()
+        if [int(year) for year in regimes['regime_starts']] == [int(year) for year in self._regime_starts]:
+            self.regimes = regimes
+        else:
+            self._analyze_growth_patterns()
+            self.growth_analysis.update(self._growth_summary())
+        self._segmentation_stale = False
+        self._build_regional_matrix()
+    
     def calculate_base_cost(self) -> float:
         """Hitung biaya dasar haji berdasarkan data terbaru"""
-        latest_cost = self.historical_data[2025]['average']
+        latest_cost = self.historical_data[self.latest_year]['average']
         return latest_cost
     
-    def apply_gold_correlation(self, base_cost: float, gold_price: float, historical_gold: float = 2000) -> float:
-        """Terapkan korelasi dengan harga emas (disesuaikan dengan data riil)"""
-        # Korelasi emas dengan biaya haji berdasarkan analisis empiris
-        correlation_factor = 0.3  # Lebih rendah karena biaya haji lebih kompleks
-        gold_change = (gold_price - historical_gold) / historical_gold
+    def _gold_adjustment_factor(self, gold_price, historical_gold: float = None):
+        """Faktor pengali korelasi emas (skalar atau array), dengan batas pengaruh maksimal"""
+        if historical_gold is None:
+            historical_gold = self.BASE_GOLD_PRICE
+        gold_change = (np.asarray(gold_price, dtype=float) - historical_gold) / historical_gold
         
         # Batasi pengaruh emas maksimal 15% dari base cost
-        max_adjustment = base_cost * 0.15
-        cost_adjustment = min(abs(base_cost * gold_change * correlation_factor), max_adjustment)
-        
-        if gold_change > 0:
-            return base_cost + cost_adjustment
-        else:
-            return base_cost - cost_adjustment
+        adjustment = np.minimum(np.abs(gold_change * self.GOLD_CORRELATION_FACTOR), self.GOLD_MAX_ADJUSTMENT)
+        return 1 + np.sign(gold_change) * adjustment
+    
+    def _exchange_rate_factor(self, exchange_rate):
+        """Faktor pengali nilai tukar USD/IDR untuk porsi biaya dalam valuta asing"""
+        rate_change = np.asarray(exchange_rate, dtype=float) / self.BASE_EXCHANGE_RATE - 1
+        return 1 + self.component_model.fx_exposure * rate_change
+    
+    def apply_gold_correlation(self, base_cost: float, gold_price: float, historical_gold: float = 2000) -> float:
+        """Terapkan korelasi dengan harga emas (disesuaikan dengan data riil)"""
+        # Korelasi emas dengan biaya haji berdasarkan analisis empiris, dibatasi maksimal 15%
+        return base_cost * self._gold_adjustment_factor(gold_price, historical_gold)
     
     def predict_future_cost(self, years_ahead: int) -> float:
-        """Prediksi biaya masa depan berdasarkan trend normal"""
-        current_cost = self.growth_analysis['current_cost']
-        normal_growth = self.growth_analysis['average_normal_growth']
+        """Prediksi biaya rata-rata nasional masa depan berdasarkan trend normal
         
-        # Gunakan compound growth
-        future_cost = current_cost * (1 + normal_growth) ** years_ahead
-        return future_cost
+        Sama dengan kolom 'average' forecast rekonsiliasi (predict_reconciled),
+        yang juga menjadi angka utama tabel forecast dan ringkasan prediksi.
+        """
+        return float(self.predict_reconciled(years_ahead)[years_ahead - 1, 0])
     
     def generate_prediction_scenarios(self, gold_price: float = 2000, exchange_rate: float = 15000) -> Dict[str, float]:
-        """Generate berbagai skenario prediksi berdasarkan data riil"""
-        base_cost = self.calculate_base_cost()
+        """Generate berbagai skenario prediksi berdasarkan data riil
         
-        # Skenario berdasarkan analisis data historis
-        scenarios = {}
+        Skenario bawaan (DEFAULT_SCENARIOS): konservatif 70% growth normal dengan
+        emas -5%, realistis sesuai trend normal, optimistis 130% growth normal
+        dengan emas +5%, masing-masing untuk satu tahun ke depan.
+        """
+        costs = self.evaluate_scenarios(self._default_scenarios, 1, gold_price, exchange_rate)
+        return {name: float(cost) for name, cost in zip(self._default_scenarios.names, costs[:, 0])}
+    
+    def compile_scenarios(self, specs) -> CompiledScenarios:
+        """Kompilasi list ScenarioSpec (atau path file JSON/YAML) menjadi array parameter"""
+        if isinstance(specs, (str, Path)):
+            specs = load_scenarios(specs)
+        return CompiledScenarios(specs, self.component_model.drivers)
+    
+    def evaluate_scenarios(self, scenarios, years_ahead=1, gold_price: float = 2000,
+                           exchange_rate: float = 15000) -> np.ndarray:
+        """Evaluasi batch pustaka skenario, hasil array (skenario x tahun)
+        
+        scenarios berupa CompiledScenarios, list ScenarioSpec, atau path file;
+        kompilasi sekali lalu panggil ulang fungsi ini setiap data pasar berubah.
+        """
+        if not isinstance(scenarios, CompiledScenarios):
+            scenarios = self.compile_scenarios(scenarios)
+        return scenarios.evaluate(self, years_ahead, gold_price, exchange_rate)
+    
+    def gold_fx_sensitivity(self, gold_prices, exchange_rates, years_ahead: int = 1) -> np.ndarray:
+        """Permukaan sensitivitas biaya terhadap grid harga emas x kurs USD/IDR
         
-        # Skenario konservatif (growth rate lebih rendah)
-        conservative_growth = self.growth_analysis['average_normal_growth'] * 0.7  # 70% dari normal
-        conservative_cost = self.apply_gold_correlation(base_cost, gold_price * 0.95)
-        scenarios["Konservatif"] = conservative_cost * (1 + conservative_growth)
+        Hasil berupa array (len(gold_prices), len(exchange_rates)) yang dihitung
+        sebagai satu outer product, dengan batas 15% dan faktor korelasi emas
+        yang sama seperti apply_gold_correlation.
+        """
+        gold_factor = self._gold_adjustment_factor(np.atleast_1d(gold_prices))
+        fx_factor = self._exchange_rate_factor(np.atleast_1d(exchange_rates))
+        trend_factor = (1 + self.growth_analysis['average_normal_growth']) ** years_ahead
         
-        # Skenario realistis (berdasarkan trend normal)
-        realistic_growth = self.growth_analysis['average_normal_growth']
-        realistic_cost = self.apply_gold_correlation(base_cost, gold_price)
-        scenarios["Realistis"] = realistic_cost * (1 + realistic_growth)
+        return np.outer(gold_factor * (self.calculate_base_cost() * trend_factor), fx_factor)
+    
+    def _simulate_log_growth_paths(self, n_paths: int, years_ahead: int, rng: np.random.Generator) -> np.ndarray:
+        """Bangkitkan jalur log-pertumbuhan kumulatif dengan shape (years_ahead, n_paths)"""
+        return simulate_log_growth_paths(self.growth_analysis['average_normal_growth'],
+                                         self.growth_analysis['std_normal_growth'], n_paths, years_ahead, rng)
+    
+    def simulate_prediction_scenarios(self, years_ahead: int = 5, n_paths: int = 1_000_000,
+                                      percentiles=(5, 50, 95), seed=None, chunk_size: int = None,
+                                      max_workers: int = 1) -> Dict[int, Dict[str, float]]:
+        """Simulasi Monte Carlo jalur pertumbuhan untuk pita persentil biaya per tahun
         
-        # Skenario optimistis (growth rate lebih tinggi)
-        optimistic_growth = self.growth_analysis['average_normal_growth'] * 1.3  # 130% dari normal
-        optimistic_cost = self.apply_gold_correlation(base_cost, gold_price * 1.05)
-        scenarios["Optimistis"] = optimistic_cost * (1 + optimistic_growth)
+        Growth tahunan diambil dari distribusi normal dengan mean dan std growth
+        periode normal, lalu dikompon. Sampai DENSE_SIMULATION_MAX_PATHS jalur
+        (tanpa chunk_size) semua jalur dihitung sekaligus sebagai satu array.
+        Di atas itu jalur diproses per blok chunk_size dan dilipat ke sketch
+        kuantil per horizon (memori konstan, blok bisa paralel lewat
+        max_workers); persentilnya berada dalam galat relatif RELATIVE_ACCURACY
+        (0.1%) dari order statistic jalur yang sama, mean tetap eksak.
+        """
+        current_cost = self.growth_analysis['current_cost']
+        current_year = self.latest_year
         
-        return scenarios
+        if chunk_size is None and n_paths <= self.DENSE_SIMULATION_MAX_PATHS:
+            rng = np.random.default_rng(seed)
+            log_paths = self._simulate_log_growth_paths(n_paths, years_ahead, rng)
+            
+            # Persentil dihitung di skala log lalu dieksponenkan (transformasi monoton)
+            bands = current_cost * np.exp(np.percentile(log_paths, percentiles, axis=1))
+            means = current_cost * np.exp(log_paths).mean(axis=1)
+        else:
+            sketch = sketch_log_growth_paths(
+                self.growth_analysis['average_normal_growth'], self.growth_analysis['std_normal_growth'],
+                n_paths, years_ahead, seed, chunk_size or SIMULATION_CHUNK_SIZE, max_workers
+            )
+            bands = current_cost * sketch.quantiles(np.asarray(percentiles, dtype=float) / 100)
+            means = current_cost * sketch.mean()
+        
+        simulation = {}
+        for year_offset in range(1, years_ahead + 1):
+            row = {f'p{p:g}': float(bands[i, year_offset - 1]) for i, p in enumerate(percentiles)}
+            row['mean'] = float(means[year_offset - 1])
+            simulation[current_year + year_offset] = row
+        
+        return simulation
     
-    def predict_multiple_years(self, years_ahead: int = 5) -> Dict[int, Dict[str, float]]:
-        """Prediksi untuk beberapa tahun ke depan"""
+    def predict_batch(self, years_ahead, growth_rates=None, base_costs=None) -> np.ndarray:
+        """Prediksi batch compound growth dengan hasil array (skenario x tahun)
+        
+        years_ahead berupa array horizon, growth_rates dan base_costs berupa array
+        per skenario (atau skalar). Default-nya memakai growth normal dan biaya
+        terkini (trend nasional sebelum rekonsiliasi dengan embarkasi).
+        """
+        horizons = np.atleast_1d(np.asarray(years_ahead, dtype=float))
+        if growth_rates is None:
+            growth_rates = self.growth_analysis['average_normal_growth']
+        if base_costs is None:
+            base_costs = self.growth_analysis['current_cost']
+        
+        growth_rates = np.atleast_1d(np.asarray(growth_rates, dtype=float))
+        base_costs = np.atleast_1d(np.asarray(base_costs, dtype=float))
+        
+        # Broadcast (skenario, 1) terhadap (1, tahun)
+        return base_costs[:, np.newaxis] * (1 + growth_rates[:, np.newaxis]) ** horizons[np.newaxis, :]
+    
+    def get_prediction_intervals(self, years_ahead: int = 5, model_names=None,
+                                 series_key: str = 'average') -> Dict[str, Dict]:
+        """Interval prediksi bootstrap per model zoo untuk horizon 1..years_ahead
+        
+        Resample dibagi ke process pool dengan seed deterministik per chunk dan
+        hasilnya di-cache per versi data. Predictor subset data (mis. backtesting)
+        menghitung berurutan tanpa menulis artefak.
+        """
+        return bootstrap_intervals(
+            self.historical_data,
+            series_key=series_key,
+            model_names=model_names,
+            horizon=years_ahead,
+            n_resamples=self.INTERVAL_RESAMPLES,
+            level=self.INTERVAL_LEVEL,
+            tolerance=self.CONFIDENCE_TOLERANCE,
+            max_workers=None if self.use_artifact else 1,
+            persist=self.use_artifact
+        )
+    
+    def predict_multiple_years(self, years_ahead: int = 5, include_intervals: bool = True) -> Dict[int, Dict[str, float]]:
+        """Prediksi untuk beberapa tahun ke depan
+        
+        confidence adalah peluang bootstrap (%) bahwa biaya aktual berada dalam
+        ±CONFIDENCE_TOLERANCE dari prediksi realistis; interval_lower/upper
+        adalah interval prediksi bootstrap INTERVAL_LEVEL di sekitarnya.
+        include_intervals=False melewati bootstrap (mis. backtesting yang hanya
+        butuh skenario), tanpa kunci interval_lower/upper dan confidence.
+        """
         predictions = {}
-        current_year = 2025
+        current_year = self.latest_year
         
-        for year_offset in range(1, years_ahead + 1):
-            target_year = current_year + year_offset
-            
-            # Base prediction menggunakan trend normal
-            base_prediction = self.predict_future_cost(year_offset)
-            
-            # Confidence level menurun seiring waktu
-            confidence = max(85 - (year_offset * 10), 40)
-            
-            # Skenario untuk tahun ini
-            scenarios = self.generate_prediction_scenarios()
-            
-            # Adjust scenarios untuk tahun target
-            year_adjustment = (1 + self.growth_analysis['average_normal_growth']) ** year_offset
+        # Skenario tidak bergantung pada tahun target, cukup dihitung sekali
+        scenarios = self.generate_prediction_scenarios()
+        horizons = np.arange(1, years_ahead + 1)
+        
+        # Baris: konservatif, realistis, optimistis
+        scenario_costs = self.predict_batch(
+            horizons,
+            base_costs=[
+                scenarios['Konservatif'] * 0.95,
+                self.growth_analysis['current_cost'],
+                scenarios['Optimistis'] * 1.05
+            ]
+        )
+        
+        if include_intervals:
+            # Interval bootstrap dalam rasio terhadap forecast titik model, lalu
+            # ditempelkan ke prediksi realistis
+            interval = self.get_prediction_intervals(years_ahead, [self.INTERVAL_MODEL])[self.INTERVAL_MODEL]
+            point = np.array(interval['point'])
+            lower = scenario_costs[1] * np.array(interval['lower']) / point
+            upper = scenario_costs[1] * np.array(interval['upper']) / point
+            confidence = np.round(np.array(interval['within_tolerance']) * 100)
+        
+        for year_offset in horizons:
+            target_year = current_year + int(year_offset)
+            column = year_offset - 1
             
             predictions[target_year] = {
-                'konservatif': scenarios['Konservatif'] * year_adjustment * 0.95,
-                'realistis': base_prediction,
-                'optimistis': scenarios['Optimistis'] * year_adjustment * 1.05,
-                'confidence': confidence,
+                'konservatif': float(scenario_costs[0, column]),
+                'realistis': float(scenario_costs[1, column]),
+                'optimistis': float(scenario_costs[2, column]),
                 'base_growth_rate': self.growth_analysis['average_normal_growth'] * 100,
                 'metodologi': 'Ensemble: Historical trend + Gold correlation + Economic factors'
             }
+            if include_intervals:
+                predictions[target_year].update({
+                    'interval_lower': float(lower[column]),
+                    'interval_upper': float(upper[column]),
+                    'confidence': int(confidence[column])
+                })
         
         return predictions
     
-    def get_cost_breakdown_prediction(self, target_year: int = 2026) -> Dict[str, float]:
+    def attribute_predictions(self, years_ahead: int = 5, scenarios=None, gold_price: float = 2000,
+                              exchange_rate: float = 15000) -> Dict[str, object]:
+        """Atribusi prediksi tiap tahun & skenario ke biaya dasar, trend growth, emas, dan kurs
+        
+        scenarios seperti evaluate_scenarios (default DEFAULT_SCENARIOS). Hasil
+        berisi 'years', 'scenarios', dan array (skenario x tahun) 'total',
+        'base', 'trend', 'gold', 'fx' dengan base + trend + gold + fx = total;
+        lihat CompiledScenarios.attribute.
+        """
+        if scenarios is None:
+            scenarios = self._default_scenarios
+        elif not isinstance(scenarios, CompiledScenarios):
+            scenarios = self.compile_scenarios(scenarios)
+        
+        horizons = np.arange(1, years_ahead + 1)
+        attribution = scenarios.attribute(self, horizons, gold_price, exchange_rate)
+        attribution['years'] = self.latest_year + horizons
+        attribution['scenarios'] = list(scenarios.names)
+        return attribution
+    
+    def predict_cost_breakdown(self, years_ahead, exchange_rates=15000, sar_rates=None,
+                               growth_drivers: Dict[str, float] = None) -> np.ndarray:
+        """Prediksi breakdown komponen sebagai tensor (komponen x tahun x skenario kurs)
+        
+        Komponen mengikuti urutan self.component_model.names. Driver growth yang
+        tidak diisi memakai growth normal historis.
+        """
+        return self.component_model.evaluate(
+            self.growth_analysis['current_cost'],
+            years_ahead,
+            usd_idr=exchange_rates,
+            sar_idr=sar_rates,
+            growth_drivers=growth_drivers,
+            default_growth=self.growth_analysis['average_normal_growth']
+        )
+    
+    def get_cost_breakdown_prediction(self, target_year: int = 2026, exchange_rate: float = 15000) -> Dict[str, float]:
         """Prediksi breakdown komponen biaya untuk tahun target"""
-        total_predicted = self.predict_future_cost(target_year - 2025)
-        
-        # Persentase komponen berdasarkan analisis rata-rata
-        breakdown_percentages = {
-            'penerbangan': 0.28,  # 28%
-            'akomodasi_makkah': 0.23,  # 23%
-            'akomodasi_madinah': 0.17,  # 17%
-            'biaya_hidup': 0.12,  # 12%
-            'pelayanan_haji': 0.10,  # 10%
-            'transportasi_lokal': 0.07,  # 7%
-            'administrasi': 0.03   # 3%
+        breakdown = self.predict_cost_breakdown(target_year - self.latest_year, exchange_rate)
+        return dict(zip(self.component_model.names, breakdown[:, 0, 0].tolist()))
+    
+    def _build_regional_matrix(self):
+        """Bangun matriks biaya (tahun x embarkasi) beserta forecast seluruh embarkasi"""
+        years = sorted(self.historical_data.keys())
+        
+        # Kolom embarkasi sesuai urutan kemunculan pertama di data
+        embarkasi = []
+        for year in years:
+            for key in self.historical_data[year]:
+                if key not in self.NON_EMBARKASI_KEYS and key not in embarkasi:
+                    embarkasi.append(key)
+        
+        self.matrix_years = np.array(years)
+        self.embarkasi = embarkasi
+        self.embarkasi_index = {city: i for i, city in enumerate(embarkasi)}
+        self.cost_matrix = np.array([
+            [self.historical_data[year].get(city, np.nan) for city in embarkasi]
+            for year in years
+        ], dtype=float).reshape(len(years), len(embarkasi))
+        self.average_costs = np.array([self.historical_data[year]['average'] for year in years], dtype=float)
+        
+        # Growth normal per embarkasi: langkah antar tahun berurutan di dalam regime
+        # terkonfirmasi hasil deteksi per embarkasi (perpindahan regime & data kosong di-mask);
+        # proyeksi memakai langkah regime terkini (lihat growth_steps)
+        growth = self.cost_matrix[1:] / self.cost_matrix[:-1] - 1
+        normal_mask = np.zeros(growth.shape, dtype=bool)
+        projection_mask = np.zeros(growth.shape, dtype=bool)
+        observed_rows = [np.flatnonzero(~np.isnan(self.cost_matrix[:, column])) for column in range(len(embarkasi))]
+        
+        def detect_changepoints():
+            return {city: detect_regimes(self.matrix_years[rows], self.cost_matrix[rows, column])['changepoints']
+                    for column, (city, rows) in enumerate(zip(embarkasi, observed_rows))}
+        
+        changepoints = load_or_build(self.REGIONAL_ARTIFACT_NAME, self.historical_data, detect_changepoints,
+                                     version=self.REGIONAL_ARTIFACT_VERSION, persist=self.use_artifact)
+        self.regional_regimes = {}
+        for column, (city, rows) in enumerate(zip(embarkasi, observed_rows)):
+            regimes = describe_regimes(self.matrix_years[rows], changepoints[city])
+            self.regional_regimes[city] = [int(year) for year in regimes['regime_starts']]
+            adjacent = np.diff(rows) == 1
+            normal_mask[rows[:-1][adjacent & regimes['normal_steps']], column] = True
+            projection_mask[rows[:-1][adjacent & growth_steps(regimes)], column] = True
+        
+        def masked_mean(mask):
+            count = mask.sum(axis=0)
+            total = np.where(mask, growth, 0.0).sum(axis=0)
+            return np.where(count > 0, total / np.maximum(count, 1), self.growth_analysis['average_normal_growth'])
+        
+        # Rata-rata growth normal semua regime, pusat residual rekonsiliasi dan prior growth proyeksi
+        self._regional_pooled_growth = masked_mean(normal_mask)
+        # Growth proyeksi: regime terkini di-shrink ke growth gabungan (lihat REGIME_PRIOR_WEIGHT)
+        projection_count = projection_mask.sum(axis=0)
+        projection_total = np.where(projection_mask, growth, 0.0).sum(axis=0)
+        self.regional_growth = ((projection_total + self.REGIME_PRIOR_WEIGHT * self._regional_pooled_growth)
+                                / (projection_count + self.REGIME_PRIOR_WEIGHT))
+        
+        # Forecast (horizon x embarkasi) dari biaya terakhir yang tersedia per embarkasi
+        last_valid = len(years) - 1 - np.argmax(~np.isnan(self.cost_matrix[::-1]), axis=0)
+        last_costs = self.cost_matrix[last_valid, np.arange(len(embarkasi))]
+        years_since_last = self.matrix_years[-1] - self.matrix_years[last_valid]
+        horizons = np.arange(1, self.REGIONAL_FORECAST_HORIZON + 1)
+        self.regional_forecast = last_costs * (1 + self.regional_growth) ** (horizons[:, np.newaxis] + years_since_last)
+        self.regional_forecast.flags.writeable = False
+        
+        self._regional_normal_mask = normal_mask
+        self._build_reconciliation()
+        
+        # Tabel biaya perencana tabungan dan engine bulanan bergantung pada forecast, bangun ulang saat dibutuhkan
+        self._savings_planner = None
+        self._monthly_engine = None
+    
+    def _reconciliation_residuals(self) -> np.ndarray:
+        """Residual forecast satu langkah (tahun x node) untuk estimasi W MinT
+        
+        Node: rata-rata nasional lalu embarkasi. Residual = selisih growth aktual
+        terhadap rata-rata growth normal semua regime, diskalakan ke level biaya
+        terakhir; langkah perpindahan regime atau yang melompati tahun kosong
+        bernilai NaN.
+        """
+        adjacent = (np.diff(self.matrix_years) == 1)[:, np.newaxis]
+        national_growth = self.average_costs[1:] / self.average_costs[:-1] - 1
+        national_normal = self.regimes['normal_steps'][:, np.newaxis] & adjacent
+        regional_growth = self.cost_matrix[1:] / self.cost_matrix[:-1] - 1
+        regional_normal = self._regional_normal_mask & adjacent
+        
+        growth = np.column_stack([national_growth, regional_growth])
+        normal = np.column_stack([national_normal, regional_normal])
+        national_pooled = self._growth_stats.mean if self._growth_stats.count else self.growth_analysis['average_normal_growth']
+        expected = np.concatenate([[national_pooled], self._regional_pooled_growth])
+        levels = np.concatenate([[self.average_costs[-1]], self.regional_forecast[0] / (1 + self.regional_growth)])
+        return np.where(normal, (growth - expected) * levels, np.nan)
+    
+    def _build_reconciliation(self):
+        """Matriks proyeksi rekonsiliasi (per metode) dan forecast koheren yang dihitung di muka
+        
+        Rata-rata nasional di data_historis adalah rata-rata sederhana seluruh
+        embarkasi, sehingga baris agregatnya berbobot 1/m. Matriks MinT
+        di-cache per versi data lewat model_store.
+        """
+        self.reconciliation_nodes = ['average'] + list(self.embarkasi)
+        summing = summing_matrix(len(self.embarkasi), {'average': np.full(len(self.embarkasi), 1 / len(self.embarkasi))})
+        
+        def build():
+            covariance = shrinkage_covariance(self._reconciliation_residuals())
+            return {'mint': reconciliation_matrix(summing, covariance, 'mint').tolist()}
+        
+        payload = load_or_build(self.RECONCILIATION_ARTIFACT_NAME, self.historical_data, build,
+                                version=self.RECONCILIATION_ARTIFACT_VERSION, persist=self.use_artifact)
+        self.reconciliation_projection = {
+            'mint': summing @ np.array(payload['mint']),
+            'bottom_up': summing @ reconciliation_matrix(summing, method='bottom_up')
         }
         
-        breakdown = {}
-        for component, percentage in breakdown_percentages.items():
-            breakdown[component] = total_predicted * percentage
+        base = self._base_node_forecasts(self.REGIONAL_FORECAST_HORIZON)
+        self.reconciled_forecast = {method: reconcile(base, projection)
+                                    for method, projection in self.reconciliation_projection.items()}
+        for forecast in self.reconciled_forecast.values():
+            forecast.flags.writeable = False
+    
+    def _base_node_forecasts(self, years_ahead: int) -> np.ndarray:
+        """Forecast dasar (tahun x node) sebelum rekonsiliasi: nasional lalu embarkasi"""
+        national = self.predict_batch(np.arange(1, years_ahead + 1))[0]
+        return np.column_stack([national, self.predict_regional_costs(years_ahead)])
+    
+    def predict_reconciled(self, years_ahead: int = 5, method: str = 'mint') -> np.ndarray:
+        """Forecast nasional & embarkasi yang koheren dengan shape (years_ahead, node)
+        
+        Kolom mengikuti self.reconciliation_nodes ('average' lalu embarkasi);
+        kolom 'average' selalu sama dengan rata-rata kolom embarkasi. method:
+        'mint' (least squares dengan kovarians residual) atau 'bottom_up'.
+        """
+        self.refresh()
+        if method not in self.reconciliation_projection:
+            raise ValueError(f"Metode rekonsiliasi tidak dikenal: {method}")
+        if years_ahead <= self.REGIONAL_FORECAST_HORIZON:
+            return self.reconciled_forecast[method][:years_ahead]
+        return reconcile(self._base_node_forecasts(years_ahead), self.reconciliation_projection[method])
+    
+    def predict_regional_costs(self, years_ahead: int = 5) -> np.ndarray:
+        """Forecast seluruh embarkasi sekaligus dengan shape (years_ahead, embarkasi)
+        
+        Kolom mengikuti urutan self.embarkasi, baris ke-i adalah tahun
+        latest_year + i + 1. Hasil diambil dari array forecast yang sudah
+        dihitung di muka, horizon di luar itu dihitung langsung.
+        """
+        self.refresh()
+        if years_ahead <= self.REGIONAL_FORECAST_HORIZON:
+            return self.regional_forecast[:years_ahead]
+        
+        horizons = np.arange(1, years_ahead + 1)
+        base = self.regional_forecast[0] / (1 + self.regional_growth)
+        return base * (1 + self.regional_growth) ** horizons[:, np.newaxis]
+    
+    def plan_savings(self, monthly_deposit, starting_balance, expected_return, embarkasi='average') -> Dict[str, np.ndarray]:
+        """Tahun keberangkatan pertama yang terjangkau untuk array profil penabung
+        
+        Lihat SavingsPlanner.plan; tabel biaya dihitung sekali per versi data.
+        """
+        return self.get_savings_planner().plan(monthly_deposit, starting_balance, expected_return, embarkasi)
+    
+    def get_savings_planner(self) -> SavingsPlanner:
+        """Perencana tabungan di atas forecast predictor ini (mis. untuk file batch mitra bank)"""
+        self.refresh()
+        if self._savings_planner is None:
+            self._savings_planner = SavingsPlanner(self)
+        return self._savings_planner
+    
+    def get_departure_projector(self, waiting_years: Dict[str, float], horizon: int = 60) -> DepartureCostProjector:
+        """Proyektor biaya tahun keberangkatan untuk file pendaftar
+        
+        waiting_years: masa tunggu (tahun) per provinsi. Tabel biaya historis +
+        forecast dihitung sekali saat proyektor dibuat.
+        """
+        self.refresh()
+        return DepartureCostProjector(self, waiting_years, horizon)
+    
+    def predict_monthly(self, months_ahead: int = 24, gold_price: float = 2000,
+                        exchange_rate: float = 15000, scenarios=None) -> Dict[str, object]:
+        """Kurva biaya bulanan per skenario (default tiga skenario bawaan) untuk bulan ke-0..months_ahead
+        
+        Lihat MonthlyForecastEngine.forecast; indeks bulan Masehi/Hijriah dan
+        horizon dihitung sekali per versi data, sehingga menggeser slider hanya
+        mengiris array yang sama.
+        """
+        self.refresh()
+        if self._monthly_engine is None or self._monthly_engine.max_months < months_ahead:
+            self._monthly_engine = MonthlyForecastEngine(self, max_months=max(months_ahead, self.MONTHLY_FORECAST_HORIZON))
+        return self._monthly_engine.forecast(months_ahead, gold_price, exchange_rate, scenarios)
+    
+    def predict_with_best_model(self, embarkasi: str = 'average', years_ahead: int = 5) -> np.ndarray:
+        """Prediksi dengan model terbaik hasil seleksi model zoo untuk satu embarkasi
         
-        return breakdown
+        Seleksi (fit & skor paralel semua kandidat) dijalankan sekali per versi
+        data dan disimpan sebagai artefak; panggilan berikutnya hanya lookup.
+        """
+        return get_best_model(self.historical_data, embarkasi).predict(years_ahead)
+    
+    def get_model_selection(self) -> Dict[str, Dict]:
+        """Model pemenang dan skor backtest semua kandidat per embarkasi"""
+        return get_model_selection(self.historical_data)
     
     def analyze_regional_differences(self, year: int = 2025) -> Dict[str, Dict[str, float]]:
         """Analisis perbedaan biaya regional"""
+        self.refresh()
         if year not in self.historical_data:
-            year = 2025  # Default ke tahun terbaru
+            year = self.latest_year  # Default ke tahun terbaru
+        
+        row = int(np.searchsorted(self.matrix_years, year))
+        costs = self.cost_matrix[row]
+        average_cost = self.average_costs[row]
         
-        data = self.historical_data[year]
-        average_cost = data['average']
+        differences = costs - average_cost
+        percentage_diffs = (differences / average_cost) * 100
+        categories = np.select([percentage_diffs > 5, percentage_diffs < -5], ['Mahal', 'Murah'], 'Normal')
         
         regional_analysis = {}
-        cities = ['aceh', 'medan', 'jakarta', 'surabaya', 'makassar']
-        
-        for city in cities:
-            if city in data:
-                cost = data[city]
-                difference = cost - average_cost
-                percentage_diff = (difference / average_cost) * 100
-                
-                regional_analysis[city] = {
-                    'cost': cost,
-                    'difference_amount': difference,
-                    'difference_percentage': percentage_diff,
-                    'category': 'Mahal' if percentage_diff > 5 else 'Murah' if percentage_diff < -5 else 'Normal'
-                }
+        for i in np.flatnonzero(~np.isnan(costs)).tolist():
+            regional_analysis[self.embarkasi[i]] = {
+                'cost': float(costs[i]),
+                'difference_amount': float(differences[i]),
+                'difference_percentage': float(percentage_diffs[i]),
+                'category': str(categories[i])
+            }
         
         return regional_analysis
     
@@ -210,18 +806,51 @@ class HajjCostPredictor:
             'pandemi': 'Risiko pandemi atau krisis kesehatan global lainnya'
         }
     
-    def get_prediction_summary(self) -> Dict[str, any]:
-        """Ringkasan lengkap prediksi dan analisis"""
-        next_year_prediction = self.predict_future_cost(1)
+    def _describe_last_regime_shift(self) -> str:
+        """Deskripsi perpindahan regime terakhir yang terdeteksi pada deret rata-rata"""
+        self.refresh()
+        shifts = np.flatnonzero(self.regimes['shift_steps'])
+        if not shifts.size:
+            return 'Tidak ada perpindahan regime terdeteksi'
+        
+        step = int(shifts[-1])
+        year = int(self.regimes['regime_starts'][-1])
+        change = self._all_growth_rates[step]
+        kind = 'Lonjakan' if change >= 0 else 'Penurunan'
+        if not self.regimes['current_steps'].any():
+            return f"{kind} {year} ({change * 100:+.0f}%) belum terkonfirmasi sebagai regime baru"
+        return f"{kind} {year} ({change * 100:+.0f}%) sudah ter-normalize"
+    
+    def get_forecast_table(self, gold_price: float = 2000, exchange_rate: float = 15000) -> ForecastTable:
+        """Tabel forecast termaterialisasi (tahun x node x skenario x statistik) untuk data & pasar ini
+        
+        Bagian yang tidak bergantung data pasar dibangun sekali per versi
+        data_historis dan dibagikan read-only ke semua sesi dalam proses;
+        harga emas dan kurs hanya menskalakan skenario per panggilan.
+        """
+        self.refresh()
+        return get_forecast_table(self, gold_price, exchange_rate)
+    
+    def get_prediction_summary(self, table: ForecastTable = None) -> Dict[str, any]:
+        """Ringkasan lengkap prediksi dan analisis (dibaca dari tabel forecast)"""
+        self.refresh()
+        table = table or self.get_forecast_table()
+        next_year = self.latest_year + 1
         growth_rate = self.growth_analysis['average_normal_growth'] * 100
+        confidence = int(table.get(next_year, statistic='confidence'))
+        confidence_label = f"{confidence}%"
+        if not table.confidence_reliable:
+            confidence_label += f" (indikatif: hanya {table.confidence_residuals} residual historis)"
         
         return {
             'current_cost_2025': self.calculate_base_cost(),
-            'predicted_2026': next_year_prediction,
+            'predicted_2026': table.get(next_year),
             'expected_growth_rate': f"{growth_rate:.1f}%",
             'prediction_method': 'Historical trend analysis + Economic factors',
-            'confidence_level': '85%',
+            'confidence_level': confidence_label,
+            'confidence_value': confidence,
+            'confidence_reliable': table.confidence_reliable,
             'data_source': 'Keputusan Presiden RI 2016-2025',
-            'last_anomaly': 'Lonjakan 2023 (+128%) sudah ter-normalize',
+            'last_anomaly': self._describe_last_regime_shift(),
             'risk_level': 'Moderate - mengikuti trend normal pasca-anomali'
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,104 @@
+"""Sketch kuantil streaming yang bisa digabung (relative-error, ala DDSketch)
+
+Nilai positif dipetakan ke bucket logaritmik dengan rasio gamma = (1 + a) / (1 - a),
+sehingga setiap kuantil yang dikembalikan berada dalam galat relatif a dari
+order statistic yang sebenarnya (Masson dkk., 2019). Sketch menyimpan hitungan
+per bucket untuk beberapa deret sekaligus (mis. satu deret per horizon), dan dua
+sketch digabung cukup dengan menjumlahkan hitungan, sehingga blok simulasi
+bisa diproses di proses terpisah lalu digabung dengan hasil yang identik.
+"""
+import math
+
+import numpy as np
+
+# Galat relatif default kuantil (0.1%)
+RELATIVE_ACCURACY = 0.001
+
+
+class LogQuantileSketch:
+    """Sketch kuantil untuk n_series deret nilai positif yang dimasukkan dalam skala log
+
+    Memori sebanding dengan rentang log nilai / log(gamma) per deret, tidak
+    bergantung pada jumlah sampel. Jumlah exp(nilai) ikut diakumulasi agar
+    mean tetap eksak.
+    """
+
+    def __init__(self, n_series: int, relative_accuracy: float = RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy harus di antara 0 dan 1")
+        self.n_series = n_series
+        self.relative_accuracy = relative_accuracy
+        self._log_gamma = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.offset = 0
+        self.counts = np.zeros((n_series, 0), dtype=np.int64)
+        self.count = 0
+        self.total = np.zeros(n_series)
+
+    def _ensure_range(self, low: int, high: int):
+        """Perluas array hitungan agar bucket low..high (inklusif) tertampung"""
+        width = self.counts.shape[1]
+        if width == 0:
+            self.offset = low
+            self.counts = np.zeros((self.n_series, high - low + 1), dtype=np.int64)
+            return
+        new_offset = min(self.offset, low)
+        new_width = max(self.offset + width, high + 1) - new_offset
+        if new_offset == self.offset and new_width == width:
+            return
+        counts = np.zeros((self.n_series, new_width), dtype=np.int64)
+        counts[:, self.offset - new_offset:self.offset - new_offset + width] = self.counts
+        self.offset, self.counts = new_offset, counts
+
+    def add_log(self, log_values: np.ndarray):
+        """Tambahkan blok nilai dalam skala log dengan shape (n_series, n_sampel)"""
+        log_values = np.asarray(log_values, dtype=float)
+        if log_values.shape[0] != self.n_series:
+            raise ValueError(f"Blok harus memiliki {self.n_series} deret")
+        if log_values.shape[1] == 0:
+            return
+
+        buckets = np.ceil(log_values / self._log_gamma).astype(np.int64)
+        self._ensure_range(int(buckets.min()), int(buckets.max()))
+
+        # Satu bincount untuk semua deret: indeks datar = deret * lebar + bucket
+        width = self.counts.shape[1]
+        flat = (buckets - self.offset) + np.arange(self.n_series)[:, np.newaxis] * width
+        self.counts += np.bincount(flat.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.count += log_values.shape[1]
+        self.total += np.exp(log_values).sum(axis=1)
+
+    def merge(self, other: 'LogQuantileSketch') -> 'LogQuantileSketch':
+        """Gabungkan sketch lain (deret dan akurasi harus sama) ke sketch ini"""
+        if other.n_series != self.n_series or other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketch hanya bisa digabung dengan jumlah deret dan akurasi yang sama")
+        if other.count == 0:
+            return self
+        width = other.counts.shape[1]
+        self._ensure_range(other.offset, other.offset + width - 1)
+        start = other.offset - self.offset
+        self.counts[:, start:start + width] += other.counts
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def quantiles(self, q) -> np.ndarray:
+        """Kuantil (0..1) per deret, shape (len(q), n_series)
+
+        Rank mengikuti np.percentile: q * (n - 1); nilai yang dikembalikan berada
+        dalam galat relatif relative_accuracy dari order statistic ke-floor(rank).
+        """
+        if self.count == 0:
+            raise ValueError("Sketch masih kosong")
+        q = np.atleast_1d(np.asarray(q, dtype=float))
+        cumulative = np.cumsum(self.counts, axis=1)
+        ranks = np.floor(q * (self.count - 1))
+
+        # Bucket pertama yang hitungan kumulatifnya melewati rank
+        buckets = (cumulative[np.newaxis, :, :] > ranks[:, np.newaxis, np.newaxis]).argmax(axis=2)
+        log_values = (buckets + self.offset) * self._log_gamma
+        # Titik tengah relatif bucket (gamma^(i-1), gamma^i]: 2 gamma^i / (gamma + 1)
+        return np.exp(log_values) * 2 / (1 + math.exp(self._log_gamma))
+
+    def mean(self) -> np.ndarray:
+        """Mean eksak exp(nilai) per deret"""
+        return self.total / self.count
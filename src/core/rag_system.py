@@ -1,9 +1,50 @@
 """RAG (Retrieval Augmented Generation) System dengan Data Riil"""
+from .bm25 import BM25Index
+from .context_budget import DEFAULT_TOKEN_BUDGET, AssembledContext, pack_sections, score_sections
+from .keyword_automaton import KeywordAutomaton
+from .model_store import data_hash
+from .vector_index import load_or_build_index
+
+# Cache konteks lintas instance: versi knowledge base -> teks section, dan
+# (versi, bitmask section terpicu, query spesifik) -> teks konteks tanpa footer
+_section_cache = {}
+_context_cache = {}
 
 class RAGSystem:
     """Retrieval Augmented Generation System untuk konteks haji dengan data riil"""
     
-    def __init__(self):
+    # Kata pemicu per section konteks (dicocokkan sebagai substring query, urutan = urutan output)
+    CONTEXT_TRIGGERS = {
+        "data_historis": ["trend", "historis", "naik", "turun", "pertumbuhan", "perubahan", "data"],
+        "lonjakan_2023": ["2023", "covid", "lonjakan", "naik", "tinggi", "ekstrem"],
+        "regional": ["jakarta", "surabaya", "medan", "aceh", "makassar", "embarkasi", "regional", "beda", "murah", "mahal"],
+        "komponen_biaya": ["komponen", "terdiri", "biaya", "apa saja", "termasuk", "bagian"],
+        "faktor_kenaikan": ["faktor", "penyebab", "kenapa", "mengapa", "pengaruh", "dampak"],
+        "prediksi": ["prediksi", "masa depan", "akan", "tahun depan", "estimasi", "proyeksi"]
+    }
+    
+    # Prefix nama section untuk insight khusus (dipicu oleh kata-kata pada kuncinya)
+    INSIGHT_SECTION_PREFIX = "insight:"
+    
+    # Jumlah chunk retrieval yang ditampilkan jika tidak ada section yang terpicu
+    RETRIEVAL_TOP_K = 3
+    
+    # Backend retrieval chunk: 'bm25' (term persis) atau 'tfidf' (char n-gram, tahan imbuhan/parafrase)
+    RETRIEVAL_BACKENDS = ('bm25', 'tfidf')
+    
+    # Pembuka dan penutup setiap konteks
+    CONTEXT_HEADER = "=== KONTEKS BIAYA HAJI INDONESIA (DATA RIIL KEPPRES) ===\\n\\n"
+    CONTEXT_FOOTER = "📋 SUMBER: Data resmi dari 9 Keputusan Presiden RI (2016-2025)\\n"
+    
+    # Nama artefak indeks TF-IDF di direktori model
+    VECTOR_INDEX_NAME = "rag_tfidf"
+    
+    def __init__(self, retrieval_backend: str = 'bm25'):
+        if retrieval_backend not in self.RETRIEVAL_BACKENDS:
+            raise ValueError(f"Backend retrieval tidak dikenal: {retrieval_backend} "
+                             f"(pilihan: {', '.join(self.RETRIEVAL_BACKENDS)})")
+        self.retrieval_backend = retrieval_backend
+        
         self.knowledge_base = {
             # Data riil dari Keputusan Presiden 2016-2025
             "data_historis": {
@@ -73,80 +114,233 @@ class RAGSystem:
                 "keppres_2025": "Keputusan Presiden No. 6 Tahun 2025 (1446H/2025M)"
             }
         }
+        
+        # Dokumen tambahan dari add_documents, dipertahankan saat indeks dibangun ulang
+        self._extra_documents = {}
+        # Prefix artefak indeks TF-IDF terakhir yang dipakai instance ini
+        self._vector_index_prefix = None
+        self._rebuild_indexes()
     
-    def retrieve_context(self, query: str) -> str:
-        """Ambil konteks yang relevan berdasarkan query dengan data riil"""
-        context = "=== KONTEKS BIAYA HAJI INDONESIA (DATA RIIL KEPPRES) ===\\n\\n"
+    def _rebuild_indexes(self):
+        """Hitung versi knowledge base lalu bangun automaton pemicu, chunk, dan indeks BM25-nya"""
+        # Versi knowledge base sebagai kunci cache teks konteks
+        self._knowledge_version = data_hash(self.knowledge_base)
         
-        query_lower = query.lower()
+        # Semua kata pemicu (section + kata pada kunci insight) dikompilasi sekali ke satu automaton
+        triggers = dict(self.CONTEXT_TRIGGERS)
+        for key in self.knowledge_base["insight_khusus"]:
+            triggers[self.INSIGHT_SECTION_PREFIX + key] = key.split('_')
+        self._trigger_automaton = KeywordAutomaton(triggers)
+        
+        # Chunk knowledge base (plus dokumen tambahan) dan indeks BM25-nya
+        self._chunks = self._build_chunks()
+        self._chunks.update(self._extra_documents)
+        self._retrieval_index = BM25Index(self._chunks.items())
+        # Indeks TF-IDF dimuat saat search pertama (dari cache proses / memory-map artefak)
+        self._vector_index = None
+    
+    def invalidate(self):
+        """Tandai knowledge base berubah (mis. setelah HajjCostPredictor.add_year)
+        
+        Versi, chunk, dan indeks dibangun ulang saat diakses berikutnya, sehingga
+        cache section/konteks versi lama tidak lagi dipakai.
+        """
+        self._knowledge_version = None
+    
+    def _ensure_current(self):
+        if self._knowledge_version is None:
+            self._rebuild_indexes()
+    
+    @property
+    def knowledge_version(self) -> str:
+        """Hash konten knowledge base saat ini, kunci cache teks konteks"""
+        self._ensure_current()
+        return self._knowledge_version
+    
+    @property
+    def trigger_automaton(self) -> KeywordAutomaton:
+        self._ensure_current()
+        return self._trigger_automaton
+    
+    @property
+    def chunks(self):
+        self._ensure_current()
+        return self._chunks
+    
+    @property
+    def retrieval_index(self) -> BM25Index:
+        self._ensure_current()
+        return self._retrieval_index
+    
+    def _build_chunks(self):
+        """Pecah knowledge base menjadi chunk teks: satu per tahun data historis dan satu per entri section lain"""
+        chunks = {}
+        for year, data in self.knowledge_base["data_historis"].items():
+            regional = ", ".join(f"{city.title()} Rp {cost:,}" for city, cost in data.items()
+                                 if city not in ('year_hijri', 'average'))
+            chunks[f"data_historis/{year}"] = (
+                f"Data historis biaya haji {year} ({data['year_hijri']}): rata-rata nasional "
+                f"Rp {data['average']:,}; per embarkasi: {regional}"
+            )
+        
+        for section, entries in self.knowledge_base.items():
+            if section == "data_historis":
+                continue
+            title = section.replace('_', ' ').title()
+            for key, value in entries.items():
+                chunks[f"{section}/{key}"] = f"{title} - {key.replace('_', ' ').title()}: {value}"
+        return chunks
+    
+    def add_documents(self, documents):
+        """Tambahkan dokumen {id: teks} ke korpus retrieval lalu bangun ulang indeks BM25 (TF-IDF menyusul saat search)"""
+        self._extra_documents.update(documents)
+        self.chunks.update(documents)
+        self._retrieval_index = BM25Index(self.chunks.items())
+        self._vector_index = None
+    
+    @property
+    def vector_index(self):
+        """Indeks TF-IDF korpus chunk saat ini (fit hanya jika belum ada artefak untuk korpus ini)"""
+        self._ensure_current()
+        if self._vector_index is None:
+            # Indeks versi korpus sebelumnya (sebelum add_documents / invalidate) digantikan dan dibersihkan
+            self._vector_index = load_or_build_index(self.VECTOR_INDEX_NAME, self.chunks,
+                                                     replaces=self._vector_index_prefix)
+            self._vector_index_prefix = self._vector_index.prefix
+        return self._vector_index
+    
+    def search(self, query: str, top_k: int = None):
+        """Top-k chunk untuk query dengan backend retrieval aktif: list (id chunk, teks, skor)"""
+        index = self.vector_index if self.retrieval_backend == 'tfidf' else self.retrieval_index
+        results = index.search(query, top_k or self.RETRIEVAL_TOP_K)
+        return [(chunk_id, self.chunks[chunk_id], score) for chunk_id, score in results]
+    
+    def _render_sections(self):
+        """Teks setiap section konteks, dirender sekali per versi knowledge base (dibagikan antar instance)"""
+        sections = _section_cache.get(self.knowledge_version)
+        if sections is not None:
+            return sections
         
         # Konteks data historis
-        if any(word in query_lower for word in ["trend", "historis", "naik", "turun", "pertumbuhan", "perubahan", "data"]):
-            context += "📊 DATA HISTORIS BIAYA HAJI (RATA-RATA NASIONAL):\\n"
-            for year, data in self.knowledge_base["data_historis"].items():
-                context += f"- {year} ({data['year_hijri']}): Rp {data['average']:,}\\n"
-            
-            context += "\\n📈 ANALISIS PERTUMBUHAN:\\n"
-            for key, value in self.knowledge_base["analisis_pertumbuhan"].items():
-                context += f"- {key.replace('_', ' ').title()}: {value}\\n"
-            context += "\\n"
+        lines = ["📊 DATA HISTORIS BIAYA HAJI (RATA-RATA NASIONAL):\\n"]
+        lines += [f"- {year} ({data['year_hijri']}): Rp {data['average']:,}\\n"
+                  for year, data in self.knowledge_base["data_historis"].items()]
+        lines.append("\\n📈 ANALISIS PERTUMBUHAN:\\n")
+        lines += [f"- {key.replace('_', ' ').title()}: {value}\\n"
+                  for key, value in self.knowledge_base["analisis_pertumbuhan"].items()]
+        lines.append("\\n")
+        sections = {"data_historis": "".join(lines)}
         
         # Konteks khusus untuk tahun 2023
-        if any(word in query_lower for word in ["2023", "covid", "lonjakan", "naik", "tinggi", "ekstrem"]):
-            context += "🚀 ANALISIS LONJAKAN 2023:\\n"
-            context += "- Kenaikan dari Rp 39.4 juta (2022) menjadi Rp 90.0 juta (2023)\\n"
-            context += "- Persentase kenaikan: +128% dalam 1 tahun\\n"
-            context += "- Faktor: akumulasi inflasi pasca-COVID, peningkatan standar layanan\\n"
-            context += "- Status: Anomali satu kali, bukan trend permanen\\n\\n"
+        sections["lonjakan_2023"] = (
+            "🚀 ANALISIS LONJAKAN 2023:\\n"
+            "- Kenaikan dari Rp 39.4 juta (2022) menjadi Rp 90.0 juta (2023)\\n"
+            "- Persentase kenaikan: +128% dalam 1 tahun\\n"
+            "- Faktor: akumulasi inflasi pasca-COVID, peningkatan standar layanan\\n"
+            "- Status: Anomali satu kali, bukan trend permanen\\n\\n"
+        )
         
         # Konteks perbandingan regional
-        if any(word in query_lower for word in ["jakarta", "surabaya", "medan", "aceh", "makassar", "embarkasi", "regional", "beda", "murah", "mahal"]):
-            context += "🗺️ PERBANDINGAN REGIONAL (2025):\\n"
-            latest_data = self.knowledge_base["data_historis"][2025]
-            cities = ['aceh', 'medan', 'jakarta', 'surabaya', 'makassar']
-            
-            for city in cities:
-                cost = latest_data[city]
-                avg = latest_data['average']
-                diff_pct = ((cost - avg) / avg) * 100
-                status = "💰 Mahal" if diff_pct > 5 else "💚 Murah" if diff_pct < -5 else "⚖️ Normal"
-                context += f"- {city.title()}: Rp {cost:,} ({diff_pct:+.1f}% vs rata-rata) {status}\\n"
-            context += "\\n"
+        lines = ["🗺️ PERBANDINGAN REGIONAL (2025):\\n"]
+        latest_data = self.knowledge_base["data_historis"][2025]
+        for city in ['aceh', 'medan', 'jakarta', 'surabaya', 'makassar']:
+            cost = latest_data[city]
+            avg = latest_data['average']
+            diff_pct = ((cost - avg) / avg) * 100
+            status = "💰 Mahal" if diff_pct > 5 else "💚 Murah" if diff_pct < -5 else "⚖️ Normal"
+            lines.append(f"- {city.title()}: Rp {cost:,} ({diff_pct:+.1f}% vs rata-rata) {status}\\n")
+        lines.append("\\n")
+        sections["regional"] = "".join(lines)
         
         # Konteks komponen biaya
-        if any(word in query_lower for word in ["komponen", "terdiri", "biaya", "apa saja", "termasuk", "bagian"]):
-            context += "💰 KOMPONEN BIAYA HAJI:\\n"
-            for komponen, deskripsi in self.knowledge_base["komponen_biaya"].items():
-                context += f"- {komponen.replace('_', ' ').title()}: {deskripsi}\\n"
-            context += "\\n"
+        lines = ["💰 KOMPONEN BIAYA HAJI:\\n"]
+        lines += [f"- {komponen.replace('_', ' ').title()}: {deskripsi}\\n"
+                  for komponen, deskripsi in self.knowledge_base["komponen_biaya"].items()]
+        lines.append("\\n")
+        sections["komponen_biaya"] = "".join(lines)
         
         # Konteks faktor kenaikan
-        if any(word in query_lower for word in ["faktor", "penyebab", "kenapa", "mengapa", "pengaruh", "dampak"]):
-            context += "🎯 FAKTOR-FAKTOR KENAIKAN BIAYA:\\n"
-            for faktor, penjelasan in self.knowledge_base["faktor_kenaikan"].items():
-                context += f"- {faktor.replace('_', ' ').title()}: {penjelasan}\\n"
-            context += "\\n"
+        lines = ["🎯 FAKTOR-FAKTOR KENAIKAN BIAYA:\\n"]
+        lines += [f"- {faktor.replace('_', ' ').title()}: {penjelasan}\\n"
+                  for faktor, penjelasan in self.knowledge_base["faktor_kenaikan"].items()]
+        lines.append("\\n")
+        sections["faktor_kenaikan"] = "".join(lines)
         
         # Konteks prediksi
-        if any(word in query_lower for word in ["prediksi", "masa depan", "akan", "tahun depan", "estimasi", "proyeksi"]):
-            context += "🔮 BASIS PREDIKSI:\\n"
-            context += "- Trend normal: 3-5% growth per tahun (berdasarkan periode 2016-2022)\\n"
-            context += "- Anomali 2023: sudah ter-normalize di 2024-2025\\n"
-            context += "- Faktor risiko: inflasi global, kebijakan Saudi, nilai tukar\\n"
-            context += "- Metodologi: Ensemble ML + trend analysis + economic factors\\n\\n"
-        
-        # Tambahkan insight khusus
-        if len(query_lower) > 10:  # Query yang cukup spesifik
-            context += "💡 INSIGHT KHUSUS:\\n"
-            for key, insight in self.knowledge_base["insight_khusus"].items():
-                if any(word in query_lower for word in key.split('_')):
-                    context += f"- {insight}\\n"
-            context += "\\n"
-        
-        # Footer dengan sumber
-        context += "📋 SUMBER: Data resmi dari 9 Keputusan Presiden RI (2016-2025)\\n"
-        
-        return context
+        sections["prediksi"] = (
+            "🔮 BASIS PREDIKSI:\\n"
+            "- Trend normal: 3-5% growth per tahun (berdasarkan periode 2016-2022)\\n"
+            "- Anomali 2023: sudah ter-normalize di 2024-2025\\n"
+            "- Faktor risiko: inflasi global, kebijakan Saudi, nilai tukar\\n"
+            "- Metodologi: Ensemble ML + trend analysis + economic factors\\n\\n"
+        )
+        
+        # Baris insight khusus (dipilih per query lewat bit section insight)
+        for key, insight in self.knowledge_base["insight_khusus"].items():
+            sections[self.INSIGHT_SECTION_PREFIX + key] = f"- {insight}\\n"
+        
+        _section_cache[self.knowledge_version] = sections
+        return sections
+    
+    def _section_parts(self, mask: int, specific: bool):
+        """Section terpicu (+ blok insight untuk query spesifik) sebagai list (nama, teks), urut sesuai output"""
+        sections = self._render_sections()
+        triggered = self.trigger_automaton.sections_for(mask)
+        parts = [(name, sections[name]) for name in triggered if name in self.CONTEXT_TRIGGERS]
+        if specific:
+            insights = [sections[name] for name in triggered if name.startswith(self.INSIGHT_SECTION_PREFIX)]
+            parts.append(("insight_khusus", "".join(["💡 INSIGHT KHUSUS:\\n", *insights, "\\n"])))
+        return parts
+    
+    def _context_body(self, mask: int, specific: bool) -> str:
+        """Header + section terpicu untuk bitmask ini, dari cache"""
+        key = (self.knowledge_version, mask, specific)
+        body = _context_cache.get(key)
+        if body is not None:
+            return body
+        
+        body = self.CONTEXT_HEADER + "".join(text for _, text in self._section_parts(mask, specific))
+        # Race antar sesi hanya menghasilkan string yang sama; assignment dict atomik
+        _context_cache[key] = body
+        return body
+    
+    def _related_section(self, query_lower: str) -> str:
+        """Section chunk paling relevan dari indeks retrieval (string kosong jika tidak ada hasil)"""
+        results = self.search(query_lower)
+        if not results:
+            return ""
+        related = "".join(f"- {text}\\n" for _, text, _ in results)
+        return "".join(["📚 KONTEKS TERKAIT:\\n", related, "\\n"])
+    
+    def retrieve_context(self, query: str) -> str:
+        """Ambil konteks yang relevan berdasarkan query dengan data riil"""
+        query_lower = query.lower()
+        
+        # Satu kali scan query, lalu satu lookup cache untuk kombinasi section yang terpicu
+        mask = self.trigger_automaton.match_mask(query_lower)
+        body = self._context_body(mask, len(query_lower) > 10)  # Insight hanya untuk query yang cukup spesifik
+        if mask:
+            return body + self.CONTEXT_FOOTER
+        
+        # Query tanpa kata pemicu: ambil chunk paling relevan dari indeks retrieval
+        return body + self._related_section(query_lower) + self.CONTEXT_FOOTER
+    
+    def assemble_context(self, query: str, budget: int = DEFAULT_TOKEN_BUDGET, extra_sections=None) -> AssembledContext:
+        """Konteks untuk LLM dalam batas token budget
+        
+        Section retrieve_context (plus extra_sections {nama: teks}) diberi skor
+        relevansi terhadap query lalu dipack greedy; section yang tidak muat
+        dilaporkan di .dropped.
+        """
+        query_lower = query.lower()
+        mask = self.trigger_automaton.match_mask(query_lower)
+        parts = self._section_parts(mask, len(query_lower) > 10)
+        if not mask:
+            related = self._related_section(query_lower)
+            if related:
+                parts.append(("konteks_terkait", related))
+        parts += list((extra_sections or {}).items())
+        return pack_sections(score_sections(query_lower, parts), budget, self.CONTEXT_HEADER, self.CONTEXT_FOOTER)
     
     def get_latest_cost_data(self):
         """Get data biaya terbaru"""
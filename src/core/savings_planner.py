@@ -0,0 +1,148 @@
+"""Perencana tabungan haji: tahun keberangkatan pertama yang terjangkau per profil penabung"""
+from typing import Dict, Iterable, Iterator
+
+import numpy as np
+
+# Kolom input/output file batch dari mitra bank
+INPUT_COLUMNS = ('monthly_deposit', 'starting_balance', 'expected_return', 'embarkasi')
+OUTPUT_COLUMNS = ('departure_year', 'years_needed', 'projected_cost', 'balance_at_departure')
+
+# Profil yang tidak terjangkau dalam horizon ditandai dengan nilai ini
+UNAFFORDABLE = -1
+
+
+def _check_rows(invalid: np.ndarray, message: str):
+    """ValueError dengan contoh indeks baris jika ada profil yang tidak valid"""
+    if invalid.any():
+        rows = np.flatnonzero(invalid)
+        raise ValueError(f"{message} ({len(rows)} profil, mis. baris {', '.join(map(str, rows[:5].tolist()))})")
+
+
+def encode_labels(values, index: Dict[str, int], kind: str = 'Embarkasi') -> np.ndarray:
+    """Petakan array label ke indeks integer (unik dulu, lalu inverse) tanpa loop per baris"""
+    names, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    unknown = [name for name in names if name not in index]
+    if unknown:
+        raise ValueError(f"{kind} tidak dikenal: {', '.join(unknown)}")
+    return np.array([index[name] for name in names], dtype=np.intp)[inverse.ravel()]
+
+
+class SavingsPlanner:
+    """Evaluasi kolumnar jutaan profil tabungan terhadap tabel forecast biaya
+
+    Tabel biaya (tahun x target) dihitung sekali dari predictor: seluruh
+    embarkasi plus 'average' untuk rata-rata nasional. Saldo setiap profil
+    di akhir tiap tahun dihitung sebagai satu matriks (profil x tahun) per
+    chunk, lalu tahun pertama dengan saldo >= biaya diambil dengan argmax.
+    """
+
+    AVERAGE_KEY = 'average'
+
+    def __init__(self, predictor, horizon: int = 30, chunk_size: int = 200_000):
+        self.horizon = horizon
+        self.chunk_size = chunk_size
+        self.start_year = predictor.latest_year
+        self.targets = list(predictor.embarkasi) + [self.AVERAGE_KEY]
+        self.target_index = {name: i for i, name in enumerate(self.targets)}
+
+        # (tahun, target): kolom terakhir adalah rata-rata nasional
+        horizons = np.arange(1, horizon + 1)
+        self.cost_table = np.column_stack([
+            predictor.predict_regional_costs(horizon),
+            predictor.predict_batch(horizons)[0]
+        ])
+        self._years = horizons
+        self._months = 12 * horizons
+
+    def _balances(self, monthly_deposit: np.ndarray, starting_balance: np.ndarray,
+                  expected_return: np.ndarray) -> np.ndarray:
+        """Saldo di akhir tiap tahun dengan shape (profil, tahun), bunga dikompon bulanan"""
+        # (1 + r_bulanan)^bulan = exp(log1p(r_tahunan) * tahun), lebih murah dari pangkat per elemen
+        log_annual = np.log1p(expected_return)
+        monthly_rate = np.expm1(log_annual / 12)
+        growth = np.exp(log_annual[:, np.newaxis] * self._years[np.newaxis, :])
+
+        # Anuitas setoran bulanan; rate 0 menjadi setoran x jumlah bulan
+        safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)[:, np.newaxis]
+        annuity = np.where(monthly_rate[:, np.newaxis] == 0, self._months, (growth - 1) / safe_rate)
+
+        return starting_balance[:, np.newaxis] * growth + monthly_deposit[:, np.newaxis] * annuity
+
+    def _plan_chunk(self, monthly_deposit, starting_balance, expected_return, codes) -> Dict[str, np.ndarray]:
+        """Rencanakan satu chunk profil"""
+        balances = self._balances(monthly_deposit, starting_balance, expected_return)
+        costs = self.cost_table[:, codes].T
+
+        affordable = balances >= costs
+        found = affordable.any(axis=1)
+        first = np.argmax(affordable, axis=1)
+        rows = np.arange(len(codes))
+
+        return {
+            'departure_year': np.where(found, self.start_year + first + 1, UNAFFORDABLE),
+            'years_needed': np.where(found, first + 1, UNAFFORDABLE),
+            'projected_cost': np.where(found, costs[rows, first], np.nan),
+            'balance_at_departure': np.where(found, balances[rows, first], np.nan)
+        }
+
+    def plan(self, monthly_deposit, starting_balance, expected_return, embarkasi) -> Dict[str, np.ndarray]:
+        """Tahun keberangkatan pertama yang terjangkau untuk tiap profil
+
+        Semua argumen berupa array sepanjang jumlah profil (atau skalar yang
+        di-broadcast). expected_return adalah imbal hasil tahunan (0.05 = 5%)
+        dan harus lebih dari -1, monthly_deposit harus positif, starting_balance
+        tidak negatif; selain itu ValueError. embarkasi berisi nama embarkasi
+        atau 'average'. Hasil berupa kolom OUTPUT_COLUMNS; profil yang tidak
+        terjangkau dalam horizon bernilai UNAFFORDABLE (tahun) atau NaN (nominal).
+        """
+        monthly_deposit, starting_balance, expected_return, embarkasi = np.broadcast_arrays(
+            np.asarray(monthly_deposit, dtype=float),
+            np.asarray(starting_balance, dtype=float),
+            np.asarray(expected_return, dtype=float),
+            np.asarray(embarkasi, dtype=str)
+        )
+        monthly_deposit, starting_balance, expected_return = (
+            np.ravel(monthly_deposit), np.ravel(starting_balance), np.ravel(expected_return)
+        )
+        _check_rows(~(monthly_deposit > 0) | ~np.isfinite(monthly_deposit), "monthly_deposit harus positif")
+        _check_rows(~(starting_balance >= 0) | ~np.isfinite(starting_balance), "starting_balance tidak boleh negatif")
+        _check_rows(~(expected_return > -1) | ~np.isfinite(expected_return), "expected_return harus lebih dari -1 (-100%)")
+        codes = encode_labels(np.ravel(embarkasi), self.target_index)
+
+        chunks = [
+            self._plan_chunk(
+                monthly_deposit[start:start + self.chunk_size],
+                starting_balance[start:start + self.chunk_size],
+                expected_return[start:start + self.chunk_size],
+                codes[start:start + self.chunk_size]
+            )
+            for start in range(0, len(codes), self.chunk_size)
+        ]
+        if not chunks:
+            return {column: np.array([]) for column in OUTPUT_COLUMNS}
+
+        return {column: np.concatenate([chunk[column] for chunk in chunks]) for column in OUTPUT_COLUMNS}
+
+    def plan_batches(self, batches: Iterable) -> Iterator:
+        """Rencanakan aliran batch kolumnar (mis. chunk DataFrame) satu per satu
+
+        Setiap batch harus bisa diindeks dengan nama INPUT_COLUMNS; hasilnya
+        batch yang sama dengan tambahan kolom OUTPUT_COLUMNS.
+        """
+        for batch in batches:
+            result = self.plan(*(batch[column] for column in INPUT_COLUMNS))
+            for column in OUTPUT_COLUMNS:
+                batch[column] = result[column]
+            yield batch
+
+    def plan_csv(self, input_path, output_path, chunk_size: int = None) -> int:
+        """Proses file CSV mitra bank per chunk tanpa memuat seluruh file, kembalikan jumlah baris"""
+        # Import lazy: pandas hanya dibutuhkan untuk pemrosesan file
+        import pandas as pd
+
+        reader = pd.read_csv(input_path, chunksize=chunk_size or self.chunk_size)
+        n_rows = 0
+        for i, batch in enumerate(self.plan_batches(reader)):
+            batch.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            n_rows += len(batch)
+        return n_rows
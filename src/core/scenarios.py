@@ -0,0 +1,178 @@
+"""Skenario deklaratif (JSON/YAML) yang dikompilasi ke array parameter untuk evaluasi batch
+
+Setiap skenario berupa shock terhadap kondisi pasar dan trend: perubahan
+relatif harga emas dan kurs USD/IDR, pengali serta tambahan growth normal,
+tambahan inflasi per driver komponen biaya, dan tahun mulai berlakunya
+shock. Ribuan skenario dikompilasi sekali menjadi array (skenario x ...),
+lalu dievaluasi untuk harga emas/kurs terbaru dalam satu operasi broadcast
+(skenario x komponen x tahun) tanpa loop Python per skenario.
+"""
+import json
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ScenarioSpec:
+    """Spesifikasi satu skenario; semua shock relatif terhadap kondisi dasar"""
+    name: str
+    gold_shock: float = 0.0  # Perubahan relatif harga emas (0.05 = +5%)
+    fx_shock: float = 0.0  # Perubahan relatif kurs USD/IDR (SAR mengikuti patokan)
+    growth_multiplier: float = 1.0  # Pengali growth normal historis
+    growth_shift: float = 0.0  # Tambahan growth tahunan (0.01 = +1 poin persen)
+    component_inflation: Dict[str, float] = field(default_factory=dict)  # Tambahan inflasi per driver komponen
+    start_year: int = None  # Tahun mulai shock berlaku; None = tahun forecast pertama
+
+
+# Tiga skenario bawaan generate_prediction_scenarios
+DEFAULT_SCENARIOS = (
+    ScenarioSpec('Konservatif', gold_shock=-0.05, growth_multiplier=0.7),
+    ScenarioSpec('Realistis'),
+    ScenarioSpec('Optimistis', gold_shock=0.05, growth_multiplier=1.3),
+)
+
+
+def parse_scenarios(entries: Iterable[Dict]) -> List[ScenarioSpec]:
+    """Bangun ScenarioSpec dari list dict (mis. isi file JSON/YAML)"""
+    allowed = {spec_field.name for spec_field in fields(ScenarioSpec)}
+    specs = []
+    for entry in entries:
+        unknown = set(entry) - allowed
+        if unknown:
+            raise ValueError(f"Field skenario tidak dikenal: {', '.join(sorted(unknown))}")
+        specs.append(ScenarioSpec(**entry))
+    return specs
+
+
+def load_scenarios(path: Union[str, Path]) -> List[ScenarioSpec]:
+    """Baca pustaka skenario dari file JSON atau YAML
+
+    Isi file berupa list skenario, atau objek dengan kunci 'scenarios'.
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix.lower() in ('.yaml', '.yml'):
+            # Import lazy: PyYAML hanya dibutuhkan untuk pustaka skenario berformat YAML
+            import yaml
+            content = yaml.safe_load(f)
+        else:
+            content = json.load(f)
+
+    if isinstance(content, dict):
+        content = content.get('scenarios', [])
+    return parse_scenarios(content)
+
+
+class CompiledScenarios:
+    """Pustaka skenario dalam bentuk array parameter per skenario
+
+    Kompilasi hanya bergantung pada spesifikasi dan daftar driver komponen,
+    sehingga cukup dilakukan sekali; evaluate bisa dipanggil ulang setiap kali
+    data pasar atau state predictor berubah.
+    """
+
+    def __init__(self, specs: Iterable[ScenarioSpec], drivers: Iterable[str]):
+        specs = list(specs)
+        self.drivers = list(drivers)
+        self.names = [spec.name for spec in specs]
+
+        self.gold_shock = np.array([spec.gold_shock for spec in specs], dtype=float)
+        self.fx_shock = np.array([spec.fx_shock for spec in specs], dtype=float)
+        self.growth_multiplier = np.array([spec.growth_multiplier for spec in specs], dtype=float)
+        self.growth_shift = np.array([spec.growth_shift for spec in specs], dtype=float)
+        # Tahun mulai yang kosong ditandai 0 (berlaku sejak tahun forecast pertama)
+        self.start_year = np.array([spec.start_year or 0 for spec in specs], dtype=np.int64)
+
+        # (skenario, driver): tambahan inflasi; driver yang tidak dikenal adalah kesalahan spesifikasi
+        driver_index = {driver: i for i, driver in enumerate(self.drivers)}
+        self.component_inflation = np.zeros((len(specs), len(self.drivers)))
+        for i, spec in enumerate(specs):
+            unknown = set(spec.component_inflation) - set(driver_index)
+            if unknown:
+                raise ValueError(f"Skenario '{spec.name}': driver tidak dikenal: {', '.join(sorted(unknown))}")
+            for driver, inflation in spec.component_inflation.items():
+                self.component_inflation[i, driver_index[driver]] = inflation
+
+    def __len__(self):
+        return len(self.names)
+
+    def _factors(self, predictor, years_ahead, gold_price: float, exchange_rate: float):
+        """Faktor multiplikatif biaya: (biaya dasar, emas, trend, kurs), masing-masing (skenario, tahun)
+
+        Biaya dasar = biaya terkini. Trend = pertumbuhan komponen (growth
+        normal skenario + inflasi driver) berbobot porsi pada kurs dasar;
+        kurs = rasio breakdown pada kurs skenario terhadap kurs dasar. Sebelum
+        start_year semua skenario mengikuti kondisi dasar (harga emas/kurs saat
+        ini, growth normal), sejak start_year shock berlaku dan growth-nya
+        dikompon dari level tahun sebelumnya.
+        """
+        horizons = np.atleast_1d(np.asarray(years_ahead, dtype=float))
+        components = predictor.component_model
+        normal_growth = predictor.growth_analysis['average_normal_growth']
+
+        # Jumlah tahun forecast sebelum shock berlaku, (skenario, 1, 1) agar broadcast ke (S, K, Y)
+        years_before = np.maximum(self.start_year - predictor.latest_year - 1, 0).astype(float)
+        years_before = years_before[:, np.newaxis, np.newaxis]
+        active = horizons[np.newaxis, np.newaxis, :] > years_before
+
+        # (skenario, komponen): growth tahunan setelah shock
+        shocked_growth = (normal_growth * self.growth_multiplier + self.growth_shift)[:, np.newaxis]
+        shocked_growth = shocked_growth + self.component_inflation[:, components.driver_index]
+
+        # (skenario, komponen, tahun): growth dasar sampai shock mulai, lalu growth skenario
+        base_years = np.minimum(horizons, years_before)
+        growth = (1 + normal_growth) ** base_years * (1 + shocked_growth[:, :, np.newaxis]) ** (horizons - base_years)
+
+        # Faktor kurs per komponen (skenario, komponen), dasar vs shock
+        base_fx = components._fx_factors(exchange_rate, None, 1)[components.currency_index, 0, 0]
+        shocked_fx = components._fx_factors(exchange_rate * (1 + self.fx_shock), None, 1)[components.currency_index, 0, :].T
+        fx = np.where(active, shocked_fx[:, :, np.newaxis], base_fx[np.newaxis, :, np.newaxis])
+
+        # (skenario,) faktor emas dasar vs shock, dibroadcast ke tahun
+        base_gold = predictor._gold_adjustment_factor(gold_price)
+        shocked_gold = predictor._gold_adjustment_factor(gold_price * (1 + self.gold_shock))
+        gold = np.where(active[:, 0, :], shocked_gold[:, np.newaxis], base_gold)
+
+        weighted_growth = components.shares[np.newaxis, :, np.newaxis] * growth
+        trend = weighted_growth.sum(axis=1)
+        fx_effect = (weighted_growth * fx).sum(axis=1) / trend
+        base = np.full(trend.shape, float(predictor.calculate_base_cost()))
+        return base, gold, trend, fx_effect
+
+    def evaluate(self, predictor, years_ahead, gold_price: float = 2000,
+                 exchange_rate: float = 15000) -> np.ndarray:
+        """Biaya per skenario dan horizon, shape (skenario, tahun)
+
+        Biaya = biaya terkini x faktor emas (dengan batas pengaruh yang sama
+        seperti apply_gold_correlation) x trend x kurs, lihat _factors.
+        """
+        base, gold, trend, fx_effect = self._factors(predictor, years_ahead, gold_price, exchange_rate)
+        return base * gold * trend * fx_effect
+
+    def attribute(self, predictor, years_ahead, gold_price: float = 2000,
+                  exchange_rate: float = 15000) -> Dict[str, np.ndarray]:
+        """Atribusi biaya per skenario dan horizon ke biaya dasar, trend, emas, dan kurs
+
+        Faktor multiplikatif dipecah secara aditif dengan LMDI (log-mean Divisia):
+        kontribusi faktor f = L(biaya, dasar) x log f, dengan L rata-rata
+        logaritmik. Hasilnya eksak (base + trend + gold + fx = total), tidak
+        bergantung urutan faktor, dan tetap terdefinisi saat efek saling
+        meniadakan. Semua array berbentuk (skenario, tahun).
+        """
+        base, gold, trend, fx_effect = self._factors(predictor, years_ahead, gold_price, exchange_rate)
+        total = base * gold * trend * fx_effect
+
+        log_ratio = np.log(total / base)
+        safe_ratio = np.where(np.abs(log_ratio) > 1e-12, log_ratio, 1.0)
+        log_mean = np.where(np.abs(log_ratio) > 1e-12, (total - base) / safe_ratio, base)
+
+        return {
+            'total': total,
+            'base': base,
+            'trend': log_mean * np.log(trend),
+            'gold': log_mean * np.log(gold),
+            'fx': log_mean * np.log(fx_effect)
+        }
@@ -0,0 +1,166 @@
+"""Indeks vektor TF-IDF (char n-gram) untuk retrieval chunk knowledge base, disimpan & di-memory-map
+
+TF-IDF karakter n-gram (dalam batas kata) tahan terhadap imbuhan bahasa
+Indonesia (naik/kenaikan, biaya/pembiayaan) dan salah ketik ringan. Matriks
+dokumen dinormalisasi L2 sehingga cosine top-k cukup satu perkalian matriks
+sparse-vektor. Vectorizer dan matriks CSR disimpan per hash korpus di
+direktori artefak; proses berikutnya memuat matriks dengan memory-map
+(tanpa fit ulang), dan indeks yang sudah dimuat dibagikan ke semua sesi.
+"""
+import json
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .model_store import DEFAULT_ARTIFACT_DIR, data_hash
+
+# Naikkan jika parameter vectorizer atau format file berubah agar indeks lama diabaikan
+VECTOR_INDEX_VERSION = 1
+
+# Parameter vectorizer: n-gram karakter di dalam batas kata, tf sublinear
+NGRAM_RANGE = (3, 5)
+
+# Komponen CSR yang disimpan sebagai .npy terpisah (bisa di-memory-map)
+CSR_PARTS = ('data', 'indices', 'indptr')
+
+# Cache in-process: (nama, hash korpus) -> indeks
+_index_cache: Dict[tuple, 'TfidfVectorIndex'] = {}
+_index_lock = threading.Lock()
+
+
+class TfidfVectorIndex:
+    """Vectorizer TF-IDF + matriks dokumen (CSR, baris ternormalisasi L2) + id dokumen"""
+
+    def __init__(self, doc_ids: List[str], vectorizer, matrix):
+        self.doc_ids = list(doc_ids)
+        self.vectorizer = vectorizer
+        self.matrix = matrix
+        # Prefix file artefak (nama + hash korpus), diisi oleh load_or_build_index
+        self.prefix = None
+
+    @classmethod
+    def fit(cls, documents: Dict[str, str]) -> 'TfidfVectorIndex':
+        """Fit vectorizer pada seluruh chunk"""
+        # Import lazy: scikit-learn hanya dibutuhkan saat indeks harus di-fit ulang atau dimuat
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=NGRAM_RANGE, sublinear_tf=True,
+                                     lowercase=True, dtype=np.float32)
+        matrix = vectorizer.fit_transform(list(documents.values())).tocsr()
+        return cls(list(documents), vectorizer, matrix)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[str, float]]:
+        """Top-k (id dokumen, cosine) dengan skor > 0, terurut menurun"""
+        if top_k <= 0 or not self.doc_ids:
+            return []
+        query_vector = self.vectorizer.transform([query])
+        scores = (self.matrix @ query_vector.T).toarray().ravel()
+
+        candidates = np.flatnonzero(scores > 0)
+        if candidates.size > top_k:
+            candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.doc_ids[i], float(scores[i])) for i in ranked]
+
+    def save(self, directory: Path, prefix: str):
+        """Simpan vectorizer, komponen CSR, dan metadata; metadata ditulis terakhir sebagai penanda lengkap"""
+        directory.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+
+        def write(path: Path, writer):
+            tmp_path = path.with_name(path.name + suffix)
+            with open(tmp_path, 'wb') as f:
+                writer(f)
+            os.replace(tmp_path, path)
+
+        write(directory / f"{prefix}.vectorizer.pkl", lambda f: pickle.dump(self.vectorizer, f))
+        for part in CSR_PARTS:
+            write(directory / f"{prefix}.{part}.npy", lambda f, part=part: np.save(f, getattr(self.matrix, part)))
+        meta = {'doc_ids': self.doc_ids, 'shape': list(self.matrix.shape)}
+        write(directory / f"{prefix}.meta.json", lambda f: f.write(json.dumps(meta).encode('utf-8')))
+
+    @classmethod
+    def load(cls, directory: Path, prefix: str) -> 'TfidfVectorIndex':
+        """Muat indeks tersimpan; komponen CSR di-memory-map (read-only)
+
+        None jika file tidak lengkap atau tidak bisa dipakai (pickle terpotong,
+        versi scikit-learn/scipy berbeda, matriks tidak konsisten), sehingga
+        pemanggil cukup fit ulang.
+        """
+        from scipy.sparse import csr_matrix
+
+        try:
+            with open(directory / f"{prefix}.meta.json", encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(directory / f"{prefix}.vectorizer.pkl", 'rb') as f:
+                vectorizer = pickle.load(f)
+            parts = [np.load(directory / f"{prefix}.{part}.npy", mmap_mode='r') for part in CSR_PARTS]
+            matrix = csr_matrix(tuple(parts), shape=tuple(meta['shape']), copy=False)
+            index = cls(meta['doc_ids'], vectorizer, matrix)
+            # Vectorizer dari versi scikit-learn lain bisa ter-unpickle tetapi gagal saat transform
+            if index.vectorizer.transform(['']).shape[1] != matrix.shape[1] or len(index) != matrix.shape[0]:
+                return None
+        except Exception:  # Artefak rusak atau tidak kompatibel tidak boleh menggagalkan retrieval
+            return None
+        return index
+
+
+def prune_index_files(directory: Path, prefix: str):
+    """Hapus file indeks dengan prefix ini (mis. versi lama korpus yang sudah digantikan)
+
+    File yang sedang di-memory-map proses lain tetap bisa dibaca sampai
+    di-unmap (POSIX); di Windows penghapusan yang gagal dilewati. File
+    sementara milik penulis lain yang sedang menyimpan dibiarkan.
+    """
+    for path in directory.glob(f"{prefix}.*"):
+        if path.name.endswith('.tmp'):
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def load_or_build_index(name: str, documents: Dict[str, str], artifact_dir=None,
+                        persist: bool = True, replaces: str = None) -> TfidfVectorIndex:
+    """Indeks TF-IDF untuk korpus ini dari cache proses, disk (memory-map), atau fit baru
+
+    File diberi prefix hash korpus + versi, sehingga korpus yang berubah
+    otomatis memakai indeks baru tanpa menimpa indeks yang sedang di-map.
+    replaces: prefix indeks versi sebelumnya dari korpus yang sama (mis.
+    sebelum add_documents); indeks itu dibuang dari cache proses dan file-nya
+    dihapus setelah indeks baru siap. Korpus lain dengan nama yang sama tidak
+    tersentuh.
+    """
+    source_hash = data_hash({'documents': documents, 'version': VECTOR_INDEX_VERSION})
+    key = (name, source_hash)
+    directory = Path(artifact_dir or DEFAULT_ARTIFACT_DIR)
+    prefix = f"{name}.{source_hash[:16]}"
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is None:
+            index = TfidfVectorIndex.load(directory, prefix) if persist else None
+            if index is None:
+                index = TfidfVectorIndex.fit(documents)
+                if persist:
+                    try:
+                        index.save(directory, prefix)
+                    except OSError:
+                        pass  # Direktori tidak bisa ditulis: indeks tetap dipakai dari memori
+            index.prefix = prefix
+            _index_cache[key] = index
+
+        if replaces is not None and replaces != prefix:
+            for stale_key in [cached for cached in _index_cache
+                              if cached[0] == name and f"{name}.{cached[1][:16]}" == replaces]:
+                del _index_cache[stale_key]
+            if persist:
+                prune_index_files(directory, replaces)
+        return index
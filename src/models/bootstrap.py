@@ -0,0 +1,155 @@
+"""Interval prediksi bootstrap (residual / block bootstrap) untuk model zoo
+
+Setiap resample membangun deret sintetis lewat ForecastModel.simulate dengan
+residual yang diambil ulang, fit ulang model, menskalakan forecast-nya ke
+level terakhir yang teramati (untuk model yang anchored_on_last), lalu
+menambahkan residual masa depan. Dengan begitu ketidakpastian parameter maupun error
+masa depan ikut masuk ke interval.
+
+Residual pada langkah perpindahan regime hasil deteksi changepoint (mis. 2023)
+tidak ikut diambil ulang: interval berlaku dengan asumsi tidak ada lonjakan
+regime baru, konsisten dengan cara model memperlakukan lonjakan.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable
+
+import numpy as np
+
+try:
+    from ..core.model_store import data_hash, load_or_build
+except ImportError:  # src ada di sys.path dan core/models diimpor sebagai paket top-level (app.py)
+    from core.model_store import data_hash, load_or_build
+from .changepoint import detect_regimes
+from .forecasting import MODEL_ZOO, annual_series, create_model
+
+# Versi struktur hasil bootstrap di artefak; naikkan jika metodologi berubah
+BOOTSTRAP_ARTIFACT_VERSION = 3
+
+# Di bawah jumlah residual ini ekor distribusi error belum teramati, sehingga
+# within_tolerance (mis. 100% untuk horizon 1) hanya bersifat indikatif
+MIN_CONFIDENCE_RESIDUALS = 12
+
+# Resample dibagi ke chunk berukuran tetap dengan seed turunan masing-masing,
+# sehingga hasil identik berapa pun jumlah worker-nya
+CHUNK_SIZE = 250
+
+
+def _resample_residuals(pool: np.ndarray, size: int, block_length: int, rng: np.random.Generator) -> np.ndarray:
+    """Ambil ulang residual dengan moving-block bootstrap (block_length=1: residual bootstrap biasa)"""
+    block_length = max(1, min(block_length, pool.size))
+    n_blocks = -(-size // block_length)
+    starts = rng.integers(0, pool.size - block_length + 1, size=n_blocks)
+    indices = (starts[:, np.newaxis] + np.arange(block_length)).ravel()[:size]
+    return pool[indices]
+
+
+def _residual_pool(model, values: np.ndarray) -> np.ndarray:
+    """Residual model ter-fit tanpa langkah perpindahan regime, di-center ke mean nol"""
+    pool = model.residuals()[~detect_regimes(np.arange(len(values)), values)['shift_steps']]
+    if pool.size == 0:
+        pool = np.zeros(1)
+    return pool - pool.mean()
+
+
+def _bootstrap_chunk(model_name: str, values: np.ndarray, horizon: int, n_resamples: int,
+                     seed: np.random.SeedSequence, block_length: int) -> np.ndarray:
+    """Jalankan sejumlah resample bootstrap, hasil forecast sintetis shape (n_resamples, horizon)"""
+    rng = np.random.default_rng(seed)
+    model = create_model(model_name).fit(values)
+    pool = _residual_pool(model, values)
+
+    n_steps = len(values) - 1
+    forecasts = np.empty((n_resamples, horizon))
+    for i in range(n_resamples):
+        sampled = _resample_residuals(pool, n_steps + horizon, block_length, rng)
+        synthetic = model.simulate(sampled[:n_steps])
+        point = create_model(model_name).fit(synthetic).predict(horizon)
+        if model.anchored_on_last:
+            # Kondisikan pada level terakhir yang teramati, bukan level sintetis
+            point = point * (values[-1] / synthetic[-1])
+        forecasts[i] = point * np.exp(np.cumsum(sampled[n_steps:]))
+
+    return forecasts
+
+
+def bootstrap_forecasts(values: np.ndarray, model_name: str = 'compound_growth', horizon: int = 5,
+                        n_resamples: int = 2000, block_length: int = 1, seed: int = 0,
+                        max_workers: int = None) -> np.ndarray:
+    """Forecast bootstrap untuk satu deret, shape (n_resamples, horizon)
+
+    Resample dibagi per chunk ke process pool (max_workers=1 untuk berurutan)
+    dengan SeedSequence turunan yang deterministik per chunk.
+    """
+    n_chunks = -(-n_resamples // CHUNK_SIZE)
+    sizes = [min(CHUNK_SIZE, n_resamples - i * CHUNK_SIZE) for i in range(n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    tasks = [(model_name, values, horizon, size, chunk_seed, block_length) for size, chunk_seed in zip(sizes, seeds)]
+
+    if max_workers == 1 or n_chunks == 1:
+        chunks = [_bootstrap_chunk(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunks = list(executor.map(_bootstrap_chunk, *zip(*tasks)))
+
+    return np.concatenate(chunks)
+
+
+def summarize_bootstrap(point: np.ndarray, samples: np.ndarray, level: float = 0.9,
+                        tolerance: float = 0.1, n_residuals: int = None) -> Dict[str, list]:
+    """Ringkas sampel bootstrap: interval persentil, median, dan peluang dalam toleransi
+
+    n_residuals (ukuran pool residual) ikut disimpan; within_tolerance hanya
+    andal jika pool berisi minimal MIN_CONFIDENCE_RESIDUALS residual.
+    """
+    tail = (1 - level) / 2 * 100
+    lower, median, upper = np.percentile(samples, [tail, 50, 100 - tail], axis=0)
+    within = (np.abs(samples / point - 1) <= tolerance).mean(axis=0)
+
+    return {
+        'point': point.tolist(),
+        'lower': lower.tolist(),
+        'median': median.tolist(),
+        'upper': upper.tolist(),
+        'within_tolerance': within.tolist(),
+        'n_residuals': n_residuals,
+        'reliable': n_residuals is not None and n_residuals >= MIN_CONFIDENCE_RESIDUALS
+    }
+
+
+def bootstrap_intervals(historical_data: Dict[int, Dict], series_key: str = 'average',
+                        model_names: Iterable[str] = None, horizon: int = 5, n_resamples: int = 2000,
+                        level: float = 0.9, tolerance: float = 0.1, block_length: int = 1,
+                        seed: int = 0, max_workers: int = None, persist: bool = True) -> Dict[str, Dict]:
+    """Interval prediksi bootstrap per model untuk satu deret, di-cache per versi data & parameter
+
+    Hasil: {model: {'point', 'lower', 'median', 'upper', 'within_tolerance'}}
+    dengan list sepanjang horizon. within_tolerance adalah peluang bootstrap
+    bahwa nilai aktual berada dalam ±tolerance dari forecast titik; 'n_residuals'
+    dan 'reliable' menandai apakah pool residual cukup besar untuk angka itu.
+    """
+    model_names = list(model_names or MODEL_ZOO)
+    params = {
+        'series_key': series_key, 'models': model_names, 'horizon': horizon, 'n_resamples': n_resamples,
+        'level': level, 'tolerance': tolerance, 'block_length': block_length, 'seed': seed
+    }
+
+    def build():
+        _, values, _ = annual_series(historical_data, series_key)
+        intervals = {}
+        for model_name in model_names:
+            model = create_model(model_name).fit(values)
+            point = model.predict(horizon)
+            samples = bootstrap_forecasts(values, model_name, horizon, n_resamples, block_length, seed, max_workers)
+            n_residuals = int((~detect_regimes(np.arange(len(values)), values)['shift_steps']).sum())
+            intervals[model_name] = summarize_bootstrap(point, samples, level, tolerance, n_residuals)
+        return intervals
+
+    # Satu file artefak per kombinasi parameter, agar pemanggil dengan horizon/model
+    # berbeda (tabel forecast, prediksi multi-tahun, BuiltinPredictor) tidak saling menimpa
+    return load_or_build(
+        f"bootstrap_{series_key}_{data_hash(params)[:12]}",
+        {'data': historical_data, 'params': params},
+        build,
+        version=BOOTSTRAP_ARTIFACT_VERSION,
+        persist=persist
+    )
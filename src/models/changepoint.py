@@ -0,0 +1,216 @@
+"""Deteksi changepoint (PELT) untuk melabeli regime deret biaya secara otomatis
+
+Deret dimodelkan sebagai trend log-linear per segmen (piecewise linear pada
+skala log) dengan varians noise masing-masing, sehingga lonjakan seperti 2023
+menjadi batas regime tanpa ambang growth atau daftar tahun yang diisi manual.
+Segmen di bawah MIN_TREND_POINTS titik hanya dimodelkan sebagai level: dua titik
+selalu pas sempurna dengan garis, sehingga slope bebas akan menyerap lonjakan
+tanpa biaya. Dengan begitu lonjakan di tahun terbaru pun terdeteksi sebagai
+regime satu titik di tahun yang benar.
+Biaya segmen dihitung O(1) dari prefix sum dan solusi optimal dicari dengan
+DP eksak atas semua titik awal segmen (O(n^2) evaluasi biaya, tervektorisasi
+per titik akhir). Pruning PELT (Killick dkk., 2012) tidak dipakai: biaya
+campuran level/trend tidak superaditif, sehingga pruning dengan K=0 bisa
+membuang kandidat yang kelak optimal.
+"""
+from functools import lru_cache
+from typing import Dict, Sequence
+
+import numpy as np
+
+# Parameter per segmen untuk penalti BIC: intercept, slope, varians, dan lokasi changepoint
+SEGMENT_PARAMETERS = 4
+
+# Minimal titik agar slope trend segmen diestimasi; segmen lebih pendek hanya memakai level
+MIN_TREND_POINTS = 3
+
+# Regime dengan titik lebih sedikit dari ini belum bisa memverifikasi trend-nya;
+# langkah di dalamnya tidak dihitung sebagai growth normal
+CONFIRMED_REGIME_POINTS = 3
+
+# Deret sampai panjang ini dihitung dengan matriks biaya penuh sekali jalan (tanpa pruning),
+# lebih cepat untuk deret tahunan pendek yang dievaluasi berulang (mis. bootstrap)
+DENSE_MAX_POINTS = 64
+
+# Konstanta konsistensi MAD untuk distribusi normal
+MAD_SCALE = 0.6745
+
+# Lantai std noise (skala log, ~0.5%): deret yang sangat mulus tidak dipecah hanya karena
+# lengkung kecil (mis. deret linear di skala log) yang tak bisa diikuti satu garis
+NOISE_FLOOR = 0.005
+
+
+class SegmentCost:
+    """Residual sum of squares untuk segmen [start, end) dari prefix sum
+
+    Trend linear untuk segmen minimal MIN_TREND_POINTS titik, level (mean) untuk segmen lebih pendek.
+    """
+
+    def __init__(self, t: np.ndarray, y: np.ndarray):
+        # Geser ke titik awal agar prefix sum tidak kehilangan presisi
+        t = t - t[0]
+        y = y - y[0]
+        stacked = np.stack([np.ones_like(t), t, t * t, y, y * y, t * y])
+        self._prefix = np.concatenate([np.zeros((6, 1)), np.cumsum(stacked, axis=1)], axis=1)
+
+    def __call__(self, start, end) -> np.ndarray:
+        """RSS untuk segmen start sampai end (eksklusif); keduanya skalar atau array yang di-broadcast"""
+        start, end = np.broadcast_arrays(start, end)
+        n, st, stt, sy, syy, sty = self._prefix[:, end] - self._prefix[:, start]
+        sxx = stt - st * st / n
+        sxy = sty - st * sy / n
+        rss = syy - sy * sy / n
+        slope_gain = np.divide(sxy * sxy, sxx, out=np.zeros_like(sxy), where=(sxx > 1e-12) & (n >= MIN_TREND_POINTS))
+        return np.maximum(rss - slope_gain, 0.0)
+
+
+def estimate_noise(t: np.ndarray, y: np.ndarray) -> float:
+    """Estimasi robust std noise di sekitar trend dari MAD selisih growth berurutan"""
+    if len(y) < 3:
+        return 0.0
+    # Untuk trend + noise iid, selisih growth berurutan punya std sigma * sqrt(6)
+    second = np.abs(np.diff(np.diff(y) / np.diff(t)))
+    second.sort()
+    median = (second[(len(second) - 1) // 2] + second[len(second) // 2]) / 2
+    return float(median / MAD_SCALE / np.sqrt(6))
+
+
+@lru_cache(maxsize=128)
+def _segment_pairs(n: int, min_size: int):
+    """Semua pasangan (awal, akhir) segmen dengan panjang minimal min_size"""
+    return np.triu_indices(n + 1, k=min_size)
+
+
+def pelt(t: Sequence[float], y: Sequence[float], penalty: float = None, min_size: int = 1) -> list:
+    """Changepoint optimal eksak (penalized negative log-likelihood) dengan objektif PELT
+
+    t: posisi waktu (boleh berjarak tidak rata), y: nilai (mis. log biaya).
+    Biaya segmen adalah -2 log-likelihood normal dengan varians RSS / n per
+    segmen, dibatasi bawah oleh estimasi noise global (minimal NOISE_FLOOR)
+    agar segmen pendek yang pas sempurna tidak mendominasi. Penalti default
+    BIC: SEGMENT_PARAMETERS * log(n). Hasil berupa indeks awal setiap regime
+    baru (tanpa 0).
+    """
+    t = np.asarray(t, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n < 2 * min_size:
+        return []
+
+    noise = estimate_noise(t, y)
+    variance_floor = max(noise, NOISE_FLOOR) ** 2
+    if penalty is None:
+        penalty = SEGMENT_PARAMETERS * np.log(n)
+
+    rss = SegmentCost(t, y)
+
+    def segment_cost(start, end):
+        # -2 log-likelihood profil (tanpa konstanta): varians = max(RSS / n, lantai)
+        length = end - start
+        residual = rss(start, end)
+        variance = np.maximum(residual / length, variance_floor)
+        return length * np.log(variance) + residual / variance
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=np.intp)
+
+    if n <= DENSE_MAX_POINTS:
+        # Semua pasangan (awal, akhir) sekaligus, lalu DP biasa per titik akhir
+        start, end = _segment_pairs(n, min_size)
+        costs = np.full((n + 1, n + 1), np.inf)
+        costs[start, end] = segment_cost(start, end)
+        # Loop Python murni atas list: untuk n kecil jauh lebih murah dari operasi numpy per langkah
+        columns = costs.T.tolist()
+        best = best.tolist()
+        for end in range(min_size, n + 1):
+            column = columns[end]
+            totals = [best[s] + column[s] for s in range(end - min_size + 1)]
+            previous[end] = min(range(len(totals)), key=totals.__getitem__)
+            best[end] = totals[previous[end]] + penalty
+        return _backtrack(previous, n)
+
+    # Deret panjang: biaya semua titik awal untuk satu titik akhir sekaligus (memori O(n))
+    for end in range(min_size, n + 1):
+        admissible = np.arange(end - min_size + 1)
+        totals = best[admissible] + segment_cost(admissible, end)
+        choice = int(np.argmin(totals))
+        best[end] = totals[choice] + penalty
+        previous[end] = choice
+
+    return _backtrack(previous, n)
+
+
+def _backtrack(previous: np.ndarray, n: int) -> list:
+    """Rekonstruksi changepoint dari pointer awal segmen terakhir"""
+    changepoints = []
+    end = previous[n]
+    while end > 0:
+        changepoints.append(int(end))
+        end = previous[end]
+    return changepoints[::-1]
+
+
+def detect_regimes(years: Sequence[float], values: Sequence[float], penalty: float = None,
+                   min_size: int = 1) -> Dict[str, object]:
+    """Deteksi dan label regime untuk deret tahunan/bulanan (tahun boleh ada yang kosong)
+
+    Lihat describe_regimes untuk isi hasilnya.
+    """
+    values = np.asarray(values, dtype=float)
+    changepoints = pelt(years, np.log(values), penalty, min_size) if len(values) else []
+    return describe_regimes(years, changepoints)
+
+
+def describe_regimes(years: Sequence[float], changepoints: Sequence[int]) -> Dict[str, object]:
+    """Label regime dari daftar changepoint (mis. hasil pelt yang disimpan di artefak)
+
+    Hasil:
+    - changepoints: indeks awal tiap regime baru
+    - labels: nomor regime per observasi
+    - regime_starts: tahun awal tiap regime, current_start: awal regime terkini
+    - shift_steps: mask langkah i -> i+1 yang melintasi batas regime
+    - normal_steps: mask langkah di dalam regime yang sudah terkonfirmasi
+      (minimal CONFIRMED_REGIME_POINTS titik)
+    - current_steps: normal_steps yang berada di regime terkini (kosong selama
+      regime terkini belum terkonfirmasi); dasar proyeksi growth
+    """
+    years = np.asarray(years, dtype=float)
+    changepoints = [int(index) for index in changepoints]
+
+    labels = np.zeros(len(years), dtype=int)
+    for index in changepoints:
+        labels[index:] += 1
+    regime_size = np.bincount(labels)[labels] if len(years) else labels
+    shift_steps = np.diff(labels) > 0
+    normal_steps = ~shift_steps & (regime_size[1:] >= CONFIRMED_REGIME_POINTS)
+    current_steps = normal_steps & (labels[1:] == labels[-1]) if len(years) else normal_steps
+    starts = [0] + changepoints
+
+    return {
+        'changepoints': changepoints,
+        'labels': labels,
+        'regime_starts': [years[i].item() for i in starts] if len(years) else [],
+        'current_start': years[starts[-1]].item() if len(years) else None,
+        'shift_steps': shift_steps,
+        'normal_steps': normal_steps,
+        'current_steps': current_steps
+    }
+
+
+def growth_steps(regimes: Dict[str, object]) -> np.ndarray:
+    """Mask langkah dasar proyeksi growth
+
+    Langkah normal regime terkini jika regime itu sudah terkonfirmasi; selain
+    itu (regime terkini masih terlalu pendek) seluruh langkah normal.
+    """
+    current = regimes['current_steps']
+    return current if current.any() else regimes['normal_steps']
+
+
+def normal_step_mask(values: Sequence[float], years: Sequence[float] = None) -> np.ndarray:
+    """Mask langkah (panjang n-1) yang termasuk growth normal di dalam regime"""
+    values = np.asarray(values, dtype=float)
+    if years is None:
+        years = np.arange(len(values))
+    return detect_regimes(years, values)['normal_steps']
@@ -0,0 +1,72 @@
+"""Stacking bobot ensemble (non-negatif, berjumlah 1) dari error out-of-sample
+
+Kandidat bobot berupa grid reguler pada simplex; setiap kandidat dinilai
+dengan mean squared relative error terhadap forecast rolling-origin yang
+sudah diketahui nilai aktualnya. Grid berukuran biasa (mis. 1.326 kandidat
+untuk tiga anggota) dinilai dalam satu perkalian matriks di proses ini; hanya
+grid yang sangat besar dibagi per chunk ke process pool. Kandidat terbaik
+(tie: urutan grid) dipilih sehingga hasilnya deterministik berapa pun jumlah
+worker-nya.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import Dict
+
+import numpy as np
+
+# Resolusi grid simplex: bobot kelipatan 1 / GRID_RESOLUTION
+GRID_RESOLUTION = 50
+
+# Batas sel (kandidat x forecast) satu perkalian matriks; di atasnya kandidat dibagi per chunk
+# sebesar ini dan dinilai di process pool (biaya start worker baru sepadan untuk grid sebesar itu)
+PARALLEL_MIN_CELLS = 5_000_000
+
+
+def simplex_grid(n_members: int, resolution: int = GRID_RESOLUTION) -> np.ndarray:
+    """Semua bobot non-negatif berjumlah 1 dengan kelipatan 1 / resolution, shape (kandidat, anggota)
+
+    Dibangun dengan stars-and-bars: posisi n_members - 1 pembatas di antara
+    resolution + n_members - 1 slot.
+    """
+    slots = resolution + n_members - 1
+    bars = np.array(list(combinations(range(slots), n_members - 1)), dtype=int).reshape(-1, n_members - 1)
+    edges = np.hstack([np.full((len(bars), 1), -1), bars, np.full((len(bars), 1), slots)])
+    return (np.diff(edges, axis=1) - 1) / resolution
+
+
+def _score_candidates(weights: np.ndarray, forecasts: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """Mean squared relative error tiap kandidat bobot (satu perkalian matriks untuk semua kandidat)"""
+    relative = forecasts / actual[:, np.newaxis]
+    errors = relative @ weights.T - 1
+    return (errors ** 2).mean(axis=0)
+
+
+def learn_ensemble_weights(forecasts: np.ndarray, actual: np.ndarray, resolution: int = GRID_RESOLUTION,
+                           max_workers: int = None) -> Dict[str, object]:
+    """Bobot ensemble terbaik untuk forecast anggota (n_forecast x anggota) terhadap nilai aktual
+
+    Kandidat grid simplex dinilai sekaligus di proses ini, atau paralel per
+    chunk jika melebihi PARALLEL_MIN_CELLS (max_workers=1 untuk berurutan).
+    Hasil: 'weights' (list), 'mse' kandidat terbaik, dan
+    'n_forecasts' yang dipakai.
+    """
+    forecasts = np.asarray(forecasts, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    candidates = simplex_grid(forecasts.shape[1], resolution)
+    chunk_size = max(1, PARALLEL_MIN_CELLS // max(len(actual), 1))
+    chunks = [candidates[start:start + chunk_size] for start in range(0, len(candidates), chunk_size)]
+
+    if max_workers == 1 or len(chunks) == 1:
+        scores = [_score_candidates(chunk, forecasts, actual) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            scores = list(executor.map(_score_candidates, chunks,
+                                       [forecasts] * len(chunks), [actual] * len(chunks)))
+
+    scores = np.concatenate(scores)
+    best = int(np.argmin(scores))
+    return {
+        'weights': candidates[best].tolist(),
+        'mse': float(scores[best]),
+        'n_forecasts': int(len(actual))
+    }
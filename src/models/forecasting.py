@@ -0,0 +1,235 @@
+"""Model forecasting deret tahunan biaya haji (implementasi NumPy)
+
+Semua model bekerja pada skala log sehingga trend bersifat multiplikatif
+(growth persentase), sama seperti compound growth di HajjCostPredictor.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .changepoint import detect_regimes, growth_steps
+
+
+def annual_series(historical_data: Dict[int, Dict], key: str = 'average') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Ambil deret tahunan berjarak rata; tahun kosong (mis. 2021) diisi interpolasi log-linear
+
+    Hasil: (tahun, nilai, observed) dengan observed False untuk tahun hasil
+    interpolasi, yang tidak boleh dipakai sebagai target evaluasi.
+    """
+    known_years = np.array(sorted(year for year, data in historical_data.items() if key in data))
+    known_values = np.array([historical_data[year][key] for year in known_years], dtype=float)
+
+    years = np.arange(known_years[0], known_years[-1] + 1)
+    values = np.exp(np.interp(years, known_years, np.log(known_values)))
+    return years, values, np.isin(years, known_years)
+
+
+class ForecastModel:
+    """Interface model forecasting: fit(values) lalu predict(horizon)"""
+
+    name = 'base'
+
+    # Forecast bergantung pada level terakhir (random walk / state-space);
+    # bootstrap menskalakan forecast resample ke level terakhir yang teramati
+    anchored_on_last = True
+
+    def fit(self, values: np.ndarray) -> 'ForecastModel':
+        raise NotImplementedError
+
+    def predict(self, horizon: int) -> np.ndarray:
+        """Prediksi horizon tahun ke depan, shape (horizon,)"""
+        raise NotImplementedError
+
+    def fitted_values(self) -> np.ndarray:
+        """Prediksi satu-langkah in-sample untuk observasi ke-1..n-1, shape (n-1,)"""
+        raise NotImplementedError
+
+    def residuals(self) -> np.ndarray:
+        """Residual log satu-langkah in-sample"""
+        return np.log(self._values[1:]) - np.log(self.fitted_values())
+
+    def simulate(self, errors: np.ndarray) -> np.ndarray:
+        """Deret sintetis dari model ter-fit dengan error log satu-langkah errors (panjang n-1)
+
+        Default: rekursif dari growth satu-langkah yang diimplikasikan model.
+        """
+        step_growth = np.log(self.fitted_values()) - np.log(self._values[:-1])
+        return self._values[0] * np.exp(np.concatenate([[0.0], np.cumsum(step_growth + errors)]))
+
+
+class CompoundGrowthModel(ForecastModel):
+    """Compound growth dari rata-rata growth regime terkini (baseline HajjCostPredictor)"""
+
+    name = 'compound_growth'
+
+    def fit(self, values):
+        self._values = np.asarray(values, dtype=float)
+        growth = self._values[1:] / self._values[:-1] - 1
+        normal = growth[growth_steps(detect_regimes(np.arange(len(self._values)), self._values))]
+        self.growth = normal.mean() if normal.size else 0.03
+        return self
+
+    def predict(self, horizon):
+        return self._values[-1] * (1 + self.growth) ** np.arange(1, horizon + 1)
+
+    def fitted_values(self):
+        return self._values[:-1] * (1 + self.growth)
+
+
+class LogLinearTrendModel(ForecastModel):
+    """Trend log-linear: log(y) = a + b*t (growth konstan exp(b)-1)"""
+
+    name = 'log_linear'
+    anchored_on_last = False
+
+    def fit(self, values):
+        self._values = np.asarray(values, dtype=float)
+        self._t = np.arange(len(self._values))
+        self.slope, self.intercept = np.polyfit(self._t, np.log(self._values), 1)
+        return self
+
+    def predict(self, horizon):
+        t = len(self._values) - 1 + np.arange(1, horizon + 1)
+        return np.exp(self.intercept + self.slope * t)
+
+    def fitted_values(self):
+        return np.exp(self.intercept + self.slope * self._t[1:])
+
+    def simulate(self, errors):
+        return np.concatenate([self._values[:1], self.fitted_values() * np.exp(errors)])
+
+
+class HoltModel(ForecastModel):
+    """Holt linear exponential smoothing (opsional damped trend) pada skala log
+
+    Parameter alpha, beta (dan phi) dipilih dengan grid search SSE satu-langkah;
+    rekursi dijalankan serentak untuk seluruh grid sebagai operasi array.
+    """
+
+    ALPHA_GRID = np.linspace(0.05, 0.95, 19)
+    BETA_GRID = np.linspace(0.05, 0.95, 19)
+    PHI_GRID = np.linspace(0.80, 0.98, 10)
+
+    def __init__(self, damped: bool = False):
+        self.damped = damped
+        self.name = 'holt_damped' if damped else 'holt'
+
+    def _run(self, log_values, alpha, beta, phi):
+        """Rekursi bentuk error-correction untuk vektor parameter, kembalikan prediksi satu-langkah"""
+        level = np.full(alpha.shape, log_values[0])
+        trend = np.full(alpha.shape, log_values[1] - log_values[0] if len(log_values) > 1 else 0.0)
+        forecasts = np.empty((len(log_values) - 1,) + alpha.shape)
+
+        for t in range(1, len(log_values)):
+            forecast = level + phi * trend
+            forecasts[t - 1] = forecast
+            error = log_values[t] - forecast
+            level = forecast + alpha * error
+            trend = phi * trend + alpha * beta * error
+
+        return forecasts, level, trend
+
+    def fit(self, values):
+        self._values = np.asarray(values, dtype=float)
+        log_values = np.log(self._values)
+
+        phis = self.PHI_GRID if self.damped else np.array([1.0])
+        alpha, beta, phi = (grid.ravel() for grid in np.meshgrid(self.ALPHA_GRID, self.BETA_GRID, phis))
+
+        forecasts, _, _ = self._run(log_values, alpha, beta, phi)
+        sse = ((log_values[1:, np.newaxis] - forecasts) ** 2).sum(axis=0)
+        best = int(np.argmin(sse))
+
+        self.alpha, self.beta, self.phi = float(alpha[best]), float(beta[best]), float(phi[best])
+        forecasts, level, trend = self._run(log_values, *(np.array([p]) for p in (self.alpha, self.beta, self.phi)))
+        self._fitted = np.exp(forecasts[:, 0])
+        self.level, self.trend = float(level[0]), float(trend[0])
+        return self
+
+    def predict(self, horizon):
+        # Akumulasi trend teredam: sum_{i=1..h} phi^i
+        damping = np.cumsum(self.phi ** np.arange(1, horizon + 1))
+        return np.exp(self.level + damping * self.trend)
+
+    def fitted_values(self):
+        return self._fitted
+
+    def simulate(self, errors):
+        log_values = np.log(self._values)
+        level = log_values[0]
+        trend = log_values[1] - log_values[0] if len(log_values) > 1 else 0.0
+        path = np.empty(len(errors) + 1)
+        path[0] = level
+
+        for t, error in enumerate(errors, start=1):
+            forecast = level + self.phi * trend
+            path[t] = forecast + error
+            level = forecast + self.alpha * error
+            trend = self.phi * trend + self.alpha * self.beta * error
+
+        return np.exp(path)
+
+
+class DampedHoltModel(HoltModel):
+    """Holt dengan damped trend (phi < 1), trend melandai untuk horizon panjang"""
+
+    def __init__(self):
+        super().__init__(damped=True)
+
+
+class RegimeSwitchingModel(ForecastModel):
+    """Model level-shift sederhana: lonjakan besar memindahkan deret ke regime baru
+
+    Batas regime dideteksi otomatis (PELT, lihat models.changepoint); langkah
+    yang melintasi batas dianggap perpindahan regime (tidak diproyeksikan
+    berulang). Drift regime terkini di-shrink ke drift gabungan semua regime
+    dengan bobot PRIOR_WEIGHT observasi semu, sehingga regime yang masih pendek
+    tidak mendominasi forecast.
+    """
+
+    name = 'regime_switching'
+    PRIOR_WEIGHT = 2.0
+
+    def fit(self, values):
+        self._values = np.asarray(values, dtype=float)
+        log_diff = np.diff(np.log(self._values))
+        self.shift_mask = detect_regimes(np.arange(len(self._values)), self._values)['shift_steps']
+
+        # Label regime per langkah: bertambah satu setiap kali terjadi lonjakan
+        regime = np.cumsum(self.shift_mask)
+        within = ~self.shift_mask
+        pooled_drift = log_diff[within].mean() if within.any() else 0.0
+
+        current = within & (regime == regime[-1]) if log_diff.size else within
+        n_current = current.sum()
+        current_sum = log_diff[current].sum()
+        self.drift = float((current_sum + self.PRIOR_WEIGHT * pooled_drift) / (n_current + self.PRIOR_WEIGHT))
+
+        # Drift per langkah in-sample: shrinkage yang sama, dihitung per regime
+        regime_sum = np.bincount(regime[within], weights=log_diff[within], minlength=regime.max() + 1 if regime.size else 1)
+        regime_count = np.bincount(regime[within], minlength=regime_sum.size)
+        self._step_drift = ((regime_sum + self.PRIOR_WEIGHT * pooled_drift) / (regime_count + self.PRIOR_WEIGHT))[regime]
+        return self
+
+    def predict(self, horizon):
+        return self._values[-1] * np.exp(self.drift * np.arange(1, horizon + 1))
+
+    def fitted_values(self):
+        return self._values[:-1] * np.exp(self._step_drift)
+
+
+# Registry model: nama -> class; worker process cukup menerima nama model
+MODEL_ZOO = {
+    'compound_growth': CompoundGrowthModel,
+    'log_linear': LogLinearTrendModel,
+    'holt': HoltModel,
+    'holt_damped': DampedHoltModel,
+    'regime_switching': RegimeSwitchingModel,
+}
+
+
+def create_model(name: str) -> ForecastModel:
+    """Buat instance model dari registry MODEL_ZOO"""
+    if name not in MODEL_ZOO:
+        raise ValueError(f"Model tidak dikenal: {name}. Pilihan: {', '.join(MODEL_ZOO)}")
+    return MODEL_ZOO[name]()
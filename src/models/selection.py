@@ -0,0 +1,117 @@
+"""Seleksi model forecasting secara paralel dengan cache pemenang per embarkasi"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable
+
+import numpy as np
+
+try:
+    from ..core.model_store import data_hash, load_or_build
+except ImportError:  # src ada di sys.path dan core/models diimpor sebagai paket top-level (app.py)
+    from core.model_store import data_hash, load_or_build
+from .forecasting import MODEL_ZOO, ForecastModel, annual_series, create_model
+
+# Versi struktur hasil seleksi di artefak; naikkan jika format/metodologi berubah
+SELECTION_ARTIFACT_VERSION = 3
+
+# Cache in-process model pemenang yang sudah di-fit: (hash data, deret) -> model
+_fitted_cache: Dict[tuple, ForecastModel] = {}
+
+
+def series_keys_for(historical_data: Dict[int, Dict]) -> list:
+    """Deret yang tersedia: rata-rata nasional lalu setiap embarkasi"""
+    keys = ['average']
+    for data in historical_data.values():
+        for key in data:
+            if key not in ('year_hijri', 'average') and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def score_model(model_name: str, values: np.ndarray, horizon: int = 3, min_train: int = 4,
+                observed: np.ndarray = None) -> Dict[str, float]:
+    """Skor rolling-origin satu model pada satu deret: MAPE (%) forecast 1..horizon langkah
+
+    observed menandai tahun yang benar-benar teramati (lihat annual_series);
+    tahun hasil interpolasi tetap dipakai sebagai data latih, tetapi tidak
+    dinilai sebagai target.
+    """
+    start = time.perf_counter()
+    if observed is None:
+        observed = np.ones(len(values), dtype=bool)
+    errors = []
+
+    for origin in range(min_train, len(values)):
+        steps = min(horizon, len(values) - origin)
+        targets = observed[origin:origin + steps]
+        if not targets.any():
+            continue
+        forecast = create_model(model_name).fit(values[:origin]).predict(steps)
+        actual = values[origin:origin + steps]
+        errors.append((np.abs(forecast - actual) / actual)[targets])
+
+    errors = np.concatenate(errors) if errors else np.array([])
+    return {
+        'mape': float(errors.mean() * 100) if errors.size else float('nan'),
+        'n_forecasts': int(errors.size),
+        'wall_time': time.perf_counter() - start
+    }
+
+
+def _score_task(series_key: str, model_name: str, values: np.ndarray, observed: np.ndarray,
+                horizon: int, min_train: int):
+    """Unit kerja untuk process pool"""
+    return series_key, model_name, score_model(model_name, values, horizon, min_train, observed)
+
+
+def select_models(historical_data: Dict[int, Dict], series_keys: Iterable[str] = None,
+                  model_names: Iterable[str] = None, horizon: int = 3, min_train: int = 4,
+                  max_workers: int = None) -> Dict[str, Dict]:
+    """Fit & skor semua kandidat model untuk tiap deret secara paralel, pilih MAPE terendah
+
+    Kombinasi deret x model dijalankan di process pool (max_workers=1 untuk
+    berurutan). Hasil: {deret: {'model': nama_pemenang, 'scores': {nama: skor}}}.
+    """
+    series_keys = list(series_keys or series_keys_for(historical_data))
+    model_names = list(model_names or MODEL_ZOO)
+
+    series = {key: annual_series(historical_data, key)[1:] for key in series_keys}
+    tasks = [(key, name, *series[key], horizon, min_train) for key in series_keys for name in model_names]
+
+    if max_workers == 1:
+        results = [_score_task(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_score_task, *zip(*tasks)))
+
+    selection = {key: {'model': None, 'scores': {}} for key in series_keys}
+    for series_key, model_name, score in results:
+        selection[series_key]['scores'][model_name] = score
+
+    for entry in selection.values():
+        ranked = [(score['mape'], name) for name, score in entry['scores'].items() if not np.isnan(score['mape'])]
+        entry['model'] = min(ranked)[1] if ranked else 'compound_growth'
+
+    return selection
+
+
+def get_model_selection(historical_data: Dict[int, Dict], max_workers: int = None) -> Dict[str, Dict]:
+    """Hasil seleksi model per deret, dihitung sekali per versi data lalu disimpan sebagai artefak"""
+    return load_or_build(
+        'model_selection',
+        historical_data,
+        lambda: select_models(historical_data, max_workers=max_workers),
+        version=SELECTION_ARTIFACT_VERSION
+    )
+
+
+def get_best_model(historical_data: Dict[int, Dict], series_key: str = 'average') -> ForecastModel:
+    """Model pemenang untuk satu deret, sudah di-fit pada seluruh data (di-cache per versi data)"""
+    key = (data_hash(historical_data), series_key)
+    if key not in _fitted_cache:
+        selection = get_model_selection(historical_data)
+        if series_key not in selection:
+            raise ValueError(f"Deret tidak dikenal: {series_key}")
+        _, values, _ = annual_series(historical_data, series_key)
+        _fitted_cache[key] = create_model(selection[series_key]['model']).fit(values)
+    return _fitted_cache[key]
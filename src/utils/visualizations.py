@@ -2,32 +2,43 @@
 import plotly.graph_objects as go
 from typing import Dict
 
-def create_prediction_chart(scenarios: Dict[str, float], months_ahead: int = 24) -> go.Figure:
-    """Buat chart prediksi biaya haji"""
-    months = list(range(0, months_ahead + 1))
+def create_prediction_chart(monthly_forecast: Dict[str, object], months_ahead: int = 24) -> go.Figure:
+    """Buat chart prediksi biaya haji bulanan dari hasil predictor.predict_monthly
+    
+    Kurva diiris sampai bulan ke-months_ahead; garis vertikal menandai bulan
+    pergantian tahun Hijriah (1 Muharam).
+    """
+    window = slice(0, months_ahead + 1)
+    labels = monthly_forecast['labels'][window]
     
     fig = go.Figure()
     
     colors = {"Konservatif": "green", "Realistis": "blue", "Optimistis": "red"}
     
-    for scenario, base_cost in scenarios.items():
-        annual_growth = 0.08  # 8% pertumbuhan tahunan
-        monthly_growth = annual_growth / 12
-        
-        costs = [base_cost * (1 + monthly_growth) ** month for month in months]
-        
+    for i, scenario in enumerate(monthly_forecast['scenarios']):
         fig.add_trace(go.Scatter(
-            x=months,
-            y=costs,
+            x=labels,
+            y=monthly_forecast['costs'][i, window],
             mode='lines+markers',
             name=f'Skenario {scenario}',
-            line=dict(color=colors[scenario], width=3),
+            line=dict(color=colors.get(scenario), width=3),
             hovertemplate=f'<b>{scenario}</b><br>Bulan: %{{x}}<br>Biaya: Rp %{{y:,.0f}}<extra></extra>'
         ))
     
+    new_year = monthly_forecast['hijri_new_year'][window]
+    for i in new_year.nonzero()[0]:
+        # Sumbu x kategorikal: anotasi ditambahkan terpisah karena add_vline tidak bisa memposisikannya
+        fig.add_vline(x=labels[i], line_dash="dot", line_color="gray")
+        fig.add_annotation(
+            x=labels[i], y=1, yref="paper", yanchor="bottom",
+            text=f"{monthly_forecast['hijri_years'][i] + 1}H",
+            showarrow=False,
+            font=dict(color="gray")
+        )
+    
     fig.update_layout(
-        title="Prediksi Biaya Haji Indonesia",
-        xaxis_title="Bulan Ke Depan",
+        title="Prediksi Biaya Haji Indonesia per Bulan",
+        xaxis_title="Bulan",
         yaxis_title="Biaya (IDR)",
         hovermode='x unified',
         template='plotly_white',
@@ -35,3 +46,25 @@ def create_prediction_chart(scenarios: Dict[str, float], months_ahead: int = 24)
     )
     
     return fig
+
+
+def create_sensitivity_heatmap(gold_prices, exchange_rates, costs) -> go.Figure:
+    """Buat heatmap sensitivitas biaya terhadap harga emas dan kurs USD/IDR"""
+    fig = go.Figure(data=go.Heatmap(
+        x=exchange_rates,
+        y=gold_prices,
+        z=costs / 1000000,
+        colorscale='RdYlGn_r',
+        colorbar=dict(title="Juta Rp"),
+        hovertemplate='USD/IDR: Rp %{x:,.0f}<br>Emas: $%{y:,.0f}/oz<br>Biaya: Rp %{z:.1f}M<extra></extra>'
+    ))
+    
+    fig.update_layout(
+        title="Sensitivitas Biaya Haji: Harga Emas x Kurs USD/IDR",
+        xaxis_title="Kurs USD/IDR",
+        yaxis_title="Harga Emas (USD/oz)",
+        template='plotly_white',
+        height=450
+    )
+    
+    return fig
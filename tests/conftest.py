@@ -0,0 +1,93 @@
+"""Fixture bersama: implementasi acuan retrieve_context sebelum automaton/BM25/budget (perilaku baseline)"""
+import pytest
+
+
+def baseline_retrieve_context(rag, query: str) -> str:
+    """Salinan retrieve_context versi awal (any(word in query) per section), sebagai acuan regresi"""
+    knowledge_base = rag.knowledge_base
+    context = "=== KONTEKS BIAYA HAJI INDONESIA (DATA RIIL KEPPRES) ===\\n\\n"
+    query_lower = query.lower()
+
+    if any(word in query_lower for word in ["trend", "historis", "naik", "turun", "pertumbuhan", "perubahan", "data"]):
+        context += "📊 DATA HISTORIS BIAYA HAJI (RATA-RATA NASIONAL):\\n"
+        for year, data in knowledge_base["data_historis"].items():
+            context += f"- {year} ({data['year_hijri']}): Rp {data['average']:,}\\n"
+        context += "\\n📈 ANALISIS PERTUMBUHAN:\\n"
+        for key, value in knowledge_base["analisis_pertumbuhan"].items():
+            context += f"- {key.replace('_', ' ').title()}: {value}\\n"
+        context += "\\n"
+
+    if any(word in query_lower for word in ["2023", "covid", "lonjakan", "naik", "tinggi", "ekstrem"]):
+        context += "🚀 ANALISIS LONJAKAN 2023:\\n"
+        context += "- Kenaikan dari Rp 39.4 juta (2022) menjadi Rp 90.0 juta (2023)\\n"
+        context += "- Persentase kenaikan: +128% dalam 1 tahun\\n"
+        context += "- Faktor: akumulasi inflasi pasca-COVID, peningkatan standar layanan\\n"
+        context += "- Status: Anomali satu kali, bukan trend permanen\\n\\n"
+
+    if any(word in query_lower for word in ["jakarta", "surabaya", "medan", "aceh", "makassar", "embarkasi", "regional", "beda", "murah", "mahal"]):
+        context += "🗺️ PERBANDINGAN REGIONAL (2025):\\n"
+        latest_data = knowledge_base["data_historis"][2025]
+        for city in ['aceh', 'medan', 'jakarta', 'surabaya', 'makassar']:
+            cost = latest_data[city]
+            avg = latest_data['average']
+            diff_pct = ((cost - avg) / avg) * 100
+            status = "💰 Mahal" if diff_pct > 5 else "💚 Murah" if diff_pct < -5 else "⚖️ Normal"
+            context += f"- {city.title()}: Rp {cost:,} ({diff_pct:+.1f}% vs rata-rata) {status}\\n"
+        context += "\\n"
+
+    if any(word in query_lower for word in ["komponen", "terdiri", "biaya", "apa saja", "termasuk", "bagian"]):
+        context += "💰 KOMPONEN BIAYA HAJI:\\n"
+        for komponen, deskripsi in knowledge_base["komponen_biaya"].items():
+            context += f"- {komponen.replace('_', ' ').title()}: {deskripsi}\\n"
+        context += "\\n"
+
+    if any(word in query_lower for word in ["faktor", "penyebab", "kenapa", "mengapa", "pengaruh", "dampak"]):
+        context += "🎯 FAKTOR-FAKTOR KENAIKAN BIAYA:\\n"
+        for faktor, penjelasan in knowledge_base["faktor_kenaikan"].items():
+            context += f"- {faktor.replace('_', ' ').title()}: {penjelasan}\\n"
+        context += "\\n"
+
+    if any(word in query_lower for word in ["prediksi", "masa depan", "akan", "tahun depan", "estimasi", "proyeksi"]):
+        context += "🔮 BASIS PREDIKSI:\\n"
+        context += "- Trend normal: 3-5% growth per tahun (berdasarkan periode 2016-2022)\\n"
+        context += "- Anomali 2023: sudah ter-normalize di 2024-2025\\n"
+        context += "- Faktor risiko: inflasi global, kebijakan Saudi, nilai tukar\\n"
+        context += "- Metodologi: Ensemble ML + trend analysis + economic factors\\n\\n"
+
+    if len(query_lower) > 10:
+        context += "💡 INSIGHT KHUSUS:\\n"
+        for key, insight in knowledge_base["insight_khusus"].items():
+            if any(word in query_lower for word in key.split('_')):
+                context += f"- {insight}\\n"
+        context += "\\n"
+
+    context += "📋 SUMBER: Data resmi dari 9 Keputusan Presiden RI (2016-2025)\\n"
+    return context
+
+
+# Query contoh: kata pemicu tumpang tindih, frasa multi-kata, huruf besar, dan batas panjang query spesifik
+SAMPLE_QUERIES = [
+    "Berapa biaya haji tahun depan?",
+    "Kenapa biaya naik tinggi di 2023?",
+    "Embarkasi mana yang paling murah?",
+    "PERBEDAAN REGIONAL JAKARTA vs ACEH",
+    "apa saja komponen biaya",
+    "prediksi masa depan",
+    "trend",
+    "stabilisasi 2025",
+    "datanya naiknya",
+    "tahun depanakan",
+    "halo",
+    "assalamualaikum semuanya",
+    "",
+]
+
+
+@pytest.fixture
+def baseline_context():
+    return baseline_retrieve_context
+
+
+@pytest.fixture
+def sample_queries():
+    return list(SAMPLE_QUERIES)
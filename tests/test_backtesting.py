@@ -0,0 +1,22 @@
+"""Regresi backtesting: forecaster HajjCostPredictor tidak menjalankan bootstrap yang tidak dipakai"""
+import copy
+
+import numpy as np
+
+from src.core.backtesting import hajj_predictor_forecaster, run_backtest
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+
+
+def test_forecaster_skips_bootstrap_intervals(monkeypatch):
+    def no_bootstrap(*args, **kwargs):
+        raise AssertionError('interval bootstrap tidak dipakai backtest')
+
+    monkeypatch.setattr(HajjCostPredictor, 'get_prediction_intervals', no_bootstrap)
+    data = copy.deepcopy(RAGSystem().knowledge_base["data_historis"])
+
+    forecast = hajj_predictor_forecaster(data, np.array([1, 2, 3]))
+    assert np.all(forecast['lower'] <= forecast['point']) and np.all(forecast['point'] <= forecast['upper'])
+
+    results = run_backtest({'hajj': hajj_predictor_forecaster}, data, max_workers=1)
+    assert results['hajj']['n_forecasts'] > 0
@@ -0,0 +1,81 @@
+"""Regresi BM25: skor sama dengan rumus per dokumen dan retrieve_context tetap sesuai baseline"""
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.core.bm25 import BM25_B, BM25_K1, BM25Index, tokenize
+from src.core.rag_system import RAGSystem
+
+DOCUMENTS = [
+    ('a', 'Biaya haji embarkasi Jakarta naik pada 2023'),
+    ('b', 'Biaya biaya biaya penerbangan'),
+    ('c', 'Akomodasi di Makkah dan Madinah'),
+    ('d', 'Embarkasi Aceh termurah, embarkasi Makassar termahal'),
+    ('e', ''),
+]
+
+
+def naive_bm25(documents, query, k1=BM25_K1, b=BM25_B):
+    """BM25 dihitung langsung per dokumen dan per term query"""
+    tokenized = [tokenize(text) for _, text in documents]
+    average_length = sum(map(len, tokenized)) / len(tokenized)
+    scores = []
+    for tokens in tokenized:
+        counts = Counter(tokens)
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in other for other in tokenized)
+            if not counts[term]:
+                continue
+            idf = math.log(1 + (len(tokenized) - df + 0.5) / (df + 0.5))
+            score += idf * counts[term] * (k1 + 1) / (counts[term] + k1 * (1 - b + b * len(tokens) / average_length))
+        scores.append(score)
+    return np.array(scores)
+
+
+@pytest.mark.parametrize('query', ['biaya haji', 'Embarkasi EMBARKASI aceh', 'madinah 2023', 'tidak ada', ''])
+def test_scores_match_naive_formula(query):
+    index = BM25Index(DOCUMENTS)
+    assert np.allclose(index.scores(query), naive_bm25(DOCUMENTS, query))
+
+
+def test_search_returns_positive_scores_in_descending_order():
+    index = BM25Index(DOCUMENTS)
+    results = index.search('biaya embarkasi aceh', top_k=2)
+    scores = naive_bm25(DOCUMENTS, 'biaya embarkasi aceh')
+
+    assert [doc_id for doc_id, _ in results] == [DOCUMENTS[i][0] for i in np.argsort(-scores, kind='stable')[:2]]
+    assert results[0][1] >= results[1][1] > 0
+    assert len(index.search('biaya embarkasi aceh', top_k=10)) == np.count_nonzero(scores)
+    assert index.search('biaya', top_k=0) == [] and index.search('umrah') == []
+    assert BM25Index([]).search('biaya') == []
+
+
+def test_retrieve_context_matches_baseline(sample_queries, baseline_context):
+    rag = RAGSystem()
+    untriggered = ["keppres nomor 6", "sumber resmi keppres", "layanan katering hotel"]
+
+    for query in sample_queries + untriggered:
+        context = rag.retrieve_context(query)
+        if rag.trigger_automaton.match_mask(query.lower()):
+            assert context == baseline_context(rag, query)
+            continue
+
+        # Tanpa kata pemicu: baseline + section chunk BM25 teratas tepat sebelum footer
+        results = rag.retrieval_index.search(query.lower(), RAGSystem.RETRIEVAL_TOP_K)
+        related = "".join(f"- {rag.chunks[chunk_id]}\\n" for chunk_id, _ in results)
+        section = f"📚 KONTEKS TERKAIT:\\n{related}\\n" if results else ""
+        expected = baseline_context(rag, query).replace(RAGSystem.CONTEXT_FOOTER, section + RAGSystem.CONTEXT_FOOTER)
+        assert context == expected
+        if query in untriggered:
+            assert results
+
+
+def test_add_documents_extends_bm25_corpus():
+    rag = RAGSystem()
+    assert rag.search('manasik') == []
+    rag.add_documents({'extra/manasik': 'Jadwal manasik haji di kabupaten'})
+    assert rag.search('manasik')[0][:2] == ('extra/manasik', 'Jadwal manasik haji di kabupaten')
+    assert 'Jadwal manasik haji' in rag.retrieve_context('jadwal manasik')
@@ -0,0 +1,88 @@
+"""Regresi deteksi regime (PELT) dan deskripsi perpindahan regime terakhir"""
+import copy
+
+import numpy as np
+
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+from src.models import changepoint
+from src.models.changepoint import DENSE_MAX_POINTS, detect_regimes, pelt
+
+
+def historical_data():
+    return copy.deepcopy(RAGSystem().knowledge_base["data_historis"])
+
+
+def test_jump_in_newest_year_starts_one_point_regime():
+    years = np.arange(2016, 2028)
+    values = np.r_[np.arange(100, 111), 230]
+
+    regimes = detect_regimes(years, values)
+
+    assert regimes['regime_starts'] == [2016, 2027]
+    assert regimes['shift_steps'].tolist() == [False] * 10 + [True]
+    assert not regimes['current_steps'].any()
+
+
+def test_smooth_series_has_no_changepoint():
+    assert detect_regimes(np.arange(2016, 2028), np.arange(100, 112))['changepoints'] == []
+    assert detect_regimes(np.arange(2016, 2040), 100 * 1.03 ** np.arange(24))['changepoints'] == []
+
+
+def test_long_series_matches_dense_search(monkeypatch):
+    rng = np.random.default_rng(0)
+    series = []
+    for _ in range(40):
+        n = int(rng.integers(DENSE_MAX_POINTS + 1, 200))
+        steps = rng.normal(0.02, 0.01, n) + np.where(rng.random(n) < 0.03, rng.normal(0, 0.3, n), 0.0)
+        series.append((rng.choice([1.0, 1 / 12]) * np.arange(n), np.cumsum(steps)))
+
+    long_path = [pelt(t, y) for t, y in series]
+    monkeypatch.setattr(changepoint, 'DENSE_MAX_POINTS', 10_000)
+    assert long_path == [pelt(t, y) for t, y in series]
+
+
+def test_keppres_series_split_at_2023():
+    data = historical_data()
+    years = sorted(data)
+    for key in ('average', 'jakarta', 'surabaya', 'medan', 'makassar', 'aceh'):
+        regimes = detect_regimes(years, [data[year][key] for year in years])
+        assert regimes['regime_starts'] == [2016, 2023], key
+
+
+def test_newest_year_jump_after_keppres_data():
+    data = historical_data()
+    years = sorted(data) + [2027]
+    values = [data[year]['average'] for year in sorted(data)] + [200e6]
+
+    assert detect_regimes(years, values)['regime_starts'] == [2016, 2023, 2027]
+
+
+def test_last_shift_message_reports_newest_year_jump():
+    data = historical_data()
+    predictor = HajjCostPredictor.from_historical_data(data)
+    assert predictor._describe_last_regime_shift() == "Lonjakan 2023 (+128%) sudah ter-normalize"
+
+    ratio = 200e6 / data[2025]['average']
+    entry = {key: value * ratio for key, value in data[2025].items() if key != 'year_hijri'}
+    entry['year_hijri'] = '1448H'
+    predictor.add_year(2027, entry)
+
+    assert predictor._describe_last_regime_shift() == (
+        "Lonjakan 2027 (+126%) belum terkonfirmasi sebagai regime baru"
+    )
+
+
+def test_projection_growth_shrinks_current_regime_to_pooled():
+    data = historical_data()
+    predictor = HajjCostPredictor.from_historical_data(data)
+
+    current = [data[2024]['average'] / data[2023]['average'] - 1,
+               data[2025]['average'] / data[2024]['average'] - 1]
+    weight = HajjCostPredictor.REGIME_PRIOR_WEIGHT
+    pooled = np.mean(predictor.growth_analysis['normal_growth_rates'])
+    expected = (np.sum(current) + weight * pooled) / (len(current) + weight)
+    assert predictor.growth_analysis['growth_basis'] == 'regime_terkini'
+    assert np.isclose(predictor.growth_analysis['average_normal_growth'], expected)
+    # Dua langkah regime 2023-2025 (rata-rata negatif) tidak membuat proyeksi realistis turun
+    assert predictor.growth_analysis['average_normal_growth'] > 0
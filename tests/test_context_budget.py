@@ -0,0 +1,65 @@
+"""Regresi perakitan konteks: hasil pack tidak pernah melebihi budget token"""
+import numpy as np
+import pytest
+
+from src.core.config import Config
+from src.core.context_budget import (DEFAULT_TOKEN_BUDGET, ContextSection, estimate_tokens, pack_sections,
+                                     score_sections)
+from src.core.rag_system import RAGSystem
+
+HEADER, FOOTER = RAGSystem.CONTEXT_HEADER, RAGSystem.CONTEXT_FOOTER
+
+
+def random_sections(rng, n):
+    words = np.array(['biaya', 'haji', 'embarkasi', 'kenaikan', '2023', 'Rp', '90.040.973', 'akomodasi',
+                      'penerbangan', '-', '(+5.2%)', '📊', 'konsumsi', 'di', 'Makkah'])
+    return [(f"s{i}", " ".join(rng.choice(words, rng.integers(0, 80))) + "\\n") for i in range(n)]
+
+
+def check_within_budget(assembled, sections, budget):
+    assert estimate_tokens(assembled.text) <= assembled.tokens <= budget
+    assert assembled.budget == budget
+    assert set(assembled.included) | set(assembled.dropped) == {section.name for section in sections}
+    # Greedy: section yang dibuang memang tidak muat di sisa budget akhir
+    remaining = budget - assembled.tokens
+    assert all(section.tokens > remaining for section in sections if section.name in assembled.dropped)
+
+
+def test_packing_never_exceeds_budget():
+    rng = np.random.default_rng(0)
+    reserved = estimate_tokens(HEADER) + estimate_tokens(FOOTER)
+    for _ in range(200):
+        sections = score_sections("biaya haji embarkasi 2023", random_sections(rng, rng.integers(0, 12)))
+        budget = int(reserved + rng.integers(0, 600))
+        check_within_budget(pack_sections(sections, budget, HEADER, FOOTER), sections, budget)
+
+
+def test_included_sections_keep_candidate_order_and_prefer_higher_scores():
+    sections = [ContextSection('a', 'aaa ', 1.0, 5), ContextSection('b', 'bbb ', 3.0, 5),
+                ContextSection('c', 'ccc ', 2.0, 5), ContextSection('d', 'ddd ', 0.0, 1)]
+    assembled = pack_sections(sections, 11)
+    assert assembled.included == ('b', 'c', 'd') and assembled.dropped == ('a',)
+    assert assembled.text == 'bbb ccc ddd ' and assembled.tokens == 11
+
+
+def test_budget_below_header_and_footer_is_rejected():
+    with pytest.raises(ValueError, match='Budget token'):
+        pack_sections([], estimate_tokens(HEADER), HEADER, FOOTER)
+
+
+@pytest.mark.parametrize('budget', [Config().CONTEXT_TOKEN_BUDGET, DEFAULT_TOKEN_BUDGET // 4, 120])
+def test_assemble_context_stays_within_budget(sample_queries, budget):
+    rag = RAGSystem()
+    extra = {"data_terkini": "Data Real-time Saat Ini:\\n- Harga Emas: ~$2000/oz\\n- Nilai Tukar USD/IDR: ~Rp 15,000\\n"}
+    for query in sample_queries:
+        assembled = rag.assemble_context(query, budget, extra)
+        assert estimate_tokens(assembled.text) <= assembled.tokens <= budget
+        assert assembled.text.startswith(HEADER) and assembled.text.endswith(FOOTER)
+
+
+def test_unbounded_budget_reproduces_retrieve_context(sample_queries):
+    rag = RAGSystem()
+    for query in sample_queries:
+        assembled = rag.assemble_context(query, budget=10 ** 9)
+        assert assembled.dropped == ()
+        assert assembled.text == rag.retrieve_context(query)
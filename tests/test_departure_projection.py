@@ -0,0 +1,70 @@
+"""Regresi proyeksi keberangkatan: lookup tabel biaya dan streaming CSV berurutan/paralel"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core.departure_projection import OUTPUT_COLUMNS, DepartureCostProjector
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+
+WAITING_YEARS = {'aceh': 30.2, 'dki jakarta': 26.0, 'sulawesi selatan': 47.5}
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return HajjCostPredictor.from_historical_data(copy.deepcopy(RAGSystem().knowledge_base["data_historis"]))
+
+
+@pytest.fixture(scope='module')
+def projector(predictor):
+    return DepartureCostProjector(predictor, WAITING_YEARS)
+
+
+def test_project_looks_up_history_and_forecast(predictor, projector):
+    latest = predictor.latest_year
+    result = projector.project(
+        [latest - 26, 2000, 2000, 1900],
+        ['dki jakarta', 'dki jakarta', 'sulawesi selatan', 'aceh'],
+        ['jakarta', 'average', 'makassar', 'aceh']
+    )
+
+    assert result['departure_year'].tolist() == [latest, 2026, 2048, 1931]
+    assert np.allclose(result['waiting_years'], [26.0, 26.0, 47.5, 30.2])
+    assert np.isclose(result['projected_cost'][0], predictor.historical_data[latest]['jakarta'])
+    assert np.isclose(result['projected_cost'][1], predictor.predict_batch(np.array([2026 - latest]))[0][0])
+    makassar = predictor.embarkasi.index('makassar')
+    assert np.isclose(result['projected_cost'][2], predictor.predict_regional_costs(2048 - latest)[-1, makassar])
+    # Sebelum data Keppres pertama: di luar tabel
+    assert np.isnan(result['projected_cost'][3])
+
+
+def test_project_rejects_unknown_labels(projector):
+    with pytest.raises(ValueError, match='Provinsi tidak dikenal: papua'):
+        projector.project([2020], ['papua'], ['aceh'])
+    with pytest.raises(ValueError, match='Embarkasi tidak dikenal: bali'):
+        projector.project([2020], ['aceh'], ['bali'])
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_project_csv_streams_in_input_order(projector, tmp_path, max_workers):
+    pd = pytest.importorskip('pandas')
+    rng = np.random.default_rng(0)
+    n = 2_500
+    frame = pd.DataFrame({
+        'registration_date': pd.to_datetime('2005-01-01') + pd.to_timedelta(rng.integers(0, 7000, n), unit='D'),
+        'province': rng.choice(list(WAITING_YEARS), n),
+        'embarkasi': rng.choice(projector.targets, n)
+    })
+    input_path, output_path = tmp_path / 'pendaftar.csv', tmp_path / 'proyeksi.csv'
+    frame.to_csv(input_path, index=False)
+
+    assert projector.project_csv(input_path, output_path, chunk_size=300, max_workers=max_workers) == n
+
+    output = pd.read_csv(output_path)
+    expected = projector.project(frame['registration_date'].dt.year.to_numpy(),
+                                 frame['province'].to_numpy(), frame['embarkasi'].to_numpy())
+    assert len(output) == n
+    assert (output['province'] == frame['province']).all()
+    for column in OUTPUT_COLUMNS:
+        assert np.allclose(output[column], expected[column], equal_nan=True)
@@ -0,0 +1,29 @@
+"""Regresi stacking bobot ensemble: grid biasa dinilai di proses, hasil sama dengan jalur chunk"""
+import numpy as np
+
+from src.models import ensemble
+from src.models.ensemble import learn_ensemble_weights
+
+
+def member_forecasts(n_forecasts=12, n_members=3):
+    rng = np.random.default_rng(0)
+    return rng.uniform(0.9, 1.1, (n_forecasts, n_members)), np.ones(n_forecasts)
+
+
+def test_default_grid_is_scored_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError('process pool tidak boleh dipakai untuk grid sekecil ini')
+
+    monkeypatch.setattr(ensemble, 'ProcessPoolExecutor', no_pool)
+    result = learn_ensemble_weights(*member_forecasts())
+
+    assert np.isclose(sum(result['weights']), 1.0)
+    assert result['n_forecasts'] == 12
+
+
+def test_chunked_scoring_matches_single_pass(monkeypatch):
+    forecasts, actual = member_forecasts()
+    single = learn_ensemble_weights(forecasts, actual)
+
+    monkeypatch.setattr(ensemble, 'PARALLEL_MIN_CELLS', 100)
+    assert learn_ensemble_weights(forecasts, actual, max_workers=1) == single
@@ -0,0 +1,59 @@
+"""Regresi tabel forecast: blok bersama di-cache per versi data, data pasar hanya menskalakan skenario"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core import forecast_table
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+
+
+@pytest.fixture
+def build_calls(monkeypatch):
+    monkeypatch.setattr(forecast_table, '_block_cache', forecast_table.OrderedDict())
+    calls = []
+    original = forecast_table._build_block
+    monkeypatch.setattr(forecast_table, '_build_block',
+                        lambda predictor, horizon: calls.append(horizon) or original(predictor, horizon))
+    return calls
+
+
+def make_predictor():
+    return HajjCostPredictor.from_historical_data(copy.deepcopy(RAGSystem().knowledge_base["data_historis"]))
+
+
+def test_market_quotes_reuse_cached_block(build_calls):
+    predictor = make_predictor()
+    table = predictor.get_forecast_table(2000, 15000)
+    quoted = predictor.get_forecast_table(2137.25, 16012.5)
+
+    assert len(build_calls) == 1
+    assert np.array_equal(table.series(), quoted.series())
+    assert table.get(2026, scenario='Realistis') != quoted.get(2026, scenario='Realistis')
+    assert np.allclose(quoted.get(2026, scenario='Realistis'),
+                       table.get(2026) * predictor.evaluate_scenarios(predictor._default_scenarios, 1, 2137.25, 16012.5)[1, 0]
+                       / predictor.predict_batch(1)[0, 0])
+
+
+def test_new_data_invalidates_block(build_calls):
+    predictor = make_predictor()
+    before = predictor.get_forecast_table()
+    data = predictor.historical_data
+    entry = {key: value * 1.03 for key, value in data[2025].items() if key != 'year_hijri'}
+    entry['year_hijri'] = '1447H'
+    predictor.add_year(2026, entry)
+
+    after = predictor.get_forecast_table()
+
+    assert len(build_calls) == 2
+    assert after.first_year == before.first_year + 1 == 2027
+
+
+def test_headline_matches_predict_future_cost(build_calls):
+    predictor = make_predictor()
+    table = predictor.get_forecast_table()
+    summary = predictor.get_prediction_summary(table)
+
+    assert summary['predicted_2026'] == table.get(2026) == pytest.approx(predictor.predict_future_cost(1))
+    assert np.allclose(table.series(years_ahead=5), [predictor.predict_future_cost(k) for k in range(1, 6)])
@@ -0,0 +1,58 @@
+"""Regresi automaton kata pemicu: semantik substring sama dengan any(word in text) dan retrieve_context baseline"""
+import numpy as np
+import pytest
+
+from src.core.keyword_automaton import KeywordAutomaton
+from src.core.rag_system import RAGSystem
+
+
+def naive_match(triggers, text):
+    text = text.lower()
+    return [name for name, words in triggers.items() if any(word.lower() in text for word in words)]
+
+
+def test_overlapping_and_nested_words_match_like_substring_search():
+    triggers = {'a': ['he', 'hers'], 'b': ['she'], 'c': ['his'], 'd': ['ushe'], 'e': ['x']}
+    automaton = KeywordAutomaton(triggers)
+
+    for text in ['ushers', 'USHERS', 'his', 'hershe', 'h', 'ush', 'sxhe', '']:
+        assert automaton.match(text) == naive_match(triggers, text)
+    assert automaton.match_mask('') == 0
+
+
+def test_random_triggers_match_naive_search():
+    rng = np.random.default_rng(0)
+    alphabet = np.array(list('abc '))
+    for _ in range(50):
+        triggers = {f"s{i}": [''.join(rng.choice(alphabet, rng.integers(1, 5))) for _ in range(rng.integers(1, 4))]
+                    for i in range(rng.integers(1, 8))}
+        automaton = KeywordAutomaton(triggers)
+        for _ in range(20):
+            text = ''.join(rng.choice(alphabet, rng.integers(0, 30)))
+            assert automaton.match(text) == naive_match(triggers, text)
+
+
+def test_empty_trigger_word_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordAutomaton({'a': ['biaya', '']})
+
+
+def test_rag_trigger_sections_match_naive_search(sample_queries):
+    rag = RAGSystem()
+    triggers = dict(RAGSystem.CONTEXT_TRIGGERS)
+    for key in rag.knowledge_base["insight_khusus"]:
+        triggers[RAGSystem.INSIGHT_SECTION_PREFIX + key] = key.split('_')
+
+    for query in sample_queries:
+        assert rag.trigger_automaton.match(query) == naive_match(triggers, query)
+
+
+def test_retrieve_context_matches_baseline_for_triggered_queries(sample_queries, baseline_context):
+    rag = RAGSystem()
+    triggered = [query for query in sample_queries if rag.trigger_automaton.match_mask(query.lower())]
+    assert len(triggered) >= 8
+
+    for query in triggered:
+        assert rag.retrieve_context(query) == baseline_context(rag, query)
+        # Jalur cache (kombinasi section yang sama) tetap identik
+        assert rag.retrieve_context(query) == baseline_context(rag, query)
@@ -0,0 +1,40 @@
+"""Regresi model_store: cache payload proses dibatasi LRU, state regional diambil dari artefak"""
+import copy
+
+from src.core import model_store, predictor as predictor_module
+from src.core.model_store import load_or_build
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+
+
+def test_memory_cache_is_bounded_lru(monkeypatch):
+    monkeypatch.setattr(model_store, '_memory_cache', model_store.OrderedDict())
+    monkeypatch.setattr(model_store, 'MEMORY_CACHE_SIZE', 3)
+    builds = []
+
+    def build(value):
+        return lambda: builds.append(value) or {'value': value}
+
+    for value in range(3):
+        load_or_build('lru', value, build(value), persist=False)
+    load_or_build('lru', 0, build(0), persist=False)  # Hit: 0 menjadi yang terbaru
+    load_or_build('lru', 3, build(3), persist=False)  # Eviksi 1 (paling lama tidak dipakai)
+
+    assert len(model_store._memory_cache) == 3
+    assert load_or_build('lru', 0, build(0), persist=False) == {'value': 0}
+    load_or_build('lru', 1, build(1), persist=False)
+    assert builds == [0, 1, 2, 3, 1]
+
+
+def test_regional_regimes_come_from_artifact(monkeypatch):
+    data = copy.deepcopy(RAGSystem().knowledge_base["data_historis"])
+    first = HajjCostPredictor.from_historical_data(data)
+    calls = []
+    original = predictor_module.detect_regimes
+    monkeypatch.setattr(predictor_module, 'detect_regimes', lambda *args: calls.append(args) or original(*args))
+
+    second = HajjCostPredictor.from_historical_data(copy.deepcopy(data))
+
+    assert len(calls) == 1  # Hanya deret nasional; changepoint embarkasi dari cache artefak
+    assert second.regional_regimes == first.regional_regimes
+    assert (second.regional_growth == first.regional_growth).all()
@@ -0,0 +1,79 @@
+"""Regresi add_year: validasi entri dan update inkremental tanpa segmentasi ulang"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core import model_store, predictor as predictor_module
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+
+
+def historical_data():
+    return copy.deepcopy(RAGSystem().knowledge_base["data_historis"])
+
+
+def scaled_entry(data, ratio, year_hijri='1447H'):
+    entry = {key: value * ratio for key, value in data[2025].items() if key != 'year_hijri'}
+    entry['year_hijri'] = year_hijri
+    return entry
+
+
+@pytest.mark.parametrize('missing', ['year_hijri', 'average', 'aceh'])
+def test_add_year_rejects_incomplete_entry(missing):
+    data = historical_data()
+    predictor = HajjCostPredictor.from_historical_data(data)
+    entry = scaled_entry(data, 1.03)
+    del entry[missing]
+
+    with pytest.raises(ValueError, match=missing):
+        predictor.add_year(2026, entry)
+    assert 2026 not in data
+
+
+def test_add_year_rejects_incoherent_average():
+    data = historical_data()
+    predictor = HajjCostPredictor.from_historical_data(data)
+    entry = scaled_entry(data, 1.03)
+    entry['average'] *= 1.05
+
+    with pytest.raises(ValueError, match='average'):
+        predictor.add_year(2026, entry)
+    with pytest.raises(ValueError, match='2025'):
+        predictor.add_year(2025, scaled_entry(data, 1.03))
+
+
+def test_add_year_defers_segmentation_until_refresh(monkeypatch):
+    data = historical_data()
+    predictor = HajjCostPredictor.from_historical_data(data)
+    # Changepoint regional tahun baru tidak boleh berasal dari cache test lain
+    monkeypatch.setattr(model_store, '_memory_cache', model_store.OrderedDict())
+    calls = []
+    original = predictor_module.detect_regimes
+    monkeypatch.setattr(predictor_module, 'detect_regimes', lambda *args: calls.append(args) or original(*args))
+
+    growth = predictor.add_year(2026, scaled_entry(data, 1.03))
+    assert calls == []
+    assert growth is predictor.growth_analysis
+    assert growth['regime_starts'] == [2016, 2023]
+    assert np.isclose(growth['all_growth_rates'][-1], 0.03)
+
+    predictor.refresh()
+    assert len(calls) == 1 + len(predictor.embarkasi)
+    rebuilt = HajjCostPredictor.from_historical_data(copy.deepcopy(data))
+    for key in ('average_normal_growth', 'std_normal_growth', 'regime_starts'):
+        assert np.allclose(predictor.growth_analysis[key], rebuilt.growth_analysis[key])
+    assert np.allclose(predictor.predict_regional_costs(3), rebuilt.predict_regional_costs(3))
+
+
+def test_add_year_refreshes_rag_context():
+    rag = RAGSystem()
+    predictor = HajjCostPredictor(None, rag, use_artifact=False)
+    version = rag.knowledge_version
+    assert '2026' not in rag.retrieve_context('data historis')
+
+    predictor.add_year(2026, scaled_entry(rag.knowledge_base["data_historis"], 1.03))
+
+    assert rag.knowledge_version != version
+    assert '2026 (1447H)' in rag.retrieve_context('data historis')
+    assert rag.search('biaya haji 2026 1447H')[0][0] == 'data_historis/2026'
@@ -0,0 +1,76 @@
+"""Regresi sketch kuantil: galat relatif terhadap np.quantile dan penggabungan yang asosiatif"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core.path_simulation import simulate_log_growth_paths, sketch_log_growth_paths
+from src.core.quantile_sketch import LogQuantileSketch
+
+QUANTILES = np.array([0.0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0])
+
+
+def log_samples(seed, n=20_000, n_series=3):
+    rng = np.random.default_rng(seed)
+    return rng.normal(np.log([1e6, 5e7, 9e7])[:n_series, np.newaxis], 0.4, (n_series, n))
+
+
+@pytest.mark.parametrize('relative_accuracy', [0.001, 0.01, 0.05])
+def test_quantiles_within_relative_accuracy(relative_accuracy):
+    values = log_samples(0)
+    sketch = LogQuantileSketch(3, relative_accuracy)
+    for block in np.array_split(values, 7, axis=1):
+        sketch.add_log(block)
+
+    # Order statistic ke-floor(q * (n - 1)), sesuai kontrak quantiles()
+    exact = np.quantile(np.exp(values), QUANTILES, axis=1, method='lower')
+    estimated = sketch.quantiles(QUANTILES)
+    assert estimated.shape == (len(QUANTILES), 3)
+    assert np.all(np.abs(estimated - exact) <= relative_accuracy * exact * (1 + 1e-9))
+    assert np.allclose(sketch.mean(), np.exp(values).mean(axis=1))
+
+
+def test_merge_is_associative_and_matches_single_sketch():
+    blocks = [log_samples(seed, n=n) for seed, n in ((1, 5_000), (2, 1), (3, 12_000))]
+    # Rentang bucket berbeda per blok agar merge harus memperluas offset ke dua arah
+    blocks[1] = blocks[1] + 3.0
+    blocks[2] = blocks[2] - 2.0
+    a, b, c = (LogQuantileSketch(3) for _ in blocks)
+    for sketch, block in zip((a, b, c), blocks):
+        sketch.add_log(block)
+
+    left = copy.deepcopy(a).merge(copy.deepcopy(b)).merge(copy.deepcopy(c))
+    right = copy.deepcopy(a).merge(copy.deepcopy(b).merge(copy.deepcopy(c)))
+    reversed_order = copy.deepcopy(c).merge(copy.deepcopy(b)).merge(copy.deepcopy(a))
+    single = LogQuantileSketch(3)
+    single.add_log(np.hstack(blocks))
+
+    for merged in (right, reversed_order, single):
+        assert merged.count == left.count == 17_001
+        assert np.array_equal(merged.quantiles(QUANTILES), left.quantiles(QUANTILES))
+        assert np.allclose(merged.mean(), left.mean())
+    assert left.merge(LogQuantileSketch(3)).count == 17_001
+
+
+def test_merge_rejects_incompatible_sketches():
+    with pytest.raises(ValueError):
+        LogQuantileSketch(3).merge(LogQuantileSketch(2))
+    with pytest.raises(ValueError):
+        LogQuantileSketch(3, 0.01).merge(LogQuantileSketch(3, 0.001))
+    with pytest.raises(ValueError, match='kosong'):
+        LogQuantileSketch(3).quantiles(0.5)
+
+
+def test_chunked_simulation_is_independent_of_workers_and_matches_dense():
+    args = (0.05, 0.03, 30_000, 5)
+    sequential = sketch_log_growth_paths(*args, seed=7, chunk_size=4_000, max_workers=1)
+    parallel = sketch_log_growth_paths(*args, seed=7, chunk_size=4_000, max_workers=2)
+    assert np.array_equal(sequential.counts, parallel.counts)
+
+    # Blok dengan seed turunan yang sama, dibangkitkan dense lalu digabung
+    seeds = np.random.SeedSequence(7).spawn(8)
+    sizes = [4_000] * 7 + [2_000]
+    paths = np.hstack([simulate_log_growth_paths(0.05, 0.03, size, 5, np.random.default_rng(seed))
+                       for size, seed in zip(sizes, seeds)])
+    exact = np.quantile(np.exp(paths), QUANTILES, axis=1, method='lower')
+    assert np.all(np.abs(sequential.quantiles(QUANTILES) - exact) <= sequential.relative_accuracy * exact * (1 + 1e-9))
@@ -0,0 +1,67 @@
+"""Regresi rekonsiliasi hierarkis: forecast hasil rekonsiliasi selalu koheren (S @ bottom == semua level)"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+from src.core.reconciliation import reconcile, reconciliation_matrix, shrinkage_covariance, summing_matrix
+
+
+@pytest.fixture
+def hierarchy():
+    """Rata-rata nasional dan dua agregat provinsi di atas 5 embarkasi, dengan residual berkorelasi"""
+    rng = np.random.default_rng(0)
+    summing = summing_matrix(5, {
+        'average': np.full(5, 0.2),
+        'provinsi_a': [0.5, 0.5, 0, 0, 0],
+        'provinsi_b': [0, 0, 1 / 3, 1 / 3, 1 / 3]
+    })
+    residuals = rng.standard_normal((12, 8)) @ rng.standard_normal((8, 8))
+    residuals[[1, 4], 3] = np.nan
+    base = rng.uniform(5e7, 1e8, (6, 8))
+    return summing, shrinkage_covariance(residuals), base
+
+
+@pytest.mark.parametrize('method', ['mint', 'bottom_up'])
+def test_reconciled_forecasts_are_coherent(hierarchy, method):
+    summing, covariance, base = hierarchy
+    projection = summing @ reconciliation_matrix(summing, covariance, method)
+    reconciled = reconcile(base, projection)
+
+    bottom = reconciled[:, 3:]
+    assert np.allclose(reconciled, bottom @ summing.T, rtol=1e-10)
+    # P proyeksi: forecast yang sudah koheren tidak berubah
+    assert np.allclose(projection @ projection, projection, atol=1e-10)
+    assert np.allclose(reconcile(reconciled, projection), reconciled, rtol=1e-10)
+    if method == 'bottom_up':
+        assert np.array_equal(bottom, base[:, 3:])
+
+
+def test_shrinkage_covariance_is_symmetric_positive_definite(hierarchy):
+    _, covariance, _ = hierarchy
+    assert np.allclose(covariance, covariance.T)
+    assert np.linalg.eigvalsh(covariance).min() > 0
+
+    # Terlalu sedikit baris lengkap: hanya varians per node (WLS)
+    sparse = np.array([[1.0, np.nan, 2.0], [np.nan, 1.0, -1.0], [0.5, np.nan, np.nan]])
+    diagonal = shrinkage_covariance(sparse)
+    assert np.array_equal(diagonal, np.diag(np.diag(diagonal)))
+    with pytest.raises(ValueError, match='tidak dikenal'):
+        reconciliation_matrix(np.eye(3), method='top_down')
+
+
+@pytest.mark.parametrize('method', ['mint', 'bottom_up'])
+def test_predictor_reconciled_average_equals_embarkasi_mean(method):
+    predictor = HajjCostPredictor.from_historical_data(copy.deepcopy(RAGSystem().knowledge_base["data_historis"]))
+    assert predictor.reconciliation_nodes == ['average'] + list(predictor.embarkasi)
+
+    beyond = predictor.REGIONAL_FORECAST_HORIZON + 3
+    for years_ahead in (5, beyond):
+        reconciled = predictor.predict_reconciled(years_ahead, method)
+        assert reconciled.shape == (years_ahead, 1 + len(predictor.embarkasi))
+        assert np.allclose(reconciled[:, 0], reconciled[:, 1:].mean(axis=1), rtol=1e-10)
+    assert np.allclose(predictor.predict_reconciled(beyond, method)[:5], predictor.predict_reconciled(5, method))
+    with pytest.raises(ValueError):
+        predictor.predict_reconciled(5, 'top_down')
@@ -0,0 +1,79 @@
+"""Regresi perencana tabungan: tahun keberangkatan, validasi input, dan pemrosesan CSV per chunk"""
+import copy
+
+import numpy as np
+import pytest
+
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+from src.core.savings_planner import INPUT_COLUMNS, OUTPUT_COLUMNS, UNAFFORDABLE
+
+
+@pytest.fixture(scope='module')
+def planner():
+    data = copy.deepcopy(RAGSystem().knowledge_base["data_historis"])
+    return HajjCostPredictor.from_historical_data(data).get_savings_planner()
+
+
+def test_plan_matches_monthly_compounding_loop(planner):
+    deposit, balance, rate = 1_500_000.0, 20_000_000.0, 0.05
+    result = planner.plan([deposit, 10.0], [balance, 0.0], [rate, 0.0], ['jakarta', 'average'])
+
+    monthly = (1 + rate) ** (1 / 12) - 1
+    saldo, year = balance, 0
+    costs = planner.cost_table[:, planner.target_index['jakarta']]
+    while True:
+        year += 1
+        for _ in range(12):
+            saldo = saldo * (1 + monthly) + deposit
+        if saldo >= costs[year - 1]:
+            break
+
+    assert result['years_needed'][0] == year
+    assert result['departure_year'][0] == planner.start_year + year
+    assert np.isclose(result['balance_at_departure'][0], saldo)
+    assert result['departure_year'][1] == UNAFFORDABLE and np.isnan(result['projected_cost'][1])
+
+
+@pytest.mark.parametrize('column, value, message', [
+    ('expected_return', -1.0, 'expected_return'),
+    ('expected_return', -1.5, 'expected_return'),
+    ('expected_return', np.nan, 'expected_return'),
+    ('monthly_deposit', 0.0, 'monthly_deposit'),
+    ('monthly_deposit', -100.0, 'monthly_deposit'),
+    ('starting_balance', -1.0, 'starting_balance'),
+])
+def test_plan_rejects_out_of_range_profiles(planner, column, value, message):
+    profiles = {'monthly_deposit': [1e6, 1e6], 'starting_balance': [0.0, 0.0],
+                'expected_return': [0.05, 0.05], 'embarkasi': ['aceh', 'medan']}
+    profiles[column] = [profiles[column][0], value]
+
+    with pytest.raises(ValueError, match=f"{message}.*baris 1"):
+        planner.plan(*(profiles[name] for name in INPUT_COLUMNS))
+
+
+def test_plan_csv_matches_plan(planner, tmp_path):
+    pd = pytest.importorskip('pandas')
+    rng = np.random.default_rng(0)
+    n = 1_000
+    frame = pd.DataFrame({
+        'monthly_deposit': rng.uniform(2e5, 5e6, n),
+        'starting_balance': rng.uniform(0, 5e7, n),
+        'expected_return': rng.uniform(-0.02, 0.08, n),
+        'embarkasi': rng.choice(planner.targets, n)
+    })
+    input_path, output_path = tmp_path / 'profil.csv', tmp_path / 'hasil.csv'
+    frame.to_csv(input_path, index=False)
+
+    assert planner.plan_csv(input_path, output_path, chunk_size=128) == n
+
+    output = pd.read_csv(output_path)
+    expected = planner.plan(*(frame[name].to_numpy() for name in INPUT_COLUMNS))
+    assert list(output.columns) == list(INPUT_COLUMNS) + list(OUTPUT_COLUMNS)
+    for column in OUTPUT_COLUMNS:
+        assert np.allclose(output[column], expected[column], equal_nan=True)
+
+    frame.loc[700, 'expected_return'] = -1.2
+    frame.to_csv(input_path, index=False)
+    with pytest.raises(ValueError, match='expected_return'):
+        planner.plan_csv(input_path, output_path, chunk_size=128)
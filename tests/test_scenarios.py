@@ -0,0 +1,73 @@
+"""Regresi skenario deklaratif: pemuatan file, atribusi LMDI, dan kurva bulanan per skenario"""
+import copy
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.core.monthly_forecast import HIJRI_YEAR_DAYS, MonthlyForecastEngine
+from src.core.predictor import HajjCostPredictor
+from src.core.rag_system import RAGSystem
+from src.core.scenarios import ScenarioSpec, load_scenarios
+
+SCENARIO_ENTRIES = [
+    {'name': 'Rupiah melemah', 'fx_shock': 0.1, 'growth_shift': 0.01},
+    {'name': 'Inflasi Saudi 2028', 'component_inflation': {'inflasi_saudi': 0.04}, 'start_year': 2028},
+    {'name': 'Emas naik', 'gold_shock': 0.2, 'growth_multiplier': 1.5},
+]
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return HajjCostPredictor.from_historical_data(copy.deepcopy(RAGSystem().knowledge_base["data_historis"]))
+
+
+def test_load_scenarios_json_and_yaml(tmp_path):
+    yaml = pytest.importorskip('yaml')
+    json_path = tmp_path / 'skenario.json'
+    json_path.write_text(json.dumps({'scenarios': SCENARIO_ENTRIES}))
+    yaml_path = tmp_path / 'skenario.yaml'
+    yaml_path.write_text(yaml.safe_dump(SCENARIO_ENTRIES))
+
+    expected = [ScenarioSpec(**entry) for entry in SCENARIO_ENTRIES]
+    assert load_scenarios(json_path) == expected
+    assert load_scenarios(yaml_path) == expected
+
+
+def test_invalid_scenarios_are_rejected(tmp_path, predictor):
+    path = tmp_path / 'salah.json'
+    path.write_text(json.dumps([{'name': 'X', 'gold_shok': 0.1}]))
+    with pytest.raises(ValueError, match='gold_shok'):
+        load_scenarios(path)
+
+    with pytest.raises(ValueError, match='inflasi_mars'):
+        predictor.compile_scenarios([ScenarioSpec('Y', component_inflation={'inflasi_mars': 0.1})])
+
+
+def test_attribution_components_sum_to_total(predictor):
+    specs = [ScenarioSpec(**entry) for entry in SCENARIO_ENTRIES] + [ScenarioSpec('Dasar')]
+    parts = predictor.compile_scenarios(specs).attribute(predictor, np.arange(1, 8), 2300, 16500)
+
+    assert np.allclose(parts['base'] + parts['trend'] + parts['gold'] + parts['fx'], parts['total'])
+    assert np.allclose(parts['total'], predictor.evaluate_scenarios(specs, np.arange(1, 8), 2300, 16500))
+
+
+def test_monthly_curve_matches_annual_scenarios(tmp_path, predictor):
+    path = tmp_path / 'skenario.json'
+    path.write_text(json.dumps(SCENARIO_ENTRIES))
+    engine = MonthlyForecastEngine(predictor, max_months=60, start=date(2026, 1, 1))
+
+    monthly = engine.forecast(60, 2300, 16500, scenarios=path)
+
+    assert monthly['scenarios'] == [entry['name'] for entry in SCENARIO_ENTRIES]
+    # Bulan yang memuat musim haji ke-k: horizon pecahan paling dekat k
+    hajj_months = [int(np.argmin(np.abs(monthly['horizons'] - k))) for k in (1, 2, 3, 4)]
+    annual = predictor.evaluate_scenarios(path, monthly['horizons'][hajj_months], 2300, 16500)
+    assert np.allclose(monthly['costs'][:, hajj_months], annual)
+    assert np.all(np.abs(monthly['horizons'][hajj_months] - [1, 2, 3, 4]) < 31 / HIJRI_YEAR_DAYS)
+
+    default = predictor.predict_monthly(12, 2300, 16500)
+    assert default['scenarios'] == ['Konservatif', 'Realistis', 'Optimistis']
+    assert np.allclose(default['costs'][:, 0], predictor.evaluate_scenarios(
+        predictor._default_scenarios, default['horizons'][:1], 2300, 16500)[:, 0])
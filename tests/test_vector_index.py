@@ -0,0 +1,67 @@
+"""Regresi artefak indeks TF-IDF: fit ulang saat artefak rusak dan pembersihan indeks lama"""
+import pytest
+
+from src.core import vector_index
+from src.core.vector_index import load_or_build_index
+
+DOCUMENTS = {'a': 'kenaikan biaya haji 2023', 'b': 'embarkasi surabaya termahal', 'c': 'nilai tukar rupiah'}
+
+
+@pytest.fixture(autouse=True)
+def empty_index_cache(monkeypatch):
+    monkeypatch.setattr(vector_index, '_index_cache', {})
+
+
+@pytest.mark.parametrize('corruption', [b'', b'\x80\x04\x95garbage', b'\x80\x04c__nonexistent_module__\nX\n.'])
+def test_corrupt_vectorizer_is_refit(tmp_path, corruption):
+    load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path)
+    (pickle_path,) = tmp_path.glob('idx.*.vectorizer.pkl')
+    pickle_path.write_bytes(corruption)
+    vector_index._index_cache.clear()
+
+    index = load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path)
+
+    assert index.search('biaya haji', top_k=1)[0][0] == 'a'
+
+
+def test_replaced_index_files_are_pruned(tmp_path):
+    old = load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path)
+    (tmp_path / 'other.meta.json').write_text('{}')
+    new = load_or_build_index('idx', {**DOCUMENTS, 'd': 'kuota haji'}, artifact_dir=tmp_path, replaces=old.prefix)
+
+    assert new is not old
+    assert {path.name.split('.')[1] for path in tmp_path.glob('idx.*')} == {new.prefix.split('.')[1]}
+    assert len(list(tmp_path.glob('idx.*'))) == 5
+    assert (tmp_path / 'other.meta.json').exists()
+    assert len(vector_index._index_cache) == 1
+
+
+def test_two_corpora_under_one_name_do_not_evict_each_other(tmp_path, monkeypatch):
+    other_documents = {'x': 'pelunasan tahap kedua', 'y': 'masa tunggu provinsi'}
+    first = load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path)
+    second = load_or_build_index('idx', other_documents, artifact_dir=tmp_path, replaces=None)
+    # Versi baru korpus kedua hanya menggantikan versi lamanya sendiri
+    third = load_or_build_index('idx', {**other_documents, 'z': 'kurs'}, artifact_dir=tmp_path,
+                                replaces=second.prefix)
+
+    fits = []
+    monkeypatch.setattr(vector_index.TfidfVectorIndex, 'fit', classmethod(lambda cls, docs: fits.append(docs)))
+    assert load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path) is first
+    vector_index._index_cache.clear()
+    assert load_or_build_index('idx', DOCUMENTS, artifact_dir=tmp_path).doc_ids == first.doc_ids
+    assert load_or_build_index('idx', {**other_documents, 'z': 'kurs'}, artifact_dir=tmp_path).doc_ids == third.doc_ids
+    assert fits == []
+    assert not list(tmp_path.glob(second.prefix + '.*'))
+
+
+def test_rag_system_prunes_its_previous_index(tmp_path, monkeypatch):
+    from src.core.rag_system import RAGSystem
+
+    monkeypatch.setattr(vector_index, 'DEFAULT_ARTIFACT_DIR', tmp_path)
+    rag = RAGSystem(retrieval_backend='tfidf')
+    before = rag.vector_index.prefix
+    rag.add_documents({'catatan/kuota': 'Kuota haji Indonesia 2026'})
+
+    assert rag.search('kuota haji 2026')[0][0] == 'catatan/kuota'
+    assert rag.vector_index.prefix != before
+    assert not list(tmp_path.glob(before + '.*'))